@@ -1,44 +1,57 @@
-import pandas as pd
-import ast
-
-# 1. 기존 키워드 세트
-STOCK_SEARCH_KEYWORDS = set([
-    "코스피", "코스닥", "환율", "금리인상", "FOMC", "외국인 순매수", "반도체",
-    "HBM", "AI반도체", "2차전지", "바이오", "제약", "밸류업", "기업 실적"
-])
-
-# 2. 최신 뉴스 데이터 로드 (경로는 각자 맞게 수정)
-CSV_PATH = r"P:\stock_crawl\backend\output\merged_no_duplicate.csv"
-df = pd.read_csv(CSV_PATH, encoding="utf-8")
-
-# 3. 최근 7일 또는 30일 등 원하는 기간만 필터링 (예: 30일)
-df['published_at'] = pd.to_datetime(df['published_at'])
-date_limit = pd.Timestamp.now() - pd.Timedelta(days=30)
-df = df[df['published_at'] >= date_limit]
-
-# 4. analysis_keywords 컬럼에서 전체 키워드 추출 및 집계
-all_keywords = []
-for x in df['analysis_keywords']:
-    # 문자열을 리스트로 변환
-    try:
-        kws = ast.literal_eval(str(x))
-        all_keywords.extend([k for k in kws if isinstance(k, str)])
-    except Exception:
-        continue
-
-# 5. 집계 (Series.value_counts)
-import collections
-keyword_counts = collections.Counter(all_keywords)
-
-# 6. 기존 키워드에는 없는 인기 키워드 추출 (최대 20개 예시)
-recommended_keywords = [
-    (kw, count)
-    for kw, count in keyword_counts.most_common(50)
-    if kw not in STOCK_SEARCH_KEYWORDS and len(kw) > 1
-][:20]
-
-print("💡 추천 검색 키워드 (최근 30일 기준, 기존에 없는 것):")
-for kw, count in recommended_keywords:
-    print(f"- {kw} ({count}회)")
-
-# 필요시 결과를 txt/csv로 저장해도 됨
+import sys
+
+from stock_crawl.keywords import KeywordStore, RETIRE_WINDOW_DAYS, ADD_STREAK_DAYS, keyword_key
+
+# 검색 키워드 목록과 집계는 키워드 저장소(backend/output/keyword_store.json) 한 곳에서 관리합니다.
+# (수집 파이프라인이 매 실행 새 기사로 집계를 갱신하므로, 여기서는 병합본 전체를 다시 읽지 않음)
+#
+#   python backend/add_keword.py                  # 추천 키워드 보기
+#   python backend/add_keword.py 키워드1 키워드2   # 검색 키워드에 직접 추가
+#   python backend/add_keword.py --pin 코스피      # 자동 정리되지 않도록 고정
+
+
+def _open_store(store=None):
+    if store is None:
+        store = KeywordStore()
+        store.bootstrap()  # 집계가 비어 있을 때만 병합본에서 한 번 채움
+    return store
+
+
+def recommend_keywords(store=None, days=RETIRE_WINDOW_DAYS, limit=20):
+    """기존 키워드에는 없는 인기 키워드 [(키워드, 횟수)] (최근 days 일, 최대 limit 개)"""
+    store = _open_store(store)
+    anchor = store.anchor_day()
+    if anchor is None:
+        return []
+    active = {keyword_key(kw) for kw in store.active_keywords()}
+    counts = store.window_counts(days, anchor)
+    return [
+        (store.label(key), count)
+        for key, count in counts.most_common(50)
+        if key not in active and store.eligible(key)
+    ][:limit]
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    store = _open_store()
+    if args:
+        pin = "--pin" in args
+        for kw in (a for a in args if a != "--pin"):
+            if pin and keyword_key(kw) in {keyword_key(k) for k in store.active_keywords()}:
+                store.pin(kw)
+                print(f"📌 고정: {kw}")
+            else:
+                store.add(kw, pinned=pin)
+                print(f"➕ 검색 키워드 추가: {kw}")
+        store.save()
+    else:
+        print("💡 추천 검색 키워드 (최근 30일 기준, 기존에 없는 것):")
+        for kw, count in recommend_keywords(store):
+            print(f"- {kw} ({count}회)")
+
+        candidates = store.evaluate(apply=False)["add_candidates"]
+        if candidates:
+            print(f"\n🔁 자동 추가 대기 중 (연속 {ADD_STREAK_DAYS}일 기준):")
+            for c in candidates:
+                print(f"- {c['keyword']} (최근 7일 {c['count']}회, {c['streak']}/{ADD_STREAK_DAYS})")
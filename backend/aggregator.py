@@ -2,20 +2,26 @@ import pandas as pd
 import glob
 import os
 
+from stock_crawl.entities import normalize_entity_columns
+from stock_crawl.paths import OUTPUT_DIR, MERGED_CSV
+from stock_crawl.records import DEFAULT_CHUNK_ROWS, iter_csv_chunks
+
 # === 1. 파일 경로 지정 ===
-FOLDER = r'P:\stock_crawl\backend\output'  # 파일들이 모여있는 폴더 경로
-file_list = glob.glob(os.path.join(FOLDER, "*.csv"))
+FOLDER = OUTPUT_DIR  # 파일들이 모여있는 폴더 경로 (backend/output)
 
 # === 2. 취합할 컬럼명(순서 고정) ===
-keep_columns = ["url", "title", "published_at", "analysis_keywords", "analysis_orgs", "summary_ai", "sentiment_label"]
-
-# === 3. 파일별로 읽어서 필요한 컬럼만 추출 ===
-df_list = []
-for file in file_list:
-    try:
-        df = pd.read_csv(file, encoding="utf-8")
-    except UnicodeDecodeError:
-        df = pd.read_csv(file, encoding="utf-8-sig")
+keep_columns = ["url", "title", "published_at", "analysis_keywords", "analysis_orgs", "summary_ai", "sentiment_label",
+                "cluster_id", "cluster_label"]
+# 모두 문자열로 읽습니다. (cluster_id 도 "3.0" 처럼 바뀌지 않고 원래 표기 그대로 유지)
+KEEP_DTYPES = {col: str for col in keep_columns}
+
+
+def list_source_files(folder=FOLDER):
+    """취합 대상 CSV 목록 (폴더 안의 *.csv, 파일명 순)"""
+    return sorted(glob.glob(os.path.join(folder, "*.csv")))
+
+
+def _select_columns(df):
     # 필요한 컬럼만 선택(없는 컬럼은 NaN으로 채워짐)
     sub = pd.DataFrame()
     for col in keep_columns:
@@ -23,14 +29,61 @@ for file in file_list:
             sub[col] = df[col]
         else:
             sub[col] = None
-    df_list.append(sub)
+    return sub
+
+
+def _drop_seen(df, seen_urls):
+    """이미 본 url 과 청크 안의 중복을 빼고, 남은 url 을 seen_urls 에 더합니다. (먼저 들어온 행이 남음)"""
+    df = df[~df["url"].isin(seen_urls)].drop_duplicates(subset="url")
+    seen_urls.update(df["url"])
+    return df
+
+
+def iter_source_chunks(file_list, chunksize=DEFAULT_CHUNK_ROWS):
+    """
+    취합 대상 CSV 들을 필요한 컬럼만, 청크 단위로 읽습니다. (본문 등 큰 컬럼은 아예 읽지 않음)
+    모든 컬럼을 문자열 dtype 으로 지정해 타입 추론을 하지 않고, 빈 칸은 기존처럼 NaN 으로 둡니다.
+    """
+    for file in file_list:
+        for chunk in iter_csv_chunks(file, usecols=keep_columns, chunksize=chunksize,
+                                     dtype=KEEP_DTYPES, keep_default_na=True):
+            yield _select_columns(chunk)
+
+
+def merge_articles(file_list, frames=(), chunksize=DEFAULT_CHUNK_ROWS):
+    """
+    CSV 파일들과 (이미 메모리에 있는) DataFrame 들을 합쳐 url 기준으로 중복을 제거합니다.
+    frames 가 먼저 들어가므로 같은 url 이면 메모리의 최신 결과가 남습니다.
+    파일은 청크 단위로 읽으면서 바로 중복을 걸러내므로, 메모리에는 중복 없는 결과만 쌓입니다.
+    리스트 컬럼은 list 로 정규화된 상태로 돌려줍니다.
+    """
+    # === 3. 파일별로 청크 단위로 읽어서 필요한 컬럼만 추출 + url 기준 중복제거 ===
+    seen_urls = set()
+    df_list = [_drop_seen(_select_columns(frame), seen_urls) for frame in frames]
+    for chunk in iter_source_chunks(file_list, chunksize):
+        df_list.append(_drop_seen(chunk, seen_urls))
+
+    # === 4. 데이터 합치기 ===
+    merged = pd.concat(df_list, ignore_index=True)
+
+    # === 4-1. 기관/종목명 표기 통일 (예: "삼성전자㈜", "Samsung Electronics" → "삼성전자") ===
+    return normalize_entity_columns(merged)
+
+
+def save_merged(merged, output_file=MERGED_CSV):
+    """리스트 컬럼을 문자열로 바꿔 컬럼 순서대로 저장합니다. (원본 DataFrame 은 그대로 둠)"""
+    out = merged.copy()
+    for col in ["analysis_keywords", "analysis_orgs"]:
+        out[col] = out[col].apply(str)
+    out.to_csv(output_file, index=False, encoding="utf-8-sig", columns=keep_columns)
+    return output_file
+
 
-# === 4. 데이터 합치기 + url 기준 중복제거 ===
-merged = pd.concat(df_list, ignore_index=True)
-merged = merged.drop_duplicates(subset="url")
+if __name__ == "__main__":
+    file_list = list_source_files(FOLDER)
+    merged = merge_articles(file_list)
 
-# === 5. 저장 (컬럼 순서 유지) ===
-output_file = os.path.join(FOLDER, "merged_no_duplicate.csv")
-merged.to_csv(output_file, index=False, encoding="utf-8-sig", columns=keep_columns)
+    # === 5. 저장 (컬럼 순서 유지) ===
+    output_file = save_merged(merged, os.path.join(FOLDER, "merged_no_duplicate.csv"))
 
-print(f"완료! 총 {len(merged)}건의 데이터가 중복 없이 합쳐졌습니다.\n→ 저장 위치: {output_file}")
+    print(f"완료! 총 {len(merged)}건의 데이터가 중복 없이 합쳐졌습니다.\n→ 저장 위치: {output_file}")
@@ -0,0 +1,380 @@
+# backend/backfill.py
+# -*- coding: utf-8 -*-
+"""
+지난 기간의 뉴스를 (키워드, 날짜) 조각(shard)으로 나눠 여러 프로세스에서 수집하는 백필 실행기입니다.
+
+    python backend/backfill.py --start 2025-07-01 --end 2025-07-31
+    python backend/backfill.py --days 30 --keywords "코스피,환율" --workers 8
+    python backend/backfill.py --start 2025-07-01 --end 2025-07-31 --no-analyze   # 수집/본문 추출만
+
+- 네이버 검색 API 는 날짜 지정이 없고 start 가 최대 1000 이라, 최신순(sort=date)으로는 키워드당 최근 약 1,100건까지만 닿습니다.
+  조각마다 최신순 페이지(start=1, 101, …, 901)를 이분 탐색해 그 날짜가 시작되는 페이지를 찾고 거기서부터만 읽습니다.
+  그 날짜가 1000건 밖이면(reach=capped) 정확도순(sort=sim) 페이지에서 그 날짜 기사만 골라 담습니다. (완전하지 않음)
+- 조각마다 output/backfill/<run>/shards/<날짜>/<키워드>.csv 와 .json(상태) 체크포인트를 남깁니다.
+  다시 실행하면 끝난 조각은 건너뛰고, 수집만 끝난 조각은 본문 추출을 이어서 합니다.
+- 모든 조각이 끝나면 조각 사이의 URL 중복과 병합본(merged_no_duplicate.csv)에 이미 있는 URL 을 빼고
+  AI 분석 → 정규화/클러스터링(기간 필터 없음, 클러스터 상태는 일일 파이프라인과 공유) →
+  aggregator 의 URL 중복 제거로 병합본에 합칩니다.
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timedelta, date
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from stock_crawl.crawl import MAX_START, PAGE_SIZE, naver_headers, parse_naver_item  # noqa: E402
+from stock_crawl.extract import extract_article_content, is_extract_failure  # noqa: E402
+from stock_crawl.metrics import start_run, instrumented_get  # noqa: E402
+from stock_crawl.paths import OUTPUT_DIR, AGGREGATED_DIR, MERGED_CSV  # noqa: E402
+from stock_crawl.records import Article, articles_to_frame, default_body_store, iter_articles, iter_csv_chunks  # noqa: E402
+
+BACKFILL_DIR = os.path.join(OUTPUT_DIR, "backfill")
+PAGE_STARTS = tuple(range(1, MAX_START + 1, PAGE_SIZE))  # 1, 101, ..., 901
+SHARD_COLUMNS = ["search_keyword", "url", "title", "summary", "crawled_at", "published_at", "content"]
+EXTRACT_CHECKPOINT_EVERY = 25  # 본문 추출 중 이 개수마다 조각 CSV 를 다시 저장
+
+
+def _script():
+    # .env 로드와 로컬 설정(CONFIG)/검색 키워드/엔진은 run_pipeline_local.py 와 공유합니다.
+    import run_pipeline_local
+    return run_pipeline_local
+
+
+# ==============================================================================
+# 체크포인트
+# ==============================================================================
+def shard_slug(keyword):
+    return re.sub(r"[^\w-]+", "_", keyword).strip("_") or "keyword"
+
+
+def shard_paths(run_dir, keyword, day):
+    base = os.path.join(run_dir, "shards", day.isoformat(), shard_slug(keyword))
+    return base + ".csv", base + ".json"
+
+
+def read_status(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(value, path):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def save_shard(articles, path):
+    tmp = path + ".tmp"
+    articles_to_frame(articles).reindex(columns=SHARD_COLUMNS).to_csv(tmp, index=False, encoding="utf-8-sig")
+    os.replace(tmp, path)
+
+
+def shard_finished(status, extract):
+    return status.get("stage") == "done" or (not extract and status.get("stage") == "extract_pending")
+
+
+# ==============================================================================
+# 네이버 페이지 탐색
+# ==============================================================================
+class NaverPager:
+    """한 키워드의 검색 결과 페이지. 같은 start 를 두 번 요청하지 않도록 캐시합니다."""
+
+    def __init__(self, keyword, config, sort="date"):
+        self.keyword = keyword
+        self.sort = sort
+        self.api_url = config.naver_api_url
+        self.headers = naver_headers(config)
+        self.delay = config.rate_limit_delay
+        self.pages = {}
+        self.requests = 0
+
+    def page(self, start):
+        """[{pub_date, url, title, summary}] (빈 리스트면 더 이상 결과 없음)"""
+        if start not in self.pages:
+            params = {"query": self.keyword, "display": PAGE_SIZE, "start": start, "sort": self.sort}
+            response = instrumented_get(self.api_url, headers=self.headers, params=params, verify=False, timeout=10)
+            response.raise_for_status()
+            self.requests += 1
+            items = (parse_naver_item(item) for item in response.json().get("items", []))
+            self.pages[start] = [item for item in items if item]
+            time.sleep(self.delay)
+        return self.pages[start]
+
+
+def _oldest(items):
+    return min(item["pub_date"] for item in items)
+
+
+def find_start_page(pager, day):
+    """최신순 결과에서 day 가 처음 나올 수 있는 페이지 번호 (가장 오래된 기사가 day 이하인 첫 페이지)"""
+    lo, hi = 0, len(PAGE_STARTS) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        items = pager.page(PAGE_STARTS[mid])
+        if items and _oldest(items) > day:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def crawl_day_by_date(pager, day, limit):
+    """(기사 목록, reach). reach 는 'done'(그 날짜를 끝까지 봄), 'limit'(한도 도달), 'capped'(1000건 밖)"""
+    index = find_start_page(pager, day)
+    first = pager.page(PAGE_STARTS[index])
+    if first and _oldest(first) > day:
+        return [], "capped"
+    found, seen = [], set()
+    for start in PAGE_STARTS[index:]:
+        items = pager.page(start)
+        if not items:
+            break
+        for item in items:
+            if item["pub_date"] == day and item["url"] not in seen:
+                seen.add(item["url"])
+                found.append(item)
+        if len(found) >= limit:
+            return found[:limit], "limit"
+        if _oldest(items) < day:
+            break
+    return found, "done"
+
+
+def crawl_day_by_relevance(pager, day, limit):
+    """정확도순 페이지를 훑으며 day 에 발행된 기사만 모읍니다. (최신순 1000건 밖의 날짜용)"""
+    found, seen = [], set()
+    for start in PAGE_STARTS:
+        items = pager.page(start)
+        if not items:
+            break
+        for item in items:
+            if item["pub_date"] == day and item["url"] not in seen:
+                seen.add(item["url"])
+                found.append(item)
+        if len(found) >= limit:
+            break
+    return found[:limit]
+
+
+# ==============================================================================
+# 조각 실행 (작업 프로세스)
+# ==============================================================================
+def run_shard(task):
+    """(keyword, day) 조각 하나를 수집/본문 추출하고 상태 dict 를 돌려줍니다. 체크포인트에서 이어서 합니다."""
+    keyword, day = task["keyword"], date.fromisoformat(task["day"])
+    csv_path, status_path = shard_paths(task["run_dir"], keyword, day)
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    status = read_status(status_path)
+    started = time.perf_counter()
+    config = task["config"]
+
+    if status.get("stage") not in ("extract_pending", "done"):
+        try:
+            pager = NaverPager(keyword, config)
+            items, reach = crawl_day_by_date(pager, day, task["per_day"])
+            requests = pager.requests
+            if reach == "capped" and task["relevance_fallback"]:
+                relevance = NaverPager(keyword, config, sort="sim")
+                items = crawl_day_by_relevance(relevance, day, task["per_day"])
+                requests += relevance.requests
+        except Exception as e:
+            status = {"keyword": keyword, "day": day.isoformat(), "stage": "failed", "error": str(e)}
+            _write_json(status, status_path)
+            return status
+        crawled_at = datetime.now().isoformat()
+        articles = [Article(store=default_body_store(), search_keyword=keyword, url=item["url"], title=item["title"],
+                            summary=item["summary"], crawled_at=crawled_at, published_at=day.isoformat())
+                    for item in items]
+        save_shard(articles, csv_path)
+        status = {"keyword": keyword, "day": day.isoformat(), "stage": "extract_pending", "reach": reach,
+                  "items": len(articles), "requests": requests, "extract_failures": 0}
+        _write_json(status, status_path)
+
+    if task["extract"] and status["stage"] == "extract_pending":
+        articles = list(iter_articles(csv_path))
+        pending = 0
+        for article in articles:
+            if article.get("content"):
+                continue
+            article["content"] = extract_article_content(article.get("url", ""))
+            if is_extract_failure(article["content"]):
+                status["extract_failures"] = status.get("extract_failures", 0) + 1
+            pending += 1
+            if pending % EXTRACT_CHECKPOINT_EVERY == 0:
+                save_shard(articles, csv_path)
+            time.sleep(config.extract_delay)
+        save_shard(articles, csv_path)
+        status["stage"] = "done"
+
+    status["seconds"] = round(status.get("seconds", 0) + time.perf_counter() - started, 3)
+    _write_json(status, status_path)
+    return status
+
+
+def build_tasks(keywords, days, run_dir, per_day, extract, relevance_fallback, config):
+    """조각 작업 목록. config(PipelineConfig)는 작업 프로세스로 그대로 넘어갑니다. (API 키/요청 간격)"""
+    return [{"keyword": kw, "day": d.isoformat(), "run_dir": run_dir, "per_day": per_day,
+             "extract": extract, "relevance_fallback": relevance_fallback, "config": config}
+            for d in days for kw in keywords]
+
+
+def run_shards(tasks, workers, run):
+    """남은 조각을 workers 개 프로세스로 실행합니다. (workers=1 이면 현재 프로세스에서 차례로)"""
+    todo = [t for t in tasks
+            if not shard_finished(read_status(shard_paths(t["run_dir"], t["keyword"], date.fromisoformat(t["day"]))[1]),
+                                  t["extract"])]
+    print(f"  - 조각 {len(tasks)}개 중 {len(tasks) - len(todo)}개는 체크포인트에서 완료 확인, {len(todo)}개 실행")
+    results = []
+
+    def _report(n, task, status):
+        results.append(status)
+        run.incr(f"shards_{status.get('stage', 'failed')}")
+        if status.get("reach"):
+            run.incr(f"shards_reach_{status['reach']}")
+        detail = status.get("error") or f"{status.get('items', 0)}건, {status.get('reach')}, 요청 {status.get('requests', 0)}회"
+        print(f"  - ({n}/{len(todo)}) {task['day']} '{task['keyword']}': {status.get('stage')} ({detail})")
+
+    if workers <= 1:
+        for n, task in enumerate(todo, 1):
+            _report(n, task, run_shard(task))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_shard, task): task for task in todo}
+        for n, future in enumerate(as_completed(futures), 1):
+            task = futures[future]
+            try:
+                status = future.result()
+            except Exception as e:
+                status = {"keyword": task["keyword"], "day": task["day"], "stage": "failed", "error": str(e)}
+            _report(n, task, status)
+    return results
+
+
+# ==============================================================================
+# 취합 → 분석 → 병합 (메인 프로세스)
+# ==============================================================================
+def known_urls():
+    if not os.path.exists(MERGED_CSV):
+        return set()
+    urls = set()
+    for chunk in iter_csv_chunks(MERGED_CSV, usecols=["url"]):
+        urls.update(chunk["url"])
+    return urls
+
+
+def collect_shard_articles(tasks, skip_urls):
+    """완료된 조각 CSV 를 (날짜, 키워드) 순서로 읽어 URL 중복을 뺀 Article 목록을 만듭니다."""
+    articles, seen = [], set(skip_urls)
+    for task in tasks:
+        csv_path, status_path = shard_paths(task["run_dir"], task["keyword"], date.fromisoformat(task["day"]))
+        if not shard_finished(read_status(status_path), task["extract"]) or not os.path.exists(csv_path):
+            continue
+        for article in iter_articles(csv_path):
+            url = article.get("url")
+            if url and url not in seen:
+                seen.add(url)
+                articles.append(article)
+    return articles
+
+
+def merge_into_archive(backfill_csv):
+    """기존 병합본을 먼저 두고 aggregator 의 URL 중복 제거로 백필 결과를 합칩니다."""
+    from aggregator import merge_articles, save_merged
+    files = [MERGED_CSV] if os.path.exists(MERGED_CSV) else []
+    merged = merge_articles(files + [backfill_csv])
+    save_merged(merged, MERGED_CSV)
+    return merged
+
+
+def date_range(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def main(argv=None):
+    s = _script()
+    parser = argparse.ArgumentParser(description="(키워드, 날짜) 조각 단위 병렬 백필")
+    parser.add_argument("--start", type=date.fromisoformat, help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="끝 날짜, 포함 (기본: 오늘)")
+    parser.add_argument("--days", type=int, help="--start 대신 오늘부터 거꾸로 N일")
+    parser.add_argument("--keywords", help="쉼표로 구분한 키워드 (기본: STOCK_SEARCH_KEYWORDS)")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="작업 프로세스 수")
+    parser.add_argument("--per-day", type=int, default=s.CONFIG.articles_per_day, help="조각(키워드·날짜)당 최대 기사 수")
+    parser.add_argument("--run-name", help="체크포인트 폴더 이름 (기본: <start>_<end>)")
+    parser.add_argument("--no-extract", action="store_true", help="본문 추출 없이 목록만 수집")
+    parser.add_argument("--no-analyze", action="store_true", help="조각 수집/추출까지만 하고 분석·병합은 하지 않음")
+    parser.add_argument("--no-relevance-fallback", action="store_true",
+                        help="최신순 1000건 밖의 날짜를 정확도순 결과로 보충하지 않음")
+    parser.add_argument("--profile", action="store_true", help="단계별 cProfile 기록 (output/profiles)")
+    args = parser.parse_args(argv)
+
+    end = args.end or datetime.now().date()
+    if args.start:
+        start = args.start
+    elif args.days:
+        start = end - timedelta(days=args.days - 1)
+    else:
+        parser.error("--start 또는 --days 가 필요합니다.")
+    if start > end:
+        parser.error("--start 가 --end 보다 늦습니다.")
+    keywords = [k.strip() for k in args.keywords.split(",") if k.strip()] if args.keywords else list(s.STOCK_SEARCH_KEYWORDS)
+    run_dir = os.path.join(BACKFILL_DIR, args.run_name or f"{start}_{end}")
+    days = date_range(start, end)
+    extract = not args.no_extract
+    tasks = build_tasks(keywords, days, run_dir, args.per_day, extract, not args.no_relevance_fallback, s.CONFIG)
+
+    print("=" * 60)
+    print(f" Backfill {start} ~ {end} ({len(days)}일 × 키워드 {len(keywords)}개 = 조각 {len(tasks)}개, "
+          f"프로세스 {args.workers}개)")
+    print("=" * 60)
+    run = start_run("backfill", profile_dir=os.path.join(OUTPUT_DIR, "profiles"))
+    run.extra["backfill"] = {"start": str(start), "end": str(end), "keywords": keywords, "run_dir": run_dir,
+                             "workers": args.workers}
+    try:
+        with run.stage("shards") as span:
+            results = run_shards(tasks, args.workers, run)
+            span["items"] = sum(s.get("items", 0) for s in results)
+        failed = [s for s in results if s.get("stage") == "failed"]
+        capped = [s for s in results if s.get("reach") == "capped"]
+        if capped:
+            print(f"⚠️ 최신순 1000건 밖이라 정확도순으로 보충한 조각 {len(capped)}개 (해당 날짜는 일부만 수집됐을 수 있음)")
+        if failed:
+            print(f"🚨 실패한 조각 {len(failed)}개 — 다시 실행하면 실패한 조각만 재시도합니다.")
+        if args.no_analyze:
+            print(f"\n✅ 조각 체크포인트 저장 완료: {run_dir}")
+            return
+
+        with run.stage("collect") as span:
+            articles = collect_shard_articles(tasks, known_urls())
+            span["items"] = len(articles)
+        print(f"\n--- 병합본에 없는 새 기사 {len(articles)}개 ---")
+        if not articles:
+            return
+
+        with run.stage("analyze") as span:
+            analyzed = s.pipeline.analyze(articles)
+            span["items"] = len(analyzed)
+        with run.stage("save") as span:
+            df = s.pipeline.save(analyzed, run_dir, keep_days=None, state_dir=AGGREGATED_DIR)
+            span["items"] = 0 if df is None else len(df)
+        with run.stage("merge") as span:
+            merged = merge_into_archive(os.path.join(run_dir, "aggregated_stock_data.csv"))
+            span["items"] = len(merged)
+        print(f"\n✅ 백필 완료: 병합본 {len(merged)}건 → {MERGED_CSV}")
+    finally:
+        run.write_report(os.path.join(OUTPUT_DIR, "reports"))
+
+
+if __name__ == "__main__":
+    main()
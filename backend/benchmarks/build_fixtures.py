@@ -0,0 +1,151 @@
+# backend/benchmarks/build_fixtures.py
+# -*- coding: utf-8 -*-
+"""
+저장소에 들어 있는 실제 수집 결과로 벤치마크용 고정 데이터(fixture)를 만듭니다.
+
+- naver_pages.jsonl.gz : 키워드별 네이버 검색 API 응답 항목 (pubDate 는 '며칠 전'으로 저장, 재생 시 날짜 계산)
+- html_corpus.jsonl.gz : 언론사 기사 HTML (본문 영역 선택자/머리말/광고/저작권 문구 포함)
+- gemini_responses.jsonl.gz : 기사 본문 해시 → Gemini 분석 결과
+
+원본: backend/output/intermediate/crawled_data.csv (본문), backend/output/merged_no_duplicate.csv (AI 분석)
+표준 라이브러리만 사용하므로 pandas 없이도 다시 만들 수 있습니다.
+
+    python backend/benchmarks/build_fixtures.py --per-keyword 20
+"""
+import os
+import csv
+import gzip
+import json
+import html
+import hashlib
+import argparse
+import collections
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+CRAWLED_CSV = os.path.join(BACKEND_DIR, "output", "intermediate", "crawled_data.csv")
+ANALYZED_CSV = os.path.join(BACKEND_DIR, "output", "merged_no_duplicate.csv")
+
+# 실제 언론사에서 쓰이는 본문 영역 선택자들을 돌아가며 사용합니다.
+BODY_TEMPLATES = [
+    '<div id="article-view-content-div">{body}</div>',
+    '<div id="articleBody" class="article_body">{body}</div>',
+    '<article>{body}</article>',
+    '<div class="news_end">{body}</div>',
+    '<div id="news_body_area">{body}</div>',
+]
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{title}</title>
+<script>window.dataLayer = window.dataLayer || []; function gtag(){{dataLayer.push(arguments);}}</script>
+<style>body{{font-family:sans-serif}} .ad{{display:none}}</style></head>
+<body>
+<header><nav><ul><li>정치</li><li>경제</li><li>증권</li><li>산업</li></ul></nav></header>
+<aside class="ad">광고 영역</aside>
+<h1>{title}</h1>
+{content}
+<div class="byline">기자 정보 · 전체기사 보기</div>
+<footer>Copyright © 무단전재 및 재배포 금지</footer>
+</body></html>
+"""
+FAILED_PAGE = """<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head>
+<body><div class="wrap"><p>{summary}</p></div></body></html>
+"""
+CONTENT_SEPARATOR = "\n"
+
+
+def content_key(text):
+    """Gemini 응답을 찾는 키: 본문(또는 요약) 앞부분 해시"""
+    return hashlib.sha1(text.strip()[:500].encode("utf-8")).hexdigest()
+
+
+def _read_csv(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _to_html(row, idx):
+    content = row["content"]
+    title = html.escape(row["title"])
+    if content.startswith(("[실패]", "[오류]")) or len(content) < 100:
+        return FAILED_PAGE.format(title=title, summary=html.escape(row["summary"]))
+    paragraphs = "".join(f"<p>{html.escape(line)}</p>" for line in content.split(CONTENT_SEPARATOR) if line.strip())
+    paragraphs += "<p>무단전재 및 재배포 금지</p><p>관련기사 더보기</p>"
+    body = BODY_TEMPLATES[idx % len(BODY_TEMPLATES)].format(body=paragraphs)
+    return PAGE_TEMPLATE.format(title=title, content=body)
+
+
+def _write_jsonl_gz(path, records):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    print(f"  - {path} ({len(records)}건, {os.path.getsize(path) / 1024:.0f}KB)")
+
+
+def build(per_keyword):
+    crawled = _read_csv(CRAWLED_CSV)
+    analyzed = {r["url"]: r for r in _read_csv(ANALYZED_CSV)}
+
+    by_keyword = collections.defaultdict(list)
+    for row in crawled:
+        if row["url"] in analyzed:
+            by_keyword[row["search_keyword"]].append(row)
+
+    newest = max(datetime.strptime(r["published_at"], "%Y-%m-%d") for r in crawled if r["published_at"])
+    naver, pages, responses = [], [], {}
+    for keyword, rows in sorted(by_keyword.items()):
+        # 최신순 정렬 (네이버 sort=date 와 동일)
+        rows = sorted(rows, key=lambda r: r["crawled_at"], reverse=True)[:per_keyword]
+        items = []
+        for row in rows:
+            idx = len(pages)
+            path = f"/articles/{idx:05d}.html"
+            published = datetime.strptime(row["published_at"], "%Y-%m-%d")
+            items.append({
+                "title": row["title"],
+                "description": row["summary"],
+                "path": path,
+                "days_ago": (newest - published).days,
+                "time": row["crawled_at"][11:19] or "09:00:00",
+            })
+            pages.append({"path": path, "html": _to_html(row, idx)})
+
+            ai = analyzed[row["url"]]
+            text = row["content"]
+            if text.startswith(("[실패]", "[오류]")) or not text:
+                text = row["summary"]
+            responses[content_key(text)] = {
+                "analysis_keywords": _safe_list(ai["analysis_keywords"]),
+                "analysis_orgs": _safe_list(ai["analysis_orgs"]),
+                "summary_ai": ai["summary_ai"],
+                "sentiment_label": ai["sentiment_label"],
+            }
+        naver.append({"keyword": keyword, "items": items})
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    _write_jsonl_gz(os.path.join(FIXTURE_DIR, "naver_pages.jsonl.gz"), naver)
+    _write_jsonl_gz(os.path.join(FIXTURE_DIR, "html_corpus.jsonl.gz"), pages)
+    _write_jsonl_gz(os.path.join(FIXTURE_DIR, "gemini_responses.jsonl.gz"),
+                    [{"key": k, "result": v} for k, v in responses.items()])
+
+
+def _safe_list(text):
+    import ast
+    try:
+        value = ast.literal_eval(text)
+        return [x for x in value if isinstance(x, str)] if isinstance(value, list) else []
+    except (ValueError, SyntaxError):
+        return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 fixture 생성")
+    parser.add_argument("--per-keyword", type=int, default=20, help="키워드별 기사 수")
+    args = parser.parse_args()
+    print("🧪 벤치마크 fixture 생성")
+    build(args.per_keyword)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+# backend/benchmarks/check_behaviour.py
+# -*- coding: utf-8 -*-
+"""
+파이프라인 보조 모듈의 동작 검사입니다. 모듈마다 작은 fixture 로 한 번씩 돌려 결과를 확인합니다.
+
+- llm_output : 녹화된 Gemini 분석 결과(fixtures/gemini_responses.jsonl.gz)로 만든 응답에 설명 문장과
+               깨진 원소를 섞어도 나머지 원소를 읽고, 깨진 기사 id 만 실패로 돌려주는지
+- keywords   : 추가/정리 히스테리시스 (연속 횟수, 같은 기준일 재평가, 고정 키워드, 활성 기간)
+- scheduler  : 처음 보는 키워드 최대 페이지, page_budget 안에서 배분, 저수율 키워드 주기 건너뛰기
+- backfill   : find_start_page 이분 탐색이 앞에서부터 훑은 결과와 같고 요청 수가 log2 수준인지
+- dag        : 지문이 같으면 건너뛰고, 외부 파일/설정/출력 파일이 바뀐 단계부터 다시 실행하는지
+- warehouse  : 병합본 표본(output/aggregated_stock_data_20250731.csv)으로 채우기/upsert 와
+               병합본이 바뀐 뒤 open_warehouse 가 None 을 돌려주고 다시 채우면 새 기사가 들어오는지
+
+    python backend/benchmarks/check_behaviour.py
+    python backend/benchmarks/check_behaviour.py --only keywords,dag
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+from datetime import date, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from standins import load_jsonl_gz  # noqa: E402
+
+SAMPLE_CSV = os.path.join(BACKEND_DIR, "output", "aggregated_stock_data_20250731.csv")
+TODAY = date(2025, 7, 31)
+
+failures = []
+
+
+def check(ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    if not ok:
+        failures.append(message)
+
+
+# ==============================================================================
+# llm_output
+# ==============================================================================
+def check_llm_output():
+    from stock_crawl.llm_output import parse_analysis_response
+
+    recorded = [r["result"] for r in load_jsonl_gz("gemini_responses.jsonl.gz")[:4]]
+    ids = [f"a{i}" for i in range(len(recorded) + 1)]
+    elements = [json.dumps({"id": aid, **result}, ensure_ascii=False) for aid, result in zip(ids, recorded)]
+    # 두 번째 원소는 따옴표가 빠져 깨지고, 세 번째 원소는 라벨을 한국어로 씁니다.
+    elements[1] = elements[1].replace('"summary_ai": "', '"summary_ai": ', 1)
+    elements[2] = elements[2].replace(f'"{recorded[2]["sentiment_label"]}"', '"긍정"')
+    # 같은 id 가 두 번 나오면 처음 것만 씁니다.
+    elements.append(json.dumps({"id": ids[0], **recorded[1]}, ensure_ascii=False))
+    text = "분석 결과입니다.\n```json\n[\n" + ",\n".join(elements) + "\n]\n```\n이상입니다."
+
+    valid, failed, problems = parse_analysis_response(text, ids)
+    by_id = {r["id"]: r for r in valid}
+    check([r["id"] for r in valid] == [ids[0], ids[2], ids[3]],
+          f"llm_output: 깨진 원소를 건너뛰고 나머지 {len(valid)}건을 읽음")
+    check(failed == [ids[1], ids[4]], f"llm_output: 실패 id = 깨진 원소 + 응답에 없는 id ({failed})")
+    check(bool(problems) and all("JSON" in p for p in problems), f"llm_output: 문제 {len(problems)}건 기록")
+    check(by_id[ids[0]]["analysis_keywords"] == recorded[0]["analysis_keywords"],
+          "llm_output: 중복 id 는 처음 원소를 씀")
+    check(by_id[ids[2]]["sentiment_label"] == "Positive", "llm_output: 한국어 감성 라벨을 고쳐 받음")
+
+
+# ==============================================================================
+# keywords
+# ==============================================================================
+def _keyword_articles(keyword, day, n, prefix):
+    return [{"url": f"https://news.test/{prefix}/{day}/{i}", "published_at": f"{day} 09:00:00",
+             "analysis_keywords": [keyword]} for i in range(n)]
+
+
+def check_keywords():
+    from stock_crawl import keywords as kw
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = kw.KeywordStore(os.path.join(tmp, "keyword_store.json"), seeds=["코스피", "환율"])
+        since = (TODAY - timedelta(days=kw.RETIRE_MIN_AGE_DAYS + 5)).isoformat()
+        for info in store.state["active"].values():
+            info["since"] = since
+        store.pin("코스피")
+
+        day1 = TODAY - timedelta(days=2)
+        store.update_from_articles(_keyword_articles("유리 기판", day1.isoformat(), kw.ADD_MIN_COUNT, "hot"))
+        added = store.update_from_articles(_keyword_articles("유리 기판", day1.isoformat(), kw.ADD_MIN_COUNT, "hot"))
+        check(added == 0, "keywords: 이미 센 URL 은 다시 세지 않음")
+
+        first = store.evaluate(day1)
+        again = store.evaluate(day1)
+        retired = [first["retired"], again["retired"]]
+        check(not first["added"] and again["add_candidates"][0]["streak"] == 1,
+              "keywords: 추가 기준을 넘어도 첫날은 후보, 같은 기준일 재평가는 연속 횟수를 늘리지 않음")
+
+        day2 = TODAY - timedelta(days=1)
+        store.update_from_articles(_keyword_articles("코스닥", day2.isoformat(), 1, "cold"))
+        second = store.evaluate(day2)
+        retired.append(second["retired"])
+        check(second["added"] == ["유리 기판"] and "유리 기판" in store.active_keywords(),
+              f"keywords: {kw.ADD_STREAK_DAYS}번 연속이면 추가")
+
+        # "환율" 은 day1 부터 정리 기준 아래이므로 서로 다른 기준일 RETIRE_STREAK_DAYS(3) 번째인 TODAY 에 정리됩니다.
+        store.update_from_articles(_keyword_articles("코스닥", TODAY.isoformat(), 1, "cold"))
+        retired.append(store.evaluate(TODAY)["retired"])
+        check(retired[-1] == ["환율"] and not any(retired[:-1]),
+              f"keywords: 정리 기준이 {kw.RETIRE_STREAK_DAYS}번 연속이면 정리 (그 전에는 유지)")
+        check("코스피" in store.active_keywords() and "유리 기판" in store.active_keywords(),
+              "keywords: 고정 키워드와 막 추가된 키워드는 정리하지 않음")
+
+        store.retire("유리 기판")
+        store.update_from_articles(_keyword_articles("유리 기판", TODAY.isoformat(), kw.ADD_MIN_COUNT, "back"))
+        for offset in range(kw.ADD_STREAK_DAYS + 1):
+            store.evaluate(TODAY + timedelta(days=1 + offset))
+        check("유리 기판" not in store.active_keywords(), "keywords: 사람이 정리한 키워드는 자동으로 다시 추가하지 않음")
+
+
+# ==============================================================================
+# scheduler
+# ==============================================================================
+def check_scheduler():
+    from stock_crawl.scheduler import KeywordScheduler
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "keyword_yield.json")
+        sched = KeywordScheduler(path, page_budget=14, max_pages=10, collection_days=4)
+        day = TODAY - timedelta(days=1)
+        sched.record("바이오", pages=3, new=2, duplicates=40, saturated_days=0, target_days=4, today=day - timedelta(days=1))
+        sched.record("반도체", pages=4, new=200, duplicates=20, saturated_days=3, target_days=4, today=day)
+        sched.record("환율", pages=2, new=30, duplicates=10, saturated_days=0, target_days=4, today=day)
+        sched.record("바이오", pages=3, new=1, duplicates=50, saturated_days=0, target_days=4, today=day)
+        sched.save()
+
+        sched = KeywordScheduler(path, page_budget=14, max_pages=10, collection_days=4)
+        check(sched.stats["바이오"]["low_yield_streak"] == 2, "scheduler: 저장한 수율 기록을 다시 읽음")
+        plans = sched.plan(["신규", "반도체", "환율", "바이오"], today=TODAY)
+        check(plans["신규"].pages == 10 and plans["신규"].due, "scheduler: 처음 보는 키워드는 최대 페이지")
+        check(not plans["바이오"].due and plans["바이오"].pages == 0, "scheduler: 저수율 키워드는 주기 안이면 건너뜀")
+        check(plans["반도체"].pages == 3 and plans["환율"].pages == 1,
+              f"scheduler: 남은 예산을 새 기사가 많은 순으로 배분 "
+              f"(반도체 {plans['반도체'].pages}, 환율 {plans['환율'].pages})")
+        check(sched.summary()["planned_pages"] <= 14, "scheduler: 계획 페이지가 page_budget 을 넘지 않음")
+
+        unlimited = KeywordScheduler(path, page_budget=None, max_pages=10, collection_days=4)
+        plans = unlimited.plan(["반도체", "환율", "바이오"], today=TODAY + timedelta(days=1))
+        check(plans["반도체"].pages == 5 and plans["환율"].pages == 3 and plans["바이오"].due,
+              "scheduler: 예산이 없으면 필요량(pages_used + 1)만큼, 주기가 지나면 저수율 키워드도 수집")
+
+
+# ==============================================================================
+# backfill.find_start_page
+# ==============================================================================
+class ListPager:
+    """최신순으로 정렬된 기사 목록을 100건씩 돌려주는 페이지 (요청 수를 셉니다)"""
+
+    def __init__(self, days, page_size):
+        self.items = [{"pub_date": d, "url": f"https://news.test/{i}"} for i, d in enumerate(days)]
+        self.page_size = page_size
+        self.requests = 0
+
+    def page(self, start):
+        self.requests += 1
+        return self.items[start - 1:start - 1 + self.page_size]
+
+
+def check_backfill():
+    import math
+    import backfill
+
+    # 날짜마다 기사 수가 다른 최신순 목록 (1000건을 넘어 가장 오래된 날짜는 닿지 않음)
+    days = []
+    for offset in range(40):
+        days += [TODAY - timedelta(days=offset)] * (15 + (offset * 37) % 60)
+    pager = ListPager(days[:len(backfill.PAGE_STARTS) * backfill.PAGE_SIZE], backfill.PAGE_SIZE)
+    last_page = len(backfill.PAGE_STARTS) - 1
+
+    def linear(day):
+        for index, start in enumerate(backfill.PAGE_STARTS):
+            items = pager.page(start)
+            if not items or min(item["pub_date"] for item in items) <= day:
+                return index
+        return last_page
+
+    mismatches, max_requests = [], 0
+    for offset in range(-1, 41):
+        day = TODAY - timedelta(days=offset)
+        expected = linear(day)
+        pager.requests = 0
+        found = backfill.find_start_page(pager, day)
+        max_requests = max(max_requests, pager.requests)
+        if found != expected:
+            mismatches.append((day.isoformat(), found, expected))
+    check(not mismatches, f"backfill: find_start_page 가 앞에서부터 훑은 결과와 같음 {mismatches[:3]}")
+    bound = math.ceil(math.log2(len(backfill.PAGE_STARTS)))
+    check(max_requests <= bound, f"backfill: 날짜당 요청 {max_requests}회 (상한 {bound}회)")
+
+
+# ==============================================================================
+# dag
+# ==============================================================================
+def check_dag():
+    from stock_crawl.dag import Artifact, Pipeline, Stage
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "input.txt")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write("a b c")
+        params = {"upper": False}
+
+        def read_text(path):
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+
+        def write_text(value, path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(value)
+
+        def read_json(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+
+        def write_json(value, path):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+
+        def tokenize(ctx):
+            return {"tokens": read_text(source).split()}
+
+        def render(ctx, tokens):
+            text = " ".join(tokens)
+            return {"report": text.upper() if params["upper"] else text}
+
+        def build():
+            return Pipeline(
+                [Artifact("tokens", os.path.join(tmp, "out", "tokens.json"), read_json, write_json),
+                 Artifact("report", os.path.join(tmp, "out", "report.txt"), read_text, write_text)],
+                [Stage("tokenize", tokenize, outputs=["tokens"], sources=[source]),
+                 Stage("render", render, inputs=["tokens"], outputs=["report"], params=lambda: dict(params))],
+                os.path.join(tmp, "out", "state.json"))
+
+        report = os.path.join(tmp, "out", "report.txt")
+        check(build().run(["render"]) == ["tokenize", "render"], "dag: 첫 실행은 모든 단계를 실행")
+        check(build().run(["render"]) == [], "dag: 지문이 같고 출력이 그대로면 모두 건너뜀")
+
+        params["upper"] = True
+        check(build().run(["render"]) == ["render"] and read_text(report) == "A B C",
+              "dag: 설정이 바뀐 단계만 다시 실행 (앞 단계 출력은 파일에서 읽음)")
+
+        with open(source, "w", encoding="utf-8") as f:
+            f.write("a b c d")
+        pipeline = build()
+        planned = [name for name, run, _ in pipeline.plan(["render"]) if run]
+        check(planned == ["tokenize"], "dag: 외부 파일이 바뀌면 계획 단계에서 그 단계부터 다시 실행으로 표시")
+        check(pipeline.run(["render"]) == ["tokenize", "render"] and read_text(report) == "A B C D",
+              "dag: 외부 파일이 바뀌면 뒤 단계까지 다시 실행")
+
+        write_text("손으로 고친 결과", report)
+        check(build().run(["render"]) == ["render"] and read_text(report) == "A B C D",
+              "dag: 출력 파일이 바뀌면 그 단계를 다시 실행")
+
+
+# ==============================================================================
+# warehouse
+# ==============================================================================
+def check_warehouse():
+    import pandas as pd
+    from stock_crawl.warehouse import Warehouse, open_warehouse, save_to_warehouse
+
+    sample = pd.read_csv(SAMPLE_CSV, encoding="utf-8")
+    sample = sample.drop_duplicates("url").head(120).reset_index(drop=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        merged = os.path.join(tmp, "merged_no_duplicate.csv")
+        db = os.path.join(tmp, "warehouse.sqlite")
+        sample.head(80).to_csv(merged, index=False, encoding="utf-8-sig")
+
+        check(open_warehouse(db, merged) is None, "warehouse: 창고 파일이 없으면 open_warehouse 는 None")
+        save_to_warehouse(sample.iloc[80:90], db, seed_csv=merged)
+        with open_warehouse(db, merged) as wh:
+            check(wh is not None and wh.count() == 90, f"warehouse: 첫 저장에서 병합본 80건 + 새 기사 10건 ({wh.count()}건)")
+            revision = wh.revision()
+
+        changed = sample.iloc[[0]].copy()
+        changed["title"] = "고친 제목"
+        with Warehouse(db) as wh:
+            wh.upsert_frame(changed)
+            check(wh.count() == 90 and wh.revision() == revision + 1, "warehouse: 같은 URL 은 upsert (행 수 그대로, revision +1)")
+            title = wh.conn.execute("SELECT title FROM articles WHERE url = ?", (changed["url"][0],)).fetchone()[0]
+            check(title == "고친 제목", "warehouse: upsert 가 기존 행을 고침")
+            check(wh.seed(merged) == 0, "warehouse: 병합본이 그대로면 다시 채우지 않음")
+
+        # 병합본이 바뀐 뒤(다른 단계가 기사를 더함): 읽는 쪽은 CSV 로 대체, 다음 저장에서 다시 채움
+        sample.head(110).to_csv(merged, index=False, encoding="utf-8-sig")
+        check(open_warehouse(db, merged) is None, "warehouse: 병합본이 바뀌면 open_warehouse 는 None (CSV 로 대체)")
+        save_to_warehouse(sample.iloc[[115]], db, seed_csv=merged)
+        with open_warehouse(db, merged) as wh:
+            new_url = sample["url"][105]
+            found = wh.conn.execute("SELECT COUNT(*) FROM articles WHERE url = ?", (new_url,)).fetchone()[0]
+            check(wh.count() == 111 and found == 1, f"warehouse: 다시 채우면 병합본에 새로 들어온 기사가 반영됨 ({wh.count()}건)")
+
+
+CHECKS = {
+    "llm_output": check_llm_output,
+    "keywords": check_keywords,
+    "scheduler": check_scheduler,
+    "backfill": check_backfill,
+    "dag": check_dag,
+    "warehouse": check_warehouse,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보조 모듈 동작 검사")
+    parser.add_argument("--only", help=f"쉼표로 구분한 검사 이름 ({', '.join(CHECKS)})")
+    args = parser.parse_args()
+    names = args.only.split(",") if args.only else list(CHECKS)
+
+    for name in names:
+        print(f"\n--- {name} ---")
+        CHECKS[name]()
+
+    if failures:
+        print(f"\n🚨 동작 검사 실패: {len(failures)}건")
+        sys.exit(1)
+    print(f"\n✅ {len(names)}개 모듈의 동작 검사를 모두 통과했습니다.")
+
+
+if __name__ == "__main__":
+    main()
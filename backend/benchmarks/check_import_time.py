@@ -0,0 +1,90 @@
+# backend/benchmarks/check_import_time.py
+# -*- coding: utf-8 -*-
+"""
+파이프라인 진입 모듈의 import 시간 예산 검사입니다.
+
+각 모듈을 새 파이썬 프로세스에서 `python -X importtime -c "import <모듈>"` 로 불러와
+1) 누적 import 시간이 예산(ms)을 넘는지
+2) 무거운 의존성(pandas, bs4, google.generativeai, tqdm, numpy, scipy)이 import 시점에 끌려오는지
+를 확인하고, 하나라도 어기면 종료 코드 1 을 돌려줍니다. (워크플로우에서 시작 시간 회귀 방지용)
+
+    python backend/benchmarks/check_import_time.py
+    python backend/benchmarks/check_import_time.py --budget-scale 2   # 느린 러너에서 예산 완화
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+
+HEAVY_MODULES = ("pandas", "numpy", "scipy", "bs4", "google.generativeai", "tqdm", "lxml")
+# 모듈 → import 시간 예산 (ms). 무거운 의존성 없이 표준 라이브러리 + dotenv 정도만 불러오는 기준.
+IMPORT_BUDGETS_MS = {
+    "run_pipeline_local": 200,
+    "run_pipeline": 200,
+    "run_ai_only": 200,
+    "cli": 200,
+    "stock_crawl.pipeline": 200,
+    "stock_crawl.metrics": 100,
+    "stock_crawl.dag": 100,
+}
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import(module, repeat=3):
+    """(최소 누적 시간 ms, import 된 최상위 모듈 이름 집합)"""
+    best, loaded = None, set()
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [BACKEND_DIR, os.getenv("PYTHONPATH")])))
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{module} import 실패:\n{proc.stderr.strip().splitlines()[-1] if proc.stderr else ''}")
+        total_us, names = 0, set()
+        for line in proc.stderr.splitlines():
+            m = _LINE_RE.match(line)
+            if not m:
+                continue
+            cumulative, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+            names.add(name)
+            if indent <= 1:  # 최상위 import 만 합산 (하위는 누적값에 이미 포함)
+                total_us += cumulative
+        ms = total_us / 1000.0
+        best = ms if best is None else min(best, ms)
+        loaded = names
+    return best, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import 시간 예산 검사")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="모든 예산에 곱할 배수")
+    parser.add_argument("--repeat", type=int, default=3, help="모듈별 측정 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<22} {'ms':>8} {'budget':>8}  heavy imports")
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        budget *= args.budget_scale
+        try:
+            ms, loaded = measure_import(module, args.repeat)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            failures.append(module)
+            continue
+        heavy = sorted(h for h in HEAVY_MODULES if h in loaded)
+        ok = ms <= budget and not heavy
+        print(f"{'✅' if ok else '❌'} {module:<20} {ms:>8.1f} {budget:>8.0f}  {', '.join(heavy) or '-'}")
+        if not ok:
+            failures.append(module)
+
+    if failures:
+        print(f"\n🚨 import 예산 초과/무거운 의존성 로드: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ 모든 진입 모듈이 import 예산 안에 있습니다.")
+
+
+if __name__ == "__main__":
+    main()
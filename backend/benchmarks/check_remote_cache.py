@@ -0,0 +1,96 @@
+# backend/benchmarks/check_remote_cache.py
+# -*- coding: utf-8 -*-
+"""
+대시보드 원격 데이터 재검증(stock_crawl.remote.fetch_if_changed) 검사입니다.
+
+스탠드인 서버(standins.FixtureServer)에 ETag 가 붙은 CSV 를 올리고 대시보드와 같은 순서로
+  fetch_if_changed → version 을 키로 한 파싱 캐시(load_articles_file)
+를 세 번 돌려서
+1) 처음 요청은 200 으로 본문을 받고 한 번 파싱하는지
+2) 내용이 그대로면 304 로 본문 없이 끝나고, 로컬 사본도 다시 쓰지 않고, 다시 파싱하지 않는지
+3) 내용이 바뀌면 200 으로 새 본문과 새 version 을 받고 다시 파싱하는지
+를 확인하고, 하나라도 어기면 종료 코드 1 을 돌려줍니다.
+
+    python backend/benchmarks/check_remote_cache.py
+"""
+import os
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from standins import FixtureServer  # noqa: E402
+from stock_crawl.remote import fetch_if_changed  # noqa: E402
+from stock_crawl.artifacts import load_articles_file  # noqa: E402
+
+SAMPLE_CSV = os.path.join(BACKEND_DIR, "output", "aggregated_stock_data_20250731.csv")
+DATA_PATH = "/data/aggregated_stock_data.csv"
+
+
+class ParseCache:
+    """대시보드 parse_data_file 처럼 (경로, version) 이 같으면 파싱 결과를 다시 씁니다."""
+
+    def __init__(self):
+        self.parses = 0
+        self._cache = {}
+
+    def get(self, path, version):
+        key = (path, version)
+        if key not in self._cache:
+            self.parses += 1
+            self._cache[key] = load_articles_file(path)
+        return self._cache[key]
+
+
+def main():
+    import pandas as pd
+    sample = pd.read_csv(SAMPLE_CSV, encoding="utf-8")
+    # 본문에 줄바꿈이 있으므로 행 단위로 잘라 앞부분(v1)과 전체(v2)를 만듭니다.
+    v1 = sample.head(len(sample) // 2).to_csv(index=False).encode("utf-8")
+    v2 = sample.to_csv(index=False).encode("utf-8")
+
+    failures = []
+
+    def check(ok, message):
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures.append(message)
+
+    with FixtureServer() as server, tempfile.TemporaryDirectory() as cache_dir:
+        url = server.publish(DATA_PATH, v1)
+        parser = ParseCache()
+
+        first = fetch_if_changed(url, cache_dir)
+        frame = parser.get(first.path, first.version)
+        check(first.changed and server.file_log[-1][1:] == (200, len(v1)),
+              f"1차 요청: 200, 본문 {len(v1):,} bytes 수신")
+        check(parser.parses == 1, f"1차 요청: 파싱 1회 ({len(frame):,}행)")
+        mtime = os.stat(first.path).st_mtime_ns
+
+        second = fetch_if_changed(url, cache_dir)
+        parser.get(second.path, second.version)
+        check(not second.changed and second.from_cache and server.file_log[-1][1:] == (304, 0),
+              "2차 요청(변경 없음): 304, 본문 0 bytes")
+        check(second.version == first.version and os.stat(second.path).st_mtime_ns == mtime,
+              "2차 요청(변경 없음): 같은 version, 로컬 사본 그대로")
+        check(parser.parses == 1, "2차 요청(변경 없음): 다시 파싱하지 않음")
+
+        server.publish(DATA_PATH, v2)
+        third = fetch_if_changed(url, cache_dir)
+        frame = parser.get(third.path, third.version)
+        check(third.changed and server.file_log[-1][1:] == (200, len(v2)),
+              f"3차 요청(내용 변경): 200, 본문 {len(v2):,} bytes 수신")
+        check(third.version != first.version and parser.parses == 2,
+              f"3차 요청(내용 변경): 새 version 으로 다시 파싱 ({len(frame):,}행)")
+
+    if failures:
+        print(f"\n🚨 원격 데이터 재검증 검사 실패: {len(failures)}건")
+        sys.exit(1)
+    print("\n✅ 304 응답은 내려받기와 파싱을 모두 건너뜁니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+# backend/benchmarks/run_benchmarks.py
+# -*- coding: utf-8 -*-
+"""
+네트워크/API 키 없이 돌아가는 오프라인 벤치마크입니다.
+
+- 파이프라인 단계: crawl_naver_news / extract_article_content / analyze_articles_with_ai /
+  aggregate_and_save_to_csv 를 run_pipeline_local 의 설정(CONFIG)으로 만든 stock_crawl.pipeline 엔진으로 실행하고,
+  네이버 API·언론사·Gemini 는 standins.py 의 로컬 대역으로 바꿔 끼웁니다.
+  analyze_local 은 같은 입력을 로컬 분석 백엔드(lexicon, stub)로 돌린 시간입니다.
+- 분석 계산: prepare_articles_frame, 트렌딩(모멘텀), 동반 등장 그래프, AI 일일 패키지 집계를
+  backend/output/merged_no_duplicate.csv 위에서 측정합니다.
+  --synthetic 10k,100k,1m 을 주면 synth_corpus.py 로 만든 합성 테이블에서도 같은 항목을 측정해
+  데이터가 커질 때 어느 계산이 먼저 무너지는지 볼 수 있습니다.
+
+각 항목을 --repeat 번 반복해 최소/중앙값/평균 시간과 초당 처리 건수, 최대 RSS 를 기록하고,
+커밋 해시·파이썬 버전·플랫폼과 함께 results/ 에 JSON 으로 저장합니다.
+최대 RSS 는 프로세스 전체의 최고치(resource.getrusage)라 앞 항목의 영향을 받습니다. 항목 하나의 메모리를 보려면
+--only 로 따로 돌리고, peak_rss_growth_mb(그 항목이 최고치를 올린 양)를 함께 봅니다. (resource 가 없는 Windows 는 null)
+
+    python backend/benchmarks/run_benchmarks.py --repeat 5
+    python backend/benchmarks/run_benchmarks.py --only crawl,extract --http-latency 0.02
+    python backend/benchmarks/run_benchmarks.py --only dashboard_trending --synthetic 10k,100k,1m
+    python backend/benchmarks/run_benchmarks.py --compare results/a.json results/b.json
+"""
+import os
+import gc
+import sys
+import copy
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime, timedelta
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+MERGED_CSV = os.path.join(BACKEND_DIR, "output", "merged_no_duplicate.csv")
+RESULT_SCHEMA_VERSION = 1
+
+for path in (BENCH_DIR, BACKEND_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from standins import FixtureServer, FakeGeminiModel  # noqa: E402
+from stock_crawl.records import analysis_text  # noqa: E402
+
+PIPELINE_BENCHMARKS = ("crawl", "extract", "analyze", "analyze_local", "save")
+DASHBOARD_BENCHMARKS = ("dashboard_prepare", "dashboard_trending", "dashboard_cooccurrence", "ai_package")
+ALL_BENCHMARKS = PIPELINE_BENCHMARKS + DASHBOARD_BENCHMARKS
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                             capture_output=True, text=True, timeout=10)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BACKEND_DIR,
+                               capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def peak_rss_mb():
+    """지금까지의 프로세스 최대 RSS (MB, resource 모듈이 없으면 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)  # macOS 는 바이트, 그 외 KB
+
+
+def measure(name, fn, repeat, setup=None):
+    """
+    setup() 의 반환값을 fn 에 넘겨 repeat 번 실행합니다. (setup 시간은 측정하지 않음)
+    fn 은 처리한 건수를 돌려줘야 합니다.
+    """
+    runs, items = [], 0
+    rss_before = peak_rss_mb()
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        gc.collect()
+        start = time.perf_counter()
+        items = fn(arg) if setup else fn()
+        runs.append(time.perf_counter() - start)
+    median = statistics.median(runs)
+    rss = peak_rss_mb()
+    result = {
+        "name": name,
+        "items": items,
+        "repeat": repeat,
+        "min_seconds": round(min(runs), 6),
+        "median_seconds": round(median, 6),
+        "mean_seconds": round(statistics.fmean(runs), 6),
+        "items_per_second": round(items / median, 3) if median > 0 else None,
+        "runs": [round(r, 6) for r in runs],
+        "peak_rss_mb": rss,
+        "peak_rss_growth_mb": None if rss is None else round(rss - rss_before, 1),
+    }
+    print(f"  ⏱️ {name:<24} {items:>7}건  중앙값 {median * 1000:9.1f}ms  "
+          f"({result['items_per_second'] or 0:,.1f}건/초)"
+          + ("" if rss is None else f"  최대 RSS {rss:,.1f}MB (+{result['peak_rss_growth_mb']:,.1f})"))
+    return result
+
+
+# ==============================================================================
+# 파이프라인 단계
+# ==============================================================================
+def bench_pipeline(selected, repeat, http_latency, llm_latency):
+    import run_pipeline_local
+    from stock_crawl.extract import extract_article_content
+    from stock_crawl.pipeline import NewsPipeline
+
+    results = []
+    with FixtureServer(latency=http_latency) as server:
+        config = run_pipeline_local.CONFIG.replace(
+            naver_api_url=server.naver_api_url, rate_limit_delay=0, collection_days=server.max_days_ago + 1,
+            analyzer_backend="gemini", summary_only_analyzer=None,
+            warehouse_seed_csv=None)  # 저장 단계는 매번 빈 창고에 저장하므로 병합본 초기화는 재지 않습니다.
+        gemini = FakeGeminiModel(latency=llm_latency)
+        pipeline = NewsPipeline(config, gemini_model=gemini)
+        keywords = server.keywords
+
+        # 이후 단계의 입력은 실제 단계 결과를 한 번 만들어 재사용합니다.
+        crawled = pipeline.crawl(keywords, set())
+        extracted = copy.deepcopy(crawled)  # Article 레코드 (본문은 공용 BodyStore 로 내보냄)
+        for article in extracted:
+            article["content"] = extract_article_content(article["url"])
+            # 녹화 응답은 원문 기준이므로, 프롬프트용으로 줄인 본문도 같은 응답을 받게 합니다.
+            text = analysis_text(article)
+            gemini.add_variant(text, pipeline.compact_for_prompt(text))
+        analyzed = pipeline.analyze(copy.deepcopy(extracted))
+
+        if "crawl" in selected:
+            results.append(measure("crawl_naver_news",
+                                   lambda: len(pipeline.crawl(keywords, set())), repeat))
+        if "extract" in selected:
+            urls = [a["url"] for a in crawled]
+            results.append(measure("extract_article_content",
+                                   lambda: len([extract_article_content(u) for u in urls]), repeat))
+        if "analyze" in selected:
+            results.append(measure("analyze_articles_with_ai",
+                                   lambda arts: len(pipeline.analyze(arts)), repeat,
+                                   setup=lambda: copy.deepcopy(extracted)))
+            if gemini.misses:
+                print(f"  ⚠️ 녹화된 Gemini 응답이 없는 기사 {gemini.misses}건 (빈 분석 결과로 대체)")
+        if "analyze_local" in selected:
+            # 같은 입력을 로컬 백엔드(감성어 사전 / 결정적 대역)로 분석했을 때
+            for backend in ("lexicon", "stub"):
+                local = NewsPipeline(config.replace(analyzer_backend=backend))
+                results.append(measure(f"analyze[{backend}]",
+                                       lambda arts: len(local.analyze(arts)), repeat,
+                                       setup=lambda: copy.deepcopy(extracted)))
+
+        if "save" in selected:
+            def run_save(arg):
+                arts, out_dir = arg
+                try:
+                    pipeline.save(arts, out_dir, warehouse_path=os.path.join(out_dir, "warehouse.sqlite"))
+                finally:
+                    shutil.rmtree(out_dir, ignore_errors=True)
+                return len(arts)
+            # 클러스터 누적 상태가 회차마다 달라지지 않도록 매번 빈 폴더에 저장합니다.
+            results.append(measure("aggregate_and_save_to_csv", run_save, repeat,
+                                   setup=lambda: (copy.deepcopy(analyzed), tempfile.mkdtemp(prefix="bench_save_"))))
+    return results
+
+
+# ==============================================================================
+# 대시보드 계산
+# ==============================================================================
+def bench_dashboard(selected, repeat, raw=None, label=""):
+    """
+    raw: CSV 에서 읽은 형태(리스트 컬럼이 문자열)의 기사 DataFrame. 없으면 merged_no_duplicate.csv.
+    label: 결과 이름 뒤에 붙일 꼬리표 (예: "@100k")
+    """
+    import pandas as pd
+    from stock_crawl.artifacts import prepare_articles_frame
+    from stock_crawl.momentum import build_count_matrix, compute_momentum, top_trending
+    from stock_crawl.cooccurrence import build_cooccurrence_graph
+
+    if raw is None:
+        raw = pd.read_csv(MERGED_CSV, encoding="utf-8")
+    prepared = prepare_articles_frame(raw.copy())
+    columns = {"keyword": "analysis_keywords", "org": "analysis_orgs"}
+    results = []
+
+    if "dashboard_prepare" in selected:
+        results.append(measure("prepare_articles_frame" + label,
+                               lambda df: len(prepare_articles_frame(df)), repeat, setup=raw.copy))
+    if "dashboard_trending" in selected:
+        def run_trending():
+            matrix = build_count_matrix(prepared, columns)
+            top_trending(compute_momentum(matrix), k=10, by="growth_pct")
+            return len(prepared)
+        results.append(measure("trending_momentum" + label, run_trending, repeat))
+    if "dashboard_cooccurrence" in selected:
+        def run_cooccurrence():
+            graph = build_cooccurrence_graph(prepared, columns, min_df=3)
+            graph.top_pairs(k=20)
+            return len(prepared)
+        results.append(measure("cooccurrence_graph" + label, run_cooccurrence, repeat))
+    if "ai_package" in selected:
+        # build_ai_package.py 와 같은 계산 (최근 7일 vs 직전 7일 모멘텀 + 감성 비율 + 상위 기사)
+        as_of = max(prepared['analysis_date'])
+
+        def run_ai_package():
+            matrix = build_count_matrix(prepared, {"keywords": "analysis_keywords", "orgs": "analysis_orgs"})
+            momentum = compute_momentum(matrix, as_of=as_of, recent_days=7, prev_days=7, min_count=3)
+            top_trending(momentum, k=10, by="delta")
+            recent = prepared[prepared['analysis_date'] > as_of - timedelta(days=7)]
+            recent['sentiment_label'].value_counts(normalize=True)
+            recent.sort_values(['sentiment_label', 'published_at'], ascending=[True, False]).head(10)
+            return len(prepared)
+        results.append(measure("ai_package" + label, run_ai_package, repeat))
+    return results
+
+
+def bench_synthetic(selected, repeat, sizes, seed):
+    """합성 테이블 크기별로 분석 계산을 측정합니다. (생성 시간은 측정에서 제외)"""
+    from synth_corpus import generate_corpus, parse_size
+
+    results = []
+    for size in sizes:
+        rows = parse_size(size)
+        start = time.perf_counter()
+        raw = generate_corpus(rows, seed=seed)
+        for col in ("analysis_keywords", "analysis_orgs"):
+            raw[col] = raw[col].map(str)  # CSV 에서 읽은 것과 같은 형태
+        print(f"\n  🧪 합성 기사 {rows:,}건 (생성 {time.perf_counter() - start:.1f}초)")
+        results += bench_dashboard(selected, repeat, raw=raw, label=f"@{size}")
+        del raw
+    return results
+
+
+# ==============================================================================
+# 결과 저장 / 비교
+# ==============================================================================
+def save_results(results, args, path=None):
+    payload = {
+        "schema_version": RESULT_SCHEMA_VERSION,
+        "commit": _git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"repeat": args.repeat, "http_latency": args.http_latency, "llm_latency": args.llm_latency,
+                     "synthetic": args.synthetic, "seed": args.seed},
+        "benchmarks": {r["name"]: r for r in results},
+    }
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"bench_{payload['commit'] or 'nocommit'}_{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 벤치마크 결과 저장: {path}")
+    return path
+
+
+def compare(base_path, new_path):
+    """두 결과 파일의 중앙값을 비교합니다. (비율 < 1 이면 빨라진 것)"""
+    with open(base_path, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    if base.get("settings") != new.get("settings"):
+        print(f"⚠️ 측정 설정이 다릅니다: {base.get('settings')} vs {new.get('settings')}")
+    print(f"📈 {base.get('commit')} → {new.get('commit')}")
+    for name, b in base["benchmarks"].items():
+        n = new["benchmarks"].get(name)
+        if not n:
+            print(f"  - {name:<28} (새 결과 없음)")
+            continue
+        ratio = n["median_seconds"] / b["median_seconds"] if b["median_seconds"] else float("nan")
+        mark = "🟢" if ratio < 0.95 else ("🔴" if ratio > 1.05 else "⚪")
+        rss = ""
+        if b.get("peak_rss_mb") is not None and n.get("peak_rss_mb") is not None:
+            rss = f"  최대 RSS {b['peak_rss_mb']:,.1f}MB → {n['peak_rss_mb']:,.1f}MB"
+        print(f"  {mark} {name:<28} {b['median_seconds'] * 1000:9.1f}ms → {n['median_seconds'] * 1000:9.1f}ms "
+              f"(x{ratio:.2f}){rss}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 파이프라인/대시보드 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3, help="항목별 반복 횟수")
+    parser.add_argument("--only", default="", help=f"쉼표로 구분한 항목 ({', '.join(ALL_BENCHMARKS)})")
+    parser.add_argument("--http-latency", type=float, default=0.0, help="로컬 HTTP 대역의 응답 지연(초)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Gemini 대역의 응답 지연(초)")
+    parser.add_argument("--synthetic", default="", help="합성 테이블 크기 (쉼표 구분, 예: 10k,100k,1m)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 테이블 시드")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: results/bench_<commit>_<시각>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="두 결과 JSON 비교")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    selected = {s.strip() for s in args.only.split(",") if s.strip()} or set(ALL_BENCHMARKS)
+    unknown = selected - set(ALL_BENCHMARKS)
+    if unknown:
+        parser.error(f"알 수 없는 항목: {', '.join(sorted(unknown))}")
+
+    print("=" * 60)
+    print(f" 오프라인 벤치마크 (반복 {args.repeat}회)")
+    print("=" * 60)
+    results = []
+    if selected & set(PIPELINE_BENCHMARKS):
+        print("\n--- 파이프라인 단계 ---")
+        results += bench_pipeline(selected, args.repeat, args.http_latency, args.llm_latency)
+    if selected & set(DASHBOARD_BENCHMARKS):
+        print("\n--- 대시보드 계산 ---")
+        results += bench_dashboard(selected, args.repeat)
+        sizes = [s.strip().lower() for s in args.synthetic.split(",") if s.strip()]
+        if sizes:
+            print("\n--- 합성 테이블 확장성 ---")
+            results += bench_synthetic(selected, args.repeat, sizes, args.seed)
+    save_results(results, args, args.output)
+
+
+if __name__ == "__main__":
+    main()
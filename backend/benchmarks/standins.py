@@ -0,0 +1,186 @@
+# backend/benchmarks/standins.py
+# -*- coding: utf-8 -*-
+"""
+벤치마크에서 외부 서비스 대신 쓰는 로컬 대역(stand-in)입니다.
+
+- FixtureServer : 127.0.0.1 에 뜨는 HTTP 서버. 네이버 검색 API(/v1/search/news.json)와
+  언론사 기사 페이지(/articles/*.html)를 fixture 에서 그대로 돌려줍니다.
+  pubDate 는 '오늘 기준 며칠 전'으로 다시 계산하므로 언제 돌려도 수집 기간 안에 들어옵니다.
+  publish(path, data) 로 올린 파일은 ETag 를 붙여 돌려주고, If-None-Match 가 같으면 본문 없이 304 를 돌려줍니다.
+  (대시보드 원격 데이터 재검증 stock_crawl.remote 확인용, 응답 상태/본문 크기는 file_log 에 기록)
+- FakeGeminiModel : generate_content(prompt) 만 흉내 내는 모델. 프롬프트의 <id>/<content> 를 읽어
+  녹화된 분석 결과를 JSON 리스트로 돌려주고, usage_metadata(추정 토큰 수)도 채워줍니다.
+"""
+import os
+import gzip
+import hashlib
+import json
+import re
+import time
+import threading
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from types import SimpleNamespace
+from urllib.parse import urlparse, parse_qs
+
+from build_fixtures import FIXTURE_DIR, content_key
+
+NAVER_PATH = "/v1/search/news.json"
+NAVER_MAX_START = 1000
+NAVER_MAX_DISPLAY = 100
+# 한국어 기준 대략 글자 2개당 1토큰으로 추정 (실제 토크나이저 없이 비교용)
+CHARS_PER_TOKEN = 2.0
+
+
+def load_jsonl_gz(name):
+    with gzip.open(os.path.join(FIXTURE_DIR, name), "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "StockCrawlFixture/1.0"
+
+    def log_message(self, *args):  # 요청마다 stderr 로 찍지 않도록
+        pass
+
+    def _send(self, status, body, content_type, headers=None):
+        payload = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_file(self, path):
+        data, etag = self.server.files[path]
+        if self.headers.get("If-None-Match") == etag:
+            self.server.file_log.append((path, 304, 0))
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.server.file_log.append((path, 200, len(data)))
+        return self._send(200, data, "application/octet-stream", {"ETag": etag})
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if parsed.path == NAVER_PATH:
+            return self._send(200, self.server.naver_response(parse_qs(parsed.query)),
+                              "application/json; charset=utf-8")
+        if parsed.path in self.server.files:
+            return self._send_file(parsed.path)
+        page = self.server.pages.get(parsed.path)
+        if page is None:
+            return self._send(404, "<html><body>Not Found</body></html>", "text/html; charset=utf-8")
+        return self._send(200, page, "text/html; charset=utf-8")
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """fixture 를 재생하는 로컬 HTTP 서버 (with 문으로 띄우고 내립니다)"""
+    daemon_threads = True
+
+    def __init__(self, latency=0.0, today=None):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self.today = today or datetime.now()
+        self.naver = {r["keyword"]: r["items"] for r in load_jsonl_gz("naver_pages.jsonl.gz")}
+        self.pages = {r["path"]: r["html"] for r in load_jsonl_gz("html_corpus.jsonl.gz")}
+        self.files = {}     # path → (bytes, ETag)
+        self.file_log = []  # (path, 상태 코드, 본문 바이트 수)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def naver_api_url(self):
+        return self.base_url + NAVER_PATH
+
+    @property
+    def keywords(self):
+        return list(self.naver)
+
+    @property
+    def max_days_ago(self):
+        return max((i["days_ago"] for items in self.naver.values() for i in items), default=0)
+
+    def publish(self, path, data):
+        """path 에 data(bytes)를 올립니다. 내용이 바뀌면 ETag 도 바뀝니다."""
+        self.files[path] = (data, '"' + hashlib.sha1(data).hexdigest()[:16] + '"')
+        return self.base_url + path
+
+    def naver_response(self, query):
+        keyword = query.get("query", [""])[0]
+        start = max(1, min(int(query.get("start", ["1"])[0]), NAVER_MAX_START))
+        display = max(1, min(int(query.get("display", ["10"])[0]), NAVER_MAX_DISPLAY))
+        items = self.naver.get(keyword, [])
+        window = items[start - 1:start - 1 + display]
+        out = []
+        for item in window:
+            hh, mm, ss = (item["time"].split(":") + ["0", "0"])[:3]
+            published = (self.today - timedelta(days=item["days_ago"])).replace(
+                hour=int(hh), minute=int(mm), second=int(float(ss)), microsecond=0)
+            link = self.base_url + item["path"]
+            out.append({
+                "title": item["title"], "originallink": link, "link": link,
+                "description": item["description"],
+                "pubDate": published.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+            })
+        return json.dumps({
+            "lastBuildDate": self.today.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+            "total": len(items), "start": start, "display": len(out), "items": out,
+        }, ensure_ascii=False)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+_ARTICLE_RE = re.compile(r'<article id="([^"<>]*)">\n?(.*?)\n?</article>', re.S)
+
+
+class FakeGeminiModel:
+    """녹화된 Gemini 응답을 돌려주는 대역. latency 초만큼 응답을 늦출 수 있습니다."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.responses = {r["key"]: r["result"] for r in load_jsonl_gz("gemini_responses.jsonl.gz")}
+        self.calls = 0
+        self.misses = 0
+
+    def add_variant(self, original, variant):
+        """프롬프트에 줄인 본문(variant)이 들어와도 원문(original)의 녹화 응답을 돌려주도록 등록합니다."""
+        recorded = self.responses.get(content_key(original))
+        if recorded is not None:
+            self.responses.setdefault(content_key(variant), recorded)
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        results = []
+        for art_id, content in _ARTICLE_RE.findall(prompt):
+            recorded = self.responses.get(content_key(content))
+            if recorded is None:
+                self.misses += 1
+                recorded = {"analysis_keywords": [], "analysis_orgs": [], "summary_ai": "",
+                            "sentiment_label": "Neutral"}
+            results.append({"id": art_id, **recorded})
+        text = "```json\n" + json.dumps(results, ensure_ascii=False, indent=2) + "\n```"
+        prompt_tokens = int(len(prompt) / CHARS_PER_TOKEN)
+        output_tokens = int(len(text) / CHARS_PER_TOKEN)
+        return SimpleNamespace(text=text, usage_metadata=SimpleNamespace(
+            prompt_token_count=prompt_tokens, candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        ))
@@ -0,0 +1,204 @@
+# backend/benchmarks/synth_corpus.py
+# -*- coding: utf-8 -*-
+"""
+대시보드 / build_ai_package 부하 시험용 합성 기사 테이블 생성기입니다.
+
+- 종목명: 코스피.txt / 코스닥.txt (analysis_orgs 와 일부 analysis_keywords 로 등장)
+- 주제 키워드: 실제 분석 결과에서 자주 나온 금융 키워드 목록 (TOPIC_KEYWORDS)
+- 언급 빈도: 순위 r 의 확률이 1/r^s 인 Zipf 분포 (s = --zipf)
+- 감성: Positive/Neutral/Negative 비율 지정 (--sentiment), 종목별로 약간의 치우침을 줌
+- 날짜: 기간(--days) 안에 평일 가중치 + 며칠간 특정 종목/키워드가 몰리는 '이슈' 구간을 섞음
+
+결과 컬럼은 merged_no_duplicate.csv / aggregated_stock_data.csv 와 같으며,
+리스트 컬럼은 CSV 에서는 "['a', 'b']" 문자열, Parquet 에서는 list 로 저장합니다.
+같은 --seed 면 같은 테이블이 나오므로 커밋 간 벤치마크 비교에 쓸 수 있습니다.
+
+    python backend/benchmarks/synth_corpus.py --rows 100k --output /tmp/synth_100k.parquet
+"""
+import os
+import sys
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from stock_crawl.paths import STOCK_LIST_FILES  # noqa: E402
+
+SIZE_PRESETS = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+SENTIMENTS = np.array(["Positive", "Neutral", "Negative"], dtype=object)
+# merged_no_duplicate.csv 기준 비율 (Positive 38%, Neutral 40%, Negative 22%)
+DEFAULT_SENTIMENT_MIX = (0.38, 0.40, 0.22)
+SEARCH_KEYWORDS = ["코스피", "코스닥", "증시", "주식", "반도체", "2차전지", "금리", "환율", "실적", "IPO",
+                   "외국인 매수", "기관 매수", "밸류업", "배당"]
+TOPIC_KEYWORDS = [
+    "코스피", "금리 인상", "반도체", "밸류업", "연준", "FOMC", "한미 관세 협상", "2차전지", "2분기 실적",
+    "주주환원", "주가 상승", "코스닥", "HBM", "트럼프", "금리 인하", "외국인", "금리 동결", "AI", "비트코인",
+    "뉴욕증시", "대미 투자", "파월 의장", "하락", "자사주 소각", "관세", "순매수", "투자", "일본은행",
+    "영업이익 감소", "인플레이션", "매출 증가", "주식시장", "외국인 순매수", "파운드리", "세제개편안",
+    "자동차", "기업 실적", "조선업", "바이오", "AI 반도체", "기준금리", "밸류업 프로그램", "매출 감소",
+    "HBM4", "어닝 서프라이즈", "중간배당", "외국인 매도", "기관", "환율", "원달러 환율", "공매도",
+    "IPO", "유상증자", "무상증자", "합병", "수주", "방산", "원전", "전기차", "데이터센터", "로봇",
+]
+PUBLISHERS = ["www.sisunnews.co.kr", "www.joongang.tv", "news.mt.co.kr", "www.hankyung.com", "www.mk.co.kr",
+              "biz.chosun.com", "www.edaily.co.kr", "www.newsis.com", "www.yna.co.kr", "www.fnnews.com"]
+
+
+def parse_size(text):
+    """'10k' / '100k' / '1m' / '2500' 같은 표기를 행 수로 바꿉니다."""
+    key = str(text).strip().lower()
+    if key in SIZE_PRESETS:
+        return SIZE_PRESETS[key]
+    if key.endswith("k"):
+        return int(float(key[:-1]) * 1_000)
+    if key.endswith("m"):
+        return int(float(key[:-1]) * 1_000_000)
+    return int(key)
+
+
+def load_stock_vocabulary(files=STOCK_LIST_FILES):
+    names = []
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            names += [line.strip() for line in f if line.strip()]
+    return list(dict.fromkeys(names))
+
+
+def zipf_probabilities(n, exponent):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _sample_lists(rng, vocab, probs, counts, bursts=None, dates=None):
+    """
+    행마다 counts[i] 개의 용어를 Zipf 분포로 뽑아 (중복 제거된) 리스트로 돌려줍니다.
+    bursts: [(용어 인덱스, 시작일, 종료일, 확률)] — 해당 기간 기사에 그 용어를 끼워 넣습니다.
+    """
+    total = int(counts.sum())
+    flat = rng.choice(len(vocab), size=total, p=probs)
+    if bursts:
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        has_slot = counts > 0
+        for term, start, end, prob in bursts:
+            hit = has_slot & (dates >= start) & (dates <= end) & (rng.random(len(counts)) < prob)
+            flat[offsets[hit]] = term
+    vocab = np.asarray(vocab, dtype=object)
+    return [list(dict.fromkeys(part)) for part in np.split(vocab[flat], np.cumsum(counts)[:-1])]
+
+
+def generate_corpus(rows, days=365, end_date=None, zipf=1.1, sentiment_mix=DEFAULT_SENTIMENT_MIX,
+                    mean_keywords=4.7, mean_orgs=2.0, n_stocks=None, n_bursts=None, seed=0):
+    """합성 기사 DataFrame 을 만듭니다. (리스트 컬럼은 list)"""
+    rng = np.random.default_rng(seed)
+    end_date = end_date or datetime.now().date()
+    start_date = end_date - timedelta(days=days - 1)
+
+    stocks = load_stock_vocabulary()
+    rng.shuffle(stocks)  # 종목 인기 순위는 시드마다 다르게
+    if n_stocks:
+        stocks = stocks[:n_stocks]
+    keyword_vocab = list(dict.fromkeys(TOPIC_KEYWORDS + stocks))
+    keyword_probs = zipf_probabilities(len(keyword_vocab), zipf)
+    org_probs = zipf_probabilities(len(stocks), zipf)
+
+    # 날짜: 평일 가중치(주말은 1/3)
+    all_days = np.arange(days)
+    weekday = np.array([(start_date + timedelta(days=int(d))).weekday() for d in all_days])
+    day_weights = np.where(weekday < 5, 3.0, 1.0)
+    day_idx = np.sort(rng.choice(days, size=rows, p=day_weights / day_weights.sum()))
+
+    # 이슈 구간: 순위가 낮은 종목/키워드가 며칠간 갑자기 많이 언급됨 (트렌딩 계산용)
+    n_bursts = n_bursts if n_bursts is not None else max(1, days // 7)
+    org_bursts = [(int(rng.integers(10, len(stocks))), s, s + int(rng.integers(2, 6)), 0.3)
+                  for s in rng.integers(0, days, size=n_bursts)]
+    kw_bursts = [(int(rng.integers(10, len(keyword_vocab))), s, s + int(rng.integers(2, 6)), 0.3)
+                 for s in rng.integers(0, days, size=n_bursts)]
+
+    kw_counts = np.clip(rng.poisson(mean_keywords, size=rows), 1, 10)
+    org_counts = np.clip(rng.poisson(mean_orgs, size=rows), 0, 8)
+    keywords = _sample_lists(rng, keyword_vocab, keyword_probs, kw_counts, kw_bursts, day_idx)
+    orgs = _sample_lists(rng, stocks, org_probs, org_counts, org_bursts, day_idx)
+
+    # 감성: 기본 비율에 종목별 치우침을 더한 뒤 행마다 뽑음
+    mix = np.asarray(sentiment_mix, dtype=float)
+    mix = mix / mix.sum()
+    stock_bias = rng.normal(0.0, 0.1, size=len(stocks))
+    stock_pos = {name: i for i, name in enumerate(stocks)}
+    first_org = np.array([stock_pos[o[0]] if o else -1 for o in orgs], dtype=np.int64)
+    pos_shift = np.where(first_org >= 0, stock_bias[first_org], 0.0)
+    p_pos = np.clip(mix[0] + pos_shift, 0.01, 0.98)
+    p_neg = np.clip(mix[2] - pos_shift / 2, 0.01, 0.98)
+    u = rng.random(rows)
+    sentiment = np.where(u < p_pos, 0, np.where(u < p_pos + p_neg, 2, 1))
+
+    day_offsets = day_idx.astype("timedelta64[D]")
+    published = np.datetime64(start_date) + day_offsets
+    seconds = rng.integers(6 * 3600, 23 * 3600, size=rows).astype("timedelta64[s]")
+    crawled = published.astype("datetime64[s]") + seconds
+    publisher = np.asarray(PUBLISHERS, dtype=object)[rng.integers(len(PUBLISHERS), size=rows)]
+    search_kw = np.asarray(SEARCH_KEYWORDS, dtype=object)[rng.integers(len(SEARCH_KEYWORDS), size=rows)]
+
+    titles = [f"{(o[0] + ' ') if o else ''}{k[0]} 관련 시장 동향" for k, o in zip(keywords, orgs)]
+    summaries = [f"{', '.join(k[:3])} 이슈가 부각되며 {o[0] if o else '시장'} 관련 투자 심리가 움직였습니다."
+                 for k, o in zip(keywords, orgs)]
+    return pd.DataFrame({
+        "search_keyword": search_kw,
+        "url": [f"https://{p}/news/articleView.html?idxno=synth{seed}_{i}" for i, p in enumerate(publisher)],
+        "title": titles,
+        "summary": summaries,
+        "crawled_at": pd.to_datetime(crawled).strftime("%Y-%m-%dT%H:%M:%S"),
+        "published_at": pd.to_datetime(published).strftime("%Y-%m-%d"),
+        "analysis_keywords": keywords,
+        "analysis_orgs": orgs,
+        "summary_ai": summaries,
+        "sentiment_label": SENTIMENTS[sentiment],
+    })
+
+
+def write_corpus(df, path):
+    """확장자에 맞춰 Parquet 또는 CSV(리스트 컬럼은 문자열 표현)로 저장합니다."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        out = df.copy()
+        for col in ("analysis_keywords", "analysis_orgs"):
+            out[col] = out[col].map(str)
+        out.to_csv(path, index=False, encoding="utf-8")
+    return path
+
+
+def parse_mix(text):
+    values = [float(x) for x in text.split(",")]
+    if len(values) != 3 or min(values) < 0 or sum(values) <= 0:
+        raise argparse.ArgumentTypeError("--sentiment 은 'Positive,Neutral,Negative' 비율 3개여야 합니다.")
+    return tuple(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 기사 테이블 생성")
+    parser.add_argument("--rows", default="10k", help="행 수 (10k / 100k / 1m 또는 숫자)")
+    parser.add_argument("--days", type=int, default=365, help="기간(일)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf 지수 (클수록 상위 종목에 몰림)")
+    parser.add_argument("--sentiment", type=parse_mix, default=DEFAULT_SENTIMENT_MIX,
+                        help="Positive,Neutral,Negative 비율 (예: 0.4,0.4,0.2)")
+    parser.add_argument("--stocks", type=int, default=None, help="사용할 종목 수 (기본: 전체)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True, help=".parquet 또는 .csv 경로")
+    args = parser.parse_args()
+
+    rows = parse_size(args.rows)
+    print(f"🧪 합성 기사 {rows:,}건 생성 중... (기간 {args.days}일, zipf={args.zipf}, seed={args.seed})")
+    df = generate_corpus(rows, days=args.days, zipf=args.zipf, sentiment_mix=args.sentiment,
+                         n_stocks=args.stocks, seed=args.seed)
+    write_corpus(df, args.output)
+    print(f"✅ 저장 완료 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
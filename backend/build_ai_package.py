@@ -1,57 +1,128 @@
 # build_ai_package.py
-import pandas as pd, ast, collections, json, os
+# 기본은 발행일별 누적 상태(stock_crawl.daily_package)로 새 기사만 더해 만들고,
+# --full 은 기존처럼 기사 DataFrame 에서 다시 계산합니다. --series 는 백테스트용 날짜별 패키지를 저장합니다.
+import pandas as pd, json, os, argparse
 from datetime import datetime, timedelta
 
-CSV_PATH = r"P:\stock_crawl\backend\output\merged_no_duplicate.csv"
-OUT_JSON = r"P:\stock_crawl\backend\output\ai_daily_package.json"
-
-df = pd.read_csv(CSV_PATH, encoding="utf-8")
-# --- 여기를 수정: published_at을 date 타입으로 ---
-df['published_at'] = pd.to_datetime(df['published_at'], errors='coerce').dt.date
-
-today = datetime.now().date()
-recent_limit = today - timedelta(days=7)
-prev_limit   = recent_limit - timedelta(days=7)
-
-recent = df[df['published_at'] >= recent_limit]
-prev   = df[(df['published_at'] < recent_limit) & (df['published_at'] >= prev_limit)]
-
-# 이하 기존 로직 그대로...
-def flat(like_list):
-    out=[]
-    for x in like_list:
-        try: out+=ast.literal_eval(str(x))
-        except: pass
-    return [i for i in out if isinstance(i,str)]
-
-def get_trending(col_name, recent, prev, topn=10):
-    rc = collections.Counter(flat(recent[col_name]))
-    pc = collections.Counter(flat(prev[col_name]))
-    items=[]
-    for k,v in rc.items():
-        if v>=3 and v>pc.get(k,0):
-            items.append((k,v-pc.get(k,0)))
-    return [k for k,_ in sorted(items,key=lambda x:x[1],reverse=True)[:topn]]
-
-trending_kw    = get_trending('analysis_keywords', recent, prev)
-trending_stock = get_trending('analysis_orgs', recent, prev)
-sent = recent['sentiment_label'].value_counts(normalize=True).round(2).to_dict()
-top_articles = recent.sort_values(['sentiment_label','published_at'], ascending=[True,False])\
-                      .head(10)[['title','summary_ai','url','sentiment_label']].to_dict('records')
-sector = collections.Counter(flat(recent['analysis_keywords'])).most_common(10)
-sector_briefs=[{"keyword":k,"mentions":v} for k,v in sector]
-
-package = {
-    "date": str(today),
-    "trending_keywords": trending_kw,
-    "trending_stocks": trending_stock,
-    "sentiment_ratio": sent,
-    "top_articles": top_articles,
-    "sector_briefs": sector_briefs
-}
-
-os.makedirs(os.path.dirname(OUT_JSON), exist_ok=True)
-with open(OUT_JSON,"w",encoding="utf-8") as f:
-    json.dump(package,f,ensure_ascii=False,indent=2)
-
-print(f"✅ AI 패키지 저장 완료 → {OUT_JSON}")
+from stock_crawl.artifacts import to_str_list
+from stock_crawl.momentum import build_count_matrix, compute_momentum, top_trending
+from stock_crawl.daily_package import DailyPackageBuilder, refresh_daily_package, ROW_COLUMNS
+from stock_crawl.paths import MERGED_CSV, AI_PACKAGE_JSON, OUTPUT_DIR
+from stock_crawl.records import iter_csv_chunks
+from stock_crawl.warehouse import open_warehouse
+
+CSV_PATH = MERGED_CSV
+OUT_JSON = AI_PACKAGE_JSON
+SERIES_JSON = os.path.join(OUTPUT_DIR, "ai_package_series.json")
+# 패키지가 보는 기간: 최근 7일 + 직전 7일 (모멘텀 비교 구간)
+PACKAGE_WINDOW_DAYS = 14
+
+
+def build_package(df, today=None):
+    """기사 DataFrame(merged_no_duplicate 형식)으로 일일 AI 패키지 dict 를 만듭니다."""
+    df = df.copy()
+    # --- 여기를 수정: published_at을 date 타입으로 ---
+    df['published_at'] = pd.to_datetime(df['published_at'], errors='coerce').dt.date
+
+    today = today or datetime.now().date()
+    recent_limit = today - timedelta(days=7)
+
+    recent = df[df['published_at'] >= recent_limit]
+
+    for col in ['analysis_keywords', 'analysis_orgs']:
+        df[col] = df[col].apply(to_str_list)
+
+    # 키워드/기관을 한 번에 계산 (최근 7일 vs 직전 7일, 최근 3회 이상 & 증가한 것만)
+    matrix = build_count_matrix(
+        df.dropna(subset=['published_at']),
+        {"keywords": "analysis_keywords", "orgs": "analysis_orgs"},
+        date_col='published_at',
+    )
+    momentum = compute_momentum(matrix, as_of=today, recent_days=7, prev_days=7, min_count=3)
+    trending = top_trending(momentum, k=10, by="delta")
+
+    def get_trending(entity_type):
+        table = trending.get(entity_type)
+        return [] if table is None else table['term'].tolist()
+
+    trending_kw    = get_trending('keywords')
+    trending_stock = get_trending('orgs')
+    sent = recent['sentiment_label'].value_counts(normalize=True).round(2).to_dict()
+    top_articles = recent.sort_values(['sentiment_label','published_at'], ascending=[True,False])\
+                          .head(10)[['title','summary_ai','url','sentiment_label']].to_dict('records')
+    kw_momentum = momentum[(momentum['entity_type'] == 'keywords') & (momentum['recent'] > 0)]
+    sector = kw_momentum.nlargest(10, 'recent')
+    sector_briefs=[{"keyword":k,"mentions":int(v)} for k,v in zip(sector['term'], sector['recent'])]
+
+    return {
+        "date": str(today),
+        "trending_keywords": trending_kw,
+        "trending_stocks": trending_stock,
+        "sentiment_ratio": sent,
+        "top_articles": top_articles,
+        "sector_briefs": sector_briefs
+    }
+
+
+def load_package_articles(today=None, csv_path=CSV_PATH):
+    """
+    패키지 입력 기사. 병합본으로 채워진 SQLite 창고(stock_crawl.warehouse)가 있으면 최근 PACKAGE_WINDOW_DAYS 일만
+    인덱스로 읽고, 없으면 병합본 CSV 전체를 읽습니다.
+    """
+    today = today or datetime.now().date()
+    wh = open_warehouse(fallback_csv=csv_path)
+    if wh is None:
+        return pd.read_csv(csv_path, encoding="utf-8")
+    with wh:
+        return wh.articles_frame(start=today - timedelta(days=PACKAGE_WINDOW_DAYS))
+
+
+def save_package(package, out_json=OUT_JSON):
+    os.makedirs(os.path.dirname(out_json), exist_ok=True)
+    with open(out_json,"w",encoding="utf-8") as f:
+        json.dump(package,f,ensure_ascii=False,indent=2)
+    return out_json
+
+
+def load_recent_csv_articles(start, csv_path=CSV_PATH):
+    """병합본 CSV 를 청크 단위로 읽어 발행일이 start 이후인 기사(ROW_COLUMNS)만 모읍니다."""
+    start = str(start)
+    recent = [chunk[chunk["published_at"].str[:10] >= start]
+              for chunk in iter_csv_chunks(csv_path, usecols=list(ROW_COLUMNS))]
+    return pd.concat(recent, ignore_index=True) if recent else pd.DataFrame(columns=list(ROW_COLUMNS))
+
+
+def build_package_incremental(today=None, csv_path=CSV_PATH):
+    """
+    최근 구간 기사 중 상태에 없는 것만 더하고 기준일 패키지를 만듭니다. (처음이면 병합본에서 초기화)
+    창고가 없으면 병합본 CSV 의 최근 구간을 읽어 더합니다. (이미 센 URL 은 상태가 건너뜀)
+    """
+    today = today or datetime.now().date()
+    start = today - timedelta(days=PACKAGE_WINDOW_DAYS)
+    wh = open_warehouse(fallback_csv=csv_path)
+    if wh is None:
+        articles = load_recent_csv_articles(start, csv_path) if os.path.exists(csv_path) else ()
+        return refresh_daily_package(articles, today=today, merged_csv=csv_path)
+    with wh:
+        articles = wh.articles_frame(start=start)
+    return refresh_daily_package(articles, today=today, merged_csv=csv_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI 일일 패키지 생성")
+    parser.add_argument("--full", action="store_true", help="누적 상태 없이 기사 전체에서 다시 계산")
+    parser.add_argument("--series", nargs=2, metavar=("START", "END"),
+                        help=f"YYYY-MM-DD 구간의 날짜별 point-in-time 패키지를 {SERIES_JSON} 에 저장 (백테스트)")
+    args = parser.parse_args()
+
+    if args.series:
+        start, end = (datetime.strptime(d, "%Y-%m-%d").date() for d in args.series)
+        # 상태 파일은 최근 RETAIN_DAYS 일만 보관하므로, 백테스트는 병합본 전체에서 채운 메모리 빌더로 만듭니다.
+        builder = DailyPackageBuilder(path=None)
+        builder.bootstrap(CSV_PATH)
+        save_package(builder.series(start, end), SERIES_JSON)
+        print(f"✅ 패키지 시계열 저장 완료 ({start} ~ {end}) → {SERIES_JSON}")
+    else:
+        package = build_package(load_package_articles()) if args.full else build_package_incremental()
+        save_package(package, OUT_JSON)
+        print(f"✅ AI 패키지 저장 완료 → {OUT_JSON}")
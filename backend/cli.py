@@ -0,0 +1,303 @@
+# backend/cli.py
+# -*- coding: utf-8 -*-
+"""
+수집 → 본문 추출 → AI 분석 → 저장 → 누적 병합 → SQLite 창고 → AI 패키지 / 관련도 모델 / 키워드 추천·정리를
+하나의 의존 그래프로 실행하는 통합 진입점입니다.
+
+    python backend/cli.py list                      # 단계와 입력/출력 보기
+    python backend/cli.py plan daily                # 무엇을 다시 실행할지 미리 보기
+    python backend/cli.py run                       # 일일 갱신 (= run daily)
+    python backend/cli.py run add_keywords          # 키워드 추천만 (필요한 앞 단계는 최신이면 건너뜀)
+    python backend/cli.py run package --force merge # 병합부터 다시
+
+- 각 단계의 입력 지문(앞 단계 출력 파일 내용, 설정값, 외부 파일)이 지난 실행과 같으면 건너뜁니다.
+  수집 단계는 날짜/키워드/수집 기간이 지문이므로 같은 날 다시 실행하면 중간 파일에서 이어갑니다.
+- 한 번의 실행 안에서는 앞 단계가 만든 DataFrame/기사 목록을 파일을 다시 읽지 않고 넘깁니다.
+- 수집~저장은 run_pipeline_local.py 의 설정(CONFIG)으로 만든 stock_crawl.pipeline 엔진을, 나머지는 기존 스크립트
+  (aggregator.py, build_ai_package.py, add_keword.py, delete_keyword.py)의 함수를 그대로 호출합니다.
+- 실행 상태는 backend/output/.pipeline_state.json, 실행 리포트는 output/reports 에 남습니다.
+"""
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from stock_crawl.dag import Artifact, Stage, Pipeline  # noqa: E402
+from stock_crawl.metrics import start_run  # noqa: E402
+from stock_crawl.paths import (  # noqa: E402
+    OUTPUT_DIR, INTERMEDIATE_DIR, AGGREGATED_DIR, MERGED_CSV, AI_PACKAGE_JSON, RELEVANCE_MODEL_NPZ, WAREHOUSE_DB,
+)
+
+STATE_PATH = os.path.join(OUTPUT_DIR, ".pipeline_state.json")
+TARGET_ALIASES = {
+    "daily": ["package", "keywords", "relevance_model"],
+    "all": ["package", "relevance_model", "add_keywords", "review_keywords"],
+}
+
+
+# ==============================================================================
+# 아티팩트 저장/불러오기
+# ==============================================================================
+def save_records(records, path):
+    import pandas as pd
+    from stock_crawl.records import FIELDS, articles_to_frame
+    # 새 기사가 0건이어도 헤더는 씁니다. (헤더 없는 빈 CSV 는 다음 실행에서 읽을 수 없음)
+    frame = articles_to_frame(records) if records else pd.DataFrame(columns=FIELDS)
+    frame.to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def load_records(path):
+    from stock_crawl.records import iter_articles
+    # 예전 실행이 남긴 0바이트 파일은 빈 목록으로 봅니다.
+    if os.path.getsize(path) == 0:
+        return []
+    # 청크 단위로 읽습니다. 빈 칸은 NaN 대신 "" 라서 content.startswith(...) 같은 문자열 처리가 깨지지 않습니다.
+    return list(iter_articles(path))
+
+
+def load_frame(path):
+    import pandas as pd
+    return pd.read_csv(path, encoding="utf-8-sig")
+
+
+def save_json(value, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, indent=2)
+
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_merged_frame(df, path):
+    from aggregator import save_merged
+    save_merged(df, path)
+
+
+def save_ai_package(package, path):
+    from build_ai_package import save_package
+    save_package(package, path)
+
+
+# ==============================================================================
+# 단계
+# ==============================================================================
+def _script():
+    # .env 로드와 로컬 설정(CONFIG)/검색 키워드/엔진은 run_pipeline_local.py 와 공유합니다.
+    import run_pipeline_local
+    return run_pipeline_local
+
+
+def _known_urls():
+    """이미 병합본에 있는 URL (다시 수집/분석하지 않음)"""
+    if not os.path.exists(MERGED_CSV):
+        return set()
+    import pandas as pd
+    return set(pd.read_csv(MERGED_CSV, usecols=["url"], encoding="utf-8-sig")["url"].dropna())
+
+
+def crawl_params(ctx):
+    s = _script()
+    return {
+        "date": ctx.today,
+        "keywords": list(s.STOCK_SEARCH_KEYWORDS),
+        "days": s.CONFIG.collection_days,
+        "per_day": s.CONFIG.articles_per_day,
+        "skip_known": ctx.skip_known,
+    }
+
+
+def stage_crawl(ctx):
+    s = _script()
+    existing = _known_urls() if ctx.skip_known else set()
+    if existing:
+        print(f"  - 병합본에 이미 있는 URL {len(existing)}개는 건너뜁니다.")
+    scheduler = s.pipeline.create_scheduler(AGGREGATED_DIR)
+    crawled = s.pipeline.crawl(s.STOCK_SEARCH_KEYWORDS, existing, scheduler)
+    scheduler.save()
+    ctx.run.extra["crawl_schedule"] = scheduler.summary()
+    return {"crawled": crawled}
+
+
+def stage_extract(ctx, crawled):
+    # 수집 단계의 레코드를 그대로 채웁니다. (사본 없음)
+    return {"extracted": _script().pipeline.extract(crawled)}
+
+
+def stage_analyze(ctx, extracted):
+    return {"analyzed": _script().pipeline.analyze(extracted)}
+
+
+def stage_save(ctx, analyzed):
+    df = _script().pipeline.save(analyzed, AGGREGATED_DIR)
+    return {"aggregated": df}
+
+
+def merge_sources(ctx=None):
+    """병합 입력 파일: output/*.csv 스냅샷 (병합본 자신은 출력이므로 지문에서 제외)"""
+    from aggregator import list_source_files
+    return [f for f in list_source_files(OUTPUT_DIR) if os.path.abspath(f) != os.path.abspath(MERGED_CSV)]
+
+
+def stage_merge(ctx, aggregated):
+    from aggregator import merge_articles
+    files = merge_sources()
+    # 기존 병합본도 누적 기반으로 함께 읽습니다. (스냅샷이 지워져도 과거 기사가 유지됨)
+    if os.path.exists(MERGED_CSV):
+        files.append(MERGED_CSV)
+    frames = [aggregated] if aggregated is not None and len(aggregated) else []
+    merged = merge_articles(files, frames=frames)
+    print(f"  - 병합 완료: 총 {len(merged)}건 (중복 제거)")
+    return {"merged": merged}
+
+
+def stage_warehouse(ctx, merged):
+    from stock_crawl.warehouse import save_to_warehouse
+    # 저장 단계가 이미 넣은 기사는 빈 컬럼을 덮어쓰지 않고 분석 결과/클러스터만 병합본 기준으로 맞춥니다.
+    # merged 가 병합본 전체이므로 병합본을 다시 읽어 채우지 않고 채워졌다는 표시만 남깁니다.
+    save_to_warehouse(merged, WAREHOUSE_DB, seed_csv=MERGED_CSV, complete=True)
+    return {"warehouse": WAREHOUSE_DB}
+
+
+def stage_package(ctx, warehouse):
+    from build_ai_package import build_package_incremental
+    # 최근 구간만 창고 인덱스로 읽고, 발행일별 누적 상태에 없는 기사만 더합니다.
+    return {"ai_package": build_package_incremental(ctx.today_date)}
+
+
+def stage_relevance_model(ctx, merged):
+    from stock_crawl.relevance import train_relevance_model
+    return {"relevance_model": train_relevance_model(MERGED_CSV, RELEVANCE_MODEL_NPZ)}
+
+
+def load_relevance_model(path):
+    from stock_crawl.relevance import RelevanceModel
+    return RelevanceModel.load(path)
+
+
+def stage_keywords(ctx, aggregated):
+    from stock_crawl.keywords import refresh_keyword_store
+    articles = aggregated if aggregated is not None else []
+    return {"keyword_lifecycle": refresh_keyword_store(articles, today=ctx.today_date)}
+
+
+def stage_add_keywords(ctx, keyword_lifecycle):
+    from add_keword import recommend_keywords
+    recommended = recommend_keywords()
+    print("💡 추천 검색 키워드 (최근 30일 기준, 기존에 없는 것):")
+    for kw, count in recommended:
+        print(f"- {kw} ({count}회)")
+    return {"keyword_recommendations": [{"keyword": kw, "count": count} for kw, count in recommended]}
+
+
+def stage_review_keywords(ctx, keyword_lifecycle):
+    from delete_keyword import review_keywords
+    review = review_keywords()
+    print("💡 최근 30일간 거의 등장하지 않은 '정리 추천' 키워드:", ", ".join(review["low_importance"]) or "없음")
+    return {"keyword_review": review}
+
+
+def build_pipeline(ctx):
+    artifacts = [
+        Artifact("crawled", os.path.join(INTERMEDIATE_DIR, "crawled_index.csv"), load_records, save_records),
+        # run_pipeline_local.py 의 "이어하기" 중간 파일(crawled_data.csv)과는 다른 이름을 씁니다.
+        # (같은 파일이면 cli 실행 뒤 스크립트가 수집을 건너뛰고 지난 기사를 다시 분석함)
+        Artifact("extracted", os.path.join(INTERMEDIATE_DIR, "extracted_data.csv"), load_records, save_records),
+        Artifact("analyzed", os.path.join(INTERMEDIATE_DIR, "analyzed_data.csv"), load_records, save_records),
+        # aggregate_and_save_to_csv 가 직접 저장하므로 save 는 없음
+        Artifact("aggregated", os.path.join(AGGREGATED_DIR, "aggregated_stock_data.csv"), load_frame),
+        Artifact("merged", MERGED_CSV, load_frame, save_merged_frame),
+        # save_to_warehouse 가 직접 저장하므로 save 는 없음 (값은 창고 파일 경로)
+        Artifact("warehouse", WAREHOUSE_DB, lambda path: path),
+        Artifact("ai_package", AI_PACKAGE_JSON, load_json, save_ai_package),
+        # train_relevance_model 이 직접 저장하므로 save 는 없음
+        Artifact("relevance_model", RELEVANCE_MODEL_NPZ, load_relevance_model),
+        Artifact("keyword_lifecycle", os.path.join(OUTPUT_DIR, "keyword_lifecycle.json"), load_json, save_json),
+        Artifact("keyword_recommendations", os.path.join(OUTPUT_DIR, "keyword_recommendations.json"),
+                 load_json, save_json),
+        Artifact("keyword_review", os.path.join(OUTPUT_DIR, "keyword_review.json"), load_json, save_json),
+    ]
+    day = {"date": ctx.today}
+    stages = [
+        Stage("crawl", stage_crawl, outputs=["crawled"], params=lambda: crawl_params(ctx),
+              description="네이버 뉴스 수집"),
+        Stage("extract", stage_extract, inputs=["crawled"], outputs=["extracted"], description="기사 본문 추출"),
+        Stage("analyze", stage_analyze, inputs=["extracted"], outputs=["analyzed"], description="Gemini 분석"),
+        Stage("save", stage_save, inputs=["analyzed"], outputs=["aggregated"],
+              description="정규화·클러스터링 후 aggregated CSV/Parquet 저장"),
+        Stage("merge", stage_merge, inputs=["aggregated"], outputs=["merged"], sources=merge_sources,
+              description="스냅샷 누적 병합 (aggregator)"),
+        Stage("warehouse", stage_warehouse, inputs=["merged"], outputs=["warehouse"],
+              description="병합본을 SQLite 창고에 반영 (stock_crawl.warehouse)"),
+        Stage("package", stage_package, inputs=["warehouse"], outputs=["ai_package"], params=day,
+              description="AI 일일 패키지 (build_ai_package)"),
+        Stage("relevance_model", stage_relevance_model, inputs=["merged"], outputs=["relevance_model"],
+              description="Gemini 전 관련도 판별 모델 학습 (stock_crawl.relevance)"),
+        Stage("keywords", stage_keywords, inputs=["aggregated"], outputs=["keyword_lifecycle"], params=day,
+              description="키워드 저장소 일별 집계 갱신 + 추가/정리 (stock_crawl.keywords)"),
+        Stage("add_keywords", stage_add_keywords, inputs=["keyword_lifecycle"], outputs=["keyword_recommendations"],
+              params=day, description="검색 키워드 추천 (add_keword)"),
+        Stage("review_keywords", stage_review_keywords, inputs=["keyword_lifecycle"], outputs=["keyword_review"],
+              params=day, description="검색 키워드 정리 추천 (delete_keyword)"),
+    ]
+    return Pipeline(artifacts, stages, STATE_PATH)
+
+
+def _expand_targets(targets):
+    out = []
+    for t in targets or ["daily"]:
+        out += TARGET_ALIASES.get(t, [t])
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="stock_crawl 통합 실행기")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="단계 목록")
+    for name in ("plan", "run"):
+        p = sub.add_parser(name, help="실행 계획 보기" if name == "plan" else "단계 실행")
+        p.add_argument("targets", nargs="*", help=f"목표 단계 또는 별칭 ({', '.join(TARGET_ALIASES)}), 기본 daily")
+        p.add_argument("--force", action="append", default=[], help="지문과 상관없이 다시 실행할 단계 (여러 번 지정 가능)")
+        p.add_argument("--force-all", action="store_true", help="목표까지의 모든 단계를 다시 실행")
+        p.add_argument("--recrawl-known", action="store_true", help="병합본에 이미 있는 URL 도 다시 수집")
+        p.add_argument("--profile", action="store_true", help="단계별 cProfile 기록 (output/profiles)")
+    args = parser.parse_args(argv)
+
+    now = datetime.now()
+    ctx = SimpleNamespace(today=now.strftime("%Y-%m-%d"), today_date=now.date(),
+                          skip_known=not getattr(args, "recrawl_known", False), run=None)
+    pipeline = build_pipeline(ctx)
+
+    if args.command == "list":
+        for stage in pipeline.stages.values():
+            print(f"- {stage.name:<16} {', '.join(stage.inputs) or '-':<12} → {', '.join(stage.outputs):<24} "
+                  f"{stage.description}")
+        return
+
+    targets = _expand_targets(args.targets)
+    force = set(pipeline.upstream(targets)) if args.force_all else set(args.force)
+    if args.command == "plan":
+        for name, will_run, reason in pipeline.plan(targets, force):
+            print(f"{'▶️ ' if will_run else '⏭️ '} {name:<16} {reason}")
+        return
+
+    run = start_run("cli", profile_dir=os.path.join(OUTPUT_DIR, "profiles"))
+    ctx.run = run
+    run.extra["targets"] = targets
+    try:
+        executed = pipeline.run(targets, ctx=ctx, force=force, metrics=run)
+        run.extra["executed_stages"] = executed
+        print(f"\n✅ 완료: 실행 {len(executed)}개 단계 ({', '.join(executed) or '없음'})")
+    finally:
+        run.write_report(os.path.join(OUTPUT_DIR, "reports"))
+
+
+if __name__ == "__main__":
+    main()
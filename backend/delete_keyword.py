@@ -1,40 +1,60 @@
-import pandas as pd
-import ast
-import collections
-
-# 기존 키워드 리스트
-STOCK_SEARCH_KEYWORDS = ["코스피", "연준", "삼성전자", "2분기 실적", 
-"주가 상승", "파월 의장", "반도체", "금리 동결", "한미 관세 협상", "코스닥"]
-
-# 기사 데이터 로드
-CSV_PATH = r"P:\stock_crawl\backend\output\merged_no_duplicate.csv"
-df = pd.read_csv(CSV_PATH, encoding="utf-8")
-df['published_at'] = pd.to_datetime(df['published_at'])
-date_limit = pd.Timestamp.now() - pd.Timedelta(days=30)
-df = df[df['published_at'] >= date_limit]
-
-# 키워드 전체 집계
-all_keywords = []
-for x in df['analysis_keywords']:
-    try:
-        kws = ast.literal_eval(str(x))
-        all_keywords.extend([k for k in kws if isinstance(k, str)])
-    except Exception:
-        continue
-keyword_counts = collections.Counter(all_keywords)
-
-# 기존 키워드별 등장 빈도
-print("\n[기존 키워드별 최근 30일 기사 등장수]")
-for kw in STOCK_SEARCH_KEYWORDS:
-    print(f"{kw}: {keyword_counts[kw]}회")
-
-# “중요도 낮은 키워드” 자동 정리(3회 이하 등 임계값 적용)
-LOW_IMPORTANCE = [kw for kw in STOCK_SEARCH_KEYWORDS if keyword_counts[kw] <= 3]
-print("\n💡 최근 30일간 거의 등장하지 않은 '정리 추천' 키워드:")
-for kw in LOW_IMPORTANCE:
-    print(f"- {kw}")
-
-# "상위 N개만 남기고 나머지 자동 제거" 예시 (N=10)
-N = 10
-top_keywords = [kw for kw, _ in keyword_counts.most_common(N)]
-print(f"\n💡 추천 상위 {N}개 키워드만 남기기:", top_keywords)
+import sys
+
+from add_keword import _open_store
+from stock_crawl.keywords import RETIRE_WINDOW_DAYS, RETIRE_MAX_COUNT, RETIRE_STREAK_DAYS, keyword_key
+
+# 검색 키워드 목록은 키워드 저장소(backend/output/keyword_store.json)의 활성 키워드입니다.
+#
+#   python backend/delete_keyword.py                 # 정리 추천 보기
+#   python backend/delete_keyword.py 키워드1 키워드2  # 검색 키워드에서 직접 정리 (자동으로 다시 추가되지 않음)
+
+
+def review_keywords(store=None, days=RETIRE_WINDOW_DAYS, low_threshold=RETIRE_MAX_COUNT, top_n=10):
+    """
+    기존 키워드의 최근 등장 횟수, 정리 추천 키워드(low_threshold 회 이하),
+    전체 상위 top_n 키워드를 dict 로 돌려줍니다.
+    """
+    store = _open_store(store)
+    existing = store.active_keywords()
+    anchor = store.anchor_day()
+    counts = store.window_counts(days, anchor) if anchor else {}
+    keyword_counts = {kw: counts.get(keyword_key(kw), 0) for kw in existing}
+    return {
+        "counts": keyword_counts,
+        # “중요도 낮은 키워드” 자동 정리(3회 이하 등 임계값 적용)
+        "low_importance": [kw for kw in existing if keyword_counts[kw] <= low_threshold],
+        # "상위 N개만 남기고 나머지 자동 제거" 예시 (N=10)
+        "top_keywords": [store.label(key) for key, _ in counts.most_common(top_n)] if anchor else [],
+    }
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    store = _open_store()
+    if args:
+        for kw in args:
+            if store.retire(kw):
+                print(f"➖ 검색 키워드 정리: {kw}")
+            else:
+                print(f"⚠️ 활성 키워드가 아닙니다: {kw}")
+        store.save()
+    else:
+        N = 10
+        review = review_keywords(store, top_n=N)
+
+        # 기존 키워드별 등장 빈도
+        print("\n[기존 키워드별 최근 30일 기사 등장수]")
+        for kw, count in review["counts"].items():
+            print(f"{kw}: {count}회")
+
+        print("\n💡 최근 30일간 거의 등장하지 않은 '정리 추천' 키워드:")
+        for kw in review["low_importance"]:
+            print(f"- {kw}")
+
+        candidates = store.evaluate(apply=False)["retire_candidates"]
+        if candidates:
+            print(f"\n🔁 자동 정리 대기 중 (연속 {RETIRE_STREAK_DAYS}일 기준):")
+            for c in candidates:
+                print(f"- {c['keyword']} ({c['count']}회, {c['streak']}/{RETIRE_STREAK_DAYS})")
+
+        print(f"\n💡 추천 상위 {N}개 키워드만 남기기:", review["top_keywords"])
@@ -0,0 +1,8 @@
+# backend/stock_crawl/__init__.py
+# -*- coding: utf-8 -*-
+"""
+파이프라인 스크립트(backend/*.py)와 대시보드(dashboard/*.py)가 함께 쓰는 공용 모듈 모음입니다.
+
+backend 폴더가 sys.path 에 있으면 `from stock_crawl.artifacts import ...` 형태로 가져올 수 있습니다.
+(`python backend/run_pipeline.py` 로 실행하면 자동으로 잡히고, 대시보드는 직접 경로를 추가합니다.)
+"""
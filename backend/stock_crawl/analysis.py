@@ -0,0 +1,63 @@
+# backend/stock_crawl/analysis.py
+# -*- coding: utf-8 -*-
+"""
+AI 구조화 분석 단계의 설정 해석입니다. (프롬프트, Gemini 모델 초기화, 기사별 분석 백엔드 라우터)
+
+실제 배치/재시도/결과 반영은 stock_crawl.analyzers.analyze_articles 가 하고, 여기서는 PipelineConfig 로
+  - 기본/요약 전용 백엔드 (analyzer_backend / summary_only_analyzer)
+  - Gemini 를 쓸 때 관련도가 낮은 기사를 돌릴 백엔드와 배치 우선순위 (relevance_fallback, stock_crawl.relevance)
+  - Gemini 배치 크기와 본문 글자 예산 (batch_size / prompt_char_budget, stock_crawl.compaction)
+을 정해 AnalyzerRouter 를 만듭니다.
+"""
+import functools
+
+from stock_crawl.lazy import lazy_import
+from stock_crawl.analyzers import AnalyzerRouter, GeminiAnalyzer, LexiconAnalyzer, StubAnalyzer
+from stock_crawl.compaction import compact_text
+
+genai = lazy_import("google.generativeai")
+
+
+def get_stock_analysis_prompt(content):
+    """주식/경제 뉴스 분석 프롬프트. 지시문은 배치당 한 번, 가장 짧은 형태로 넣습니다."""
+    return f"""금융 뉴스 분석가로서 <article> 태그의 기사마다 JSON 객체 하나를 만들어, 설명 없이 JSON 배열만 출력하세요.
+필드: id(태그의 id 그대로), analysis_keywords(핵심 키워드 5개 내외), analysis_orgs(언급된 주요 기관/기업), summary_ai(2~3문장 요약), sentiment_label(Positive|Negative|Neutral)
+
+{content}"""
+
+
+def create_gemini_model(config):
+    """Gemini 모델을 초기화합니다."""
+    if not config.google_api_key:
+        raise ValueError("Google API 키가 설정되지 않았습니다.")
+    try:
+        genai.configure(api_key=config.google_api_key)
+        model = genai.GenerativeModel(config.gemini_model_name)
+        print("✅ Gemini 모델 초기화 성공")
+        return model
+    except Exception as e:
+        print(f"🚨 Gemini 모델 초기화 실패: {e}")
+        raise
+
+
+def prompt_compactor(config):
+    """중복 문단/바이라인을 지우고 prompt_char_budget 안의 핵심 문장만 남기는 함수"""
+    return functools.partial(compact_text, budget=config.prompt_char_budget)
+
+
+def build_analyzer_router(config, gemini_model=None):
+    """
+    설정의 분석 백엔드로 기사별 라우터를 만듭니다.
+    Gemini 를 쓸 때는 관련도가 낮은 기사를 relevance_fallback 으로 돌리고, 나머지는 관련도 높은 순으로 배치합니다.
+    """
+    rules, priority = [], None
+    if config.needs_gemini() and config.relevance_fallback != "off":
+        from stock_crawl.relevance import RelevanceModel, RelevanceScorer
+        scorer = RelevanceScorer(model=RelevanceModel.load())
+        rules, priority = [scorer.rule(config.relevance_fallback)], scorer.priority
+    return AnalyzerRouter({
+        "gemini": lambda: GeminiAnalyzer(gemini_model, get_stock_analysis_prompt, config.batch_size,
+                                         compactor=prompt_compactor(config)),
+        "lexicon": LexiconAnalyzer,
+        "stub": StubAnalyzer,
+    }, default=config.analyzer_backend, summary_only=config.summary_backend, rules=rules, priority=priority)
@@ -0,0 +1,328 @@
+# backend/stock_crawl/analyzers.py
+# -*- coding: utf-8 -*-
+"""
+기사 분석 백엔드와 기사별 라우팅입니다.
+
+모든 백엔드는 같은 계약을 따릅니다.
+    analyze_batch([(id, 분석할 글), ...], batch_index) → [{"id", "analysis_keywords", "analysis_orgs",
+                                                         "summary_ai", "sentiment_label"}, ...]
+결과에 빠진 id 는 실패로 보고, 백엔드의 max_attempts 안에서 그 기사들만 모아 다시 배치합니다.
+
+- gemini  : GeminiAnalyzer — 기존 배치 프롬프트 + generate_content (모델/프롬프트 함수는 스크립트가 넘김)
+- lexicon : LexiconAnalyzer — 금융 감성어 사전 + 종목 사전(EntityNormalizer) + 빈도 키워드. 네트워크 없음
+- stub    : StubAnalyzer — 글 내용만으로 정해지는 결정적 결과. 오프라인 테스트/처리량 측정용
+
+AnalyzerRouter 가 기사마다 백엔드를 고릅니다. 기본 규칙은 "본문 추출에 실패해 요약만 있는 기사 →
+summary_only 백엔드, 나머지 → default" 이고, rules 로 기사별 규칙(기사 → 백엔드 이름 또는 None)을 앞에 더할 수 있습니다.
+(예: stock_crawl.relevance 의 관련도 점수가 낮은 기사 → lexicon, 나머지는 점수 높은 순으로 배치)
+"""
+import re
+import time
+import zlib
+import collections
+
+from stock_crawl.llm_output import SENTIMENT_LABELS, parse_analysis_response
+from stock_crawl.metrics import current_run
+from stock_crawl.records import analysis_text, has_body
+
+_TOKEN_RE = re.compile(r"[가-힣A-Za-z][가-힣A-Za-z0-9&]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+# 토큰 끝에서 떼어 낼 조사 (길이별 집합, 긴 것부터 확인)
+_JOSA = ["은", "는", "이", "가", "을", "를", "의", "에", "에서", "에게", "으로", "로", "와", "과", "도",
+         "만", "까지", "부터", "보다", "이며", "이다", "에도", "에는", "으로는", "로는"]
+_JOSA_BY_LEN = [(n, {j for j in _JOSA if len(j) == n}) for n in (3, 2, 1)]
+_STOPWORDS = {
+    "기자", "뉴스", "이번", "지난", "오늘", "이날", "올해", "최근", "현재", "대한", "통해", "위해", "관련", "따르면",
+    "있다", "했다", "밝혔다", "것으로", "가운데", "한편", "이후", "이상", "이하", "전년", "대비", "그러나", "하지만",
+    "또한", "있는", "없는", "하는", "했다고", "있다고", "말했다", "설명했다", "예정이다", "기준", "수준", "사진",
+}
+
+# 종목명이지만 일반 단어/언론사 이름으로 더 자주 쓰이는 토큰 (토큰 그대로는 종목으로 보지 않음)
+COMMON_WORD_STOCKS = {
+    "대상", "나노", "선진", "신흥", "상보", "서한", "전방", "신원", "진영", "레몬", "오로라", "동방", "코디",
+    "캐리", "러셀", "삼기", "NEW", "YTN", "SBS",
+}
+
+# 금융 기사 감성어 (부분 문자열로 셉니다)
+POSITIVE_TERMS = [
+    "상승", "급등", "반등", "강세", "호재", "호조", "상향", "신고가", "최고치", "증가", "개선", "흑자", "돌파",
+    "순매수", "수주", "성장", "확대", "회복", "기대감", "호실적", "최대 실적", "턴어라운드",
+]
+NEGATIVE_TERMS = [
+    "하락", "급락", "약세", "악재", "하향", "신저가", "감소", "부진", "적자", "순매도", "우려", "리스크", "손실",
+    "쇼크", "둔화", "축소", "위축", "경고", "불확실", "폭락", "감익", "소송",
+]
+SENTIMENT_MARGIN = 0.2  # (긍정 - 부정) / (긍정 + 부정 + 1) 이 이 값을 넘어야 Positive/Negative
+
+# Gemini 배치 프롬프트 안의 기사 하나 (프롬프트 지시문도 이 형식을 설명해야 합니다)
+ARTICLE_TEMPLATE = '<article id="{id}">\n{text}\n</article>'
+
+
+def _strip_josa(token):
+    for n, endings in _JOSA_BY_LEN:
+        if len(token) - n >= 2 and token[-n:] in endings:
+            return token[:-n]
+    return token
+
+
+def tokenize(text):
+    """한글/영문 토큰 (조사 제거, 불용어 제외)"""
+    tokens = (_strip_josa(t) for t in _TOKEN_RE.findall(text))
+    return [t for t in tokens if len(t) >= 2 and t not in _STOPWORDS]
+
+
+def resolve_stock_tokens(tokens, normalizer, memo):
+    """토큰(과 인접 두 토큰 이어 붙인 것)을 종목/별칭 사전으로 해석한 정식 명칭 목록 (등장 순, 중복 없음)"""
+    found = []
+    for token in tokens + [a + b for a, b in zip(tokens, tokens[1:])]:
+        name = memo.get(token, False)
+        if name is False:
+            name = memo[token] = None if token.upper() in COMMON_WORD_STOCKS else normalizer.resolve(token)
+        if name is not None and name not in found:
+            found.append(name)
+    return found
+
+
+def lead_summary(text, sentences=2, max_chars=200):
+    """앞 문장 몇 개로 만든 요약"""
+    parts = _SENTENCE_RE.split(" ".join(text.split()))
+    return " ".join(parts[:sentences])[:max_chars]
+
+
+class Analyzer:
+    """분석 백엔드 기본형. batch_size 개씩 analyze_batch 로 넘깁니다."""
+
+    name = "base"
+    batch_size = 200
+    max_attempts = 1  # 결과를 못 받은 기사를 다시 보내는 최대 횟수 (첫 시도 포함)
+
+    def analyze_batch(self, batch, batch_index):
+        raise NotImplementedError
+
+
+class GeminiAnalyzer(Analyzer):
+    """
+    기존 Gemini 배치 분석. 호출마다 토큰/지연을 RunMetrics 에 남깁니다.
+    응답은 원소 단위로 검증하므로(stock_crawl.llm_output) 깨진 원소가 있어도 나머지 결과는 씁니다.
+    compactor(글 → 줄인 글)를 주면 본문을 줄여 넣고, 줄이기 전/후 프롬프트 크기를 함께 남깁니다.
+    """
+
+    name = "gemini"
+
+    def __init__(self, model, prompt_builder, batch_size=7, max_attempts=2, compactor=None):
+        if model is None:
+            raise ValueError("Gemini 모델이 초기화되지 않았습니다.")
+        self.model = model
+        self.prompt_builder = prompt_builder
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.compactor = compactor
+
+    def analyze_batch(self, batch, batch_index):
+        raw_chars = None
+        if self.compactor is not None:
+            raw_chars = len(self.prompt_builder("\n".join(ARTICLE_TEMPLATE.format(id=aid, text=text)
+                                                          for aid, text in batch)))
+            batch = [(aid, self.compactor(text)) for aid, text in batch]
+        final_prompt = self.prompt_builder("\n".join(ARTICLE_TEMPLATE.format(id=aid, text=text)
+                                                      for aid, text in batch))
+
+        call_start = time.perf_counter()
+        response = None
+        try:
+            response = self.model.generate_content(final_prompt)
+            current_run().record_llm_call(batch_index, len(batch), time.perf_counter() - call_start,
+                                          response, prompt_chars=len(final_prompt), raw_prompt_chars=raw_chars)
+            self._report_size(final_prompt, raw_chars)
+            results, failed, problems = parse_analysis_response(response.text, [aid for aid, _ in batch])
+        except Exception as e:
+            if response is None:
+                current_run().record_llm_call(batch_index, len(batch), time.perf_counter() - call_start,
+                                              ok=False, prompt_chars=len(final_prompt), raw_prompt_chars=raw_chars)
+            else:
+                current_run().incr("llm_parse_failures")
+            print(f"    - 배치 {batch_index} 분석 중 오류: {e}")
+            return []
+        if not results:
+            current_run().incr("llm_parse_failures")
+        if problems:
+            current_run().incr("llm_invalid_items", len(problems))
+        if failed:
+            print(f"    ⚠️ 배치 {batch_index}: {len(results)}/{len(batch)}개만 유효 "
+                  f"({'; '.join(problems[:3]) or '응답에 없음'})")
+        return results
+
+    @staticmethod
+    def _report_size(final_prompt, raw_chars):
+        """방금 기록한 호출의 프롬프트 크기 (줄이기 전 → 후, 토큰은 추정 → 실측)"""
+        call = current_run().llm_calls[-1]
+        if raw_chars is None:
+            return
+        line = f"    - 프롬프트 {raw_chars:,}자 → {len(final_prompt):,}자 ({1 - len(final_prompt) / raw_chars:.0%} 감소)"
+        if call.get("prompt_tokens"):
+            line += f", 토큰 {call['raw_prompt_tokens_est']:,} → {call['prompt_tokens']:,}"
+        print(line)
+
+
+class LexiconAnalyzer(Analyzer):
+    """
+    규칙 기반 로컬 분석:
+      - analysis_orgs     : 토큰(과 인접 두 토큰 이어 붙인 것)을 종목/별칭 사전으로 해석한 정식 명칭
+      - analysis_keywords : 찾은 종목명 + 빈도 상위 토큰 (max_keywords 개)
+      - sentiment_label   : 긍정/부정 감성어 등장 횟수 차이
+      - summary_ai        : 앞 두 문장
+    """
+
+    name = "lexicon"
+    batch_size = 500
+
+    def __init__(self, normalizer=None, max_keywords=5):
+        if normalizer is None:
+            from stock_crawl.entities import get_default_normalizer  # 종목 사전은 이 백엔드를 쓸 때만 읽습니다.
+            normalizer = get_default_normalizer()
+        self.normalizer = normalizer
+        self.max_keywords = max_keywords
+        self._resolved = {}  # 토큰 → 정식 명칭/None (normalize_key 는 정규식 여러 번이라 토큰 단위로 메모이즈)
+        self._positive_re = re.compile("|".join(map(re.escape, POSITIVE_TERMS)))
+        self._negative_re = re.compile("|".join(map(re.escape, NEGATIVE_TERMS)))
+
+    def find_orgs(self, tokens):
+        return resolve_stock_tokens(tokens, self.normalizer, self._resolved)
+
+    def sentiment(self, text):
+        pos = len(self._positive_re.findall(text))
+        neg = len(self._negative_re.findall(text))
+        score = (pos - neg) / (pos + neg + 1)
+        if score > SENTIMENT_MARGIN:
+            return "Positive"
+        if score < -SENTIMENT_MARGIN:
+            return "Negative"
+        return "Neutral"
+
+    def analyze_one(self, text):
+        tokens = tokenize(text)
+        orgs = self.find_orgs(tokens)
+        keywords = orgs[:self.max_keywords]
+        for token, _ in collections.Counter(tokens).most_common():
+            if len(keywords) >= self.max_keywords:
+                break
+            if token not in keywords:
+                keywords.append(token)
+        return {
+            "analysis_keywords": keywords,
+            "analysis_orgs": orgs,
+            "summary_ai": lead_summary(text),
+            "sentiment_label": self.sentiment(text),
+        }
+
+    def analyze_batch(self, batch, batch_index):
+        return [{"id": aid, **self.analyze_one(text)} for aid, text in batch]
+
+
+class StubAnalyzer(Analyzer):
+    """글 내용만으로 정해지는 결정적 결과 (같은 글 → 항상 같은 결과). 사전/네트워크를 쓰지 않습니다."""
+
+    name = "stub"
+    batch_size = 1000
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def analyze_batch(self, batch, batch_index):
+        if self.latency:
+            time.sleep(self.latency)
+        results = []
+        for aid, text in batch:
+            counts = collections.Counter(tokenize(text))
+            results.append({
+                "id": aid,
+                "analysis_keywords": [t for t, _ in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:5]],
+                "analysis_orgs": [],
+                "summary_ai": lead_summary(text, sentences=1),
+                "sentiment_label": SENTIMENT_LABELS[zlib.crc32(text.encode("utf-8")) % len(SENTIMENT_LABELS)],
+            })
+        return results
+
+
+class AnalyzerRouter:
+    """
+    기사별 백엔드 선택. factories 는 {이름: 백엔드를 만드는 함수} 이고, 실제로 배정된 백엔드만 만듭니다.
+    (예: 전부 lexicon 으로 보내면 Gemini 모델이 없어도 됨)
+    """
+
+    def __init__(self, factories, default="gemini", summary_only=None, rules=(), priority=None):
+        unknown = {default, summary_only or default} - set(factories)
+        if unknown:
+            raise ValueError(f"알 수 없는 분석 백엔드: {sorted(unknown)} (사용 가능: {sorted(factories)})")
+        self.factories = factories
+        self.default = default
+        self.summary_only = summary_only or default
+        self.rules = list(rules)
+        self.priority = priority  # 기사 → 숫자. 있으면 백엔드마다 큰 값부터 배치합니다.
+        self._backends = {}
+
+    def route(self, article):
+        for rule in self.rules:
+            name = rule(article)
+            if name is not None:
+                return name
+        return self.default if has_body(article) else self.summary_only
+
+    def backend(self, name):
+        if name not in self.factories:
+            raise ValueError(f"알 수 없는 분석 백엔드: {name} (사용 가능: {sorted(self.factories)})")
+        if name not in self._backends:
+            self._backends[name] = self.factories[name]()
+        return self._backends[name]
+
+
+def analyze_articles(articles, router):
+    """
+    분석할 글이 있는 기사를 백엔드별로 나눠 배치 분석하고, 결과를 기사 레코드에 바로 채웁니다.
+    같은 articles 리스트를 돌려줍니다.
+    """
+    article_map = {f"art_{i}": article for i, article in enumerate(articles)}
+    routes = collections.defaultdict(list)
+    for aid, article in article_map.items():
+        if analysis_text(article):
+            routes[router.route(article)].append(aid)
+    total = sum(len(ids) for ids in routes.values())
+    print(f"  - AI 분석 대상: {total}개 / 총 {len(articles)}개"
+          + (f" ({', '.join(f'{name} {len(ids)}개' for name, ids in routes.items())})" if len(routes) > 1 else ""))
+    current_run().extra["analyzer_routes"] = {name: len(ids) for name, ids in routes.items()}
+    if router.priority is not None:
+        for ids in routes.values():
+            ids.sort(key=lambda aid: -router.priority(article_map[aid]))
+
+    for name, ids in routes.items():
+        backend = router.backend(name)
+        size = backend.batch_size
+        batch_index = 0
+        pending = ids
+        for attempt in range(1, backend.max_attempts + 1):
+            if attempt > 1:
+                # 결과를 못 받은 기사만 모아 다시 배치합니다. (배치 전체를 다시 보내지 않음)
+                print(f"  - [{name}] 결과가 없는 {len(pending)}개 재요청 ({attempt}/{backend.max_attempts}회차)")
+                current_run().incr("llm_retried_articles", len(pending))
+            failed = []
+            total_batches = (len(pending) + size - 1) // size
+            for i in range(0, len(pending), size):
+                batch = pending[i:i + size]
+                batch_index += 1
+                print(f"  - [{name}] 배치 {i // size + 1}/{total_batches} 처리 중... ({len(batch)}개)")
+                # 본문은 배치 프롬프트를 만들 때만 읽습니다. (content_to_analyze 사본 없음)
+                results = backend.analyze_batch([(aid, analysis_text(article_map[aid])) for aid in batch],
+                                                batch_index)
+                done = set()
+                for result in results:
+                    if isinstance(result, dict) and result.get("id") in article_map:
+                        done.add(result["id"])
+                        article_map[result.pop("id")].update(result)
+                failed += [aid for aid in batch if aid not in done]
+            if not failed:
+                break
+            pending = failed
+        else:
+            print(f"  ⚠️ [{name}] {len(failed)}개 기사는 분석 결과를 받지 못했습니다.")
+            current_run().incr("analysis_unresolved", len(failed))
+    return articles
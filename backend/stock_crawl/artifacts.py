@@ -0,0 +1,110 @@
+# backend/stock_crawl/artifacts.py
+# -*- coding: utf-8 -*-
+"""
+대시보드가 바로 읽을 수 있는 '전처리 완료' 산출물(Parquet)을 만들고 읽는 함수들입니다.
+
+원본 CSV 는 기사 본문(content)까지 들어 있어 크고, 리스트 컬럼이 문자열로 저장되어
+읽을 때마다 ast.literal_eval 을 돌려야 합니다. Parquet 산출물은 본문을 빼고
+날짜/리스트 컬럼을 이미 변환된 형태로 저장하므로 내려받기와 파싱 비용이 거의 없습니다.
+"""
+import os
+import ast
+
+import numpy as np
+import pandas as pd
+
+COMPACT_ARTIFACT_NAME = "aggregated_stock_data.parquet"
+LIST_COLUMNS = ("analysis_keywords", "analysis_orgs")
+# 대시보드에서 쓰는 컬럼만 남깁니다. (content 등 큰 컬럼 제외)
+COMPACT_COLUMNS = [
+    "search_keyword", "url", "title", "published_at", "crawled_at", "analysis_date",
+    "analysis_keywords", "analysis_orgs", "summary_ai", "sentiment_label",
+    "cluster_id", "cluster_label",
+]
+
+
+def safe_literal_eval(val):
+    """CSV에서 읽은 리스트 형태의 문자열 -> 실제 리스트로 변환"""
+    try:
+        # nan 같은 float 타입이 들어올 경우를 대비해 문자열로 먼저 변환
+        return ast.literal_eval(str(val))
+    except (ValueError, SyntaxError, TypeError):
+        return []
+
+
+def to_str_list(val):
+    """list / ndarray / 문자열 표현 어느 쪽이 와도 문자열 리스트로 맞춥니다."""
+    if isinstance(val, list):
+        items = val
+    elif isinstance(val, (tuple, np.ndarray)):
+        items = list(val)
+    elif isinstance(val, str):
+        items = safe_literal_eval(val)
+        if not isinstance(items, (list, tuple)):
+            return []
+    else:
+        return []
+    return [x for x in items if isinstance(x, str)]
+
+
+def prepare_articles_frame(df):
+    """
+    원본 기사 DataFrame 에 analysis_date 를 만들고 리스트 컬럼을 실제 리스트로 바꿉니다.
+    (대시보드의 기존 전처리와 동일한 규칙)
+    """
+    published_dt = pd.to_datetime(df['published_at'], errors='coerce')
+    if 'crawled_at' in df.columns:
+        crawled_dt = pd.to_datetime(df['crawled_at'], errors='coerce')
+        analysis_dt = published_dt.fillna(crawled_dt)
+    else:
+        analysis_dt = published_dt
+    df['analysis_date'] = analysis_dt.dt.date
+    df = df[analysis_dt.notna()].copy()
+
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].apply(to_str_list)
+        else:
+            df[col] = [[] for _ in range(len(df))]
+    return df
+
+
+def write_compact_artifact(df, output_dir, name=COMPACT_ARTIFACT_NAME):
+    """
+    리스트 컬럼이 아직 list 인 상태의 DataFrame 을 받아 Parquet 산출물을 저장합니다.
+    pyarrow 가 없으면 경고만 출력하고 None 을 돌려줍니다.
+    """
+    compact = prepare_articles_frame(df.copy())
+    compact = compact[[c for c in COMPACT_COLUMNS if c in compact.columns]]
+    for col in ("search_keyword", "url", "title", "published_at", "crawled_at", "summary_ai", "sentiment_label",
+                "cluster_label"):
+        if col in compact.columns:
+            compact[col] = compact[col].where(compact[col].notna(), None)
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, name)
+    try:
+        compact.to_parquet(path, index=False)
+    except ImportError as e:
+        print(f"  ⚠️ Parquet 산출물 저장 생략 (pyarrow 필요): {e}")
+        return None
+    print(f"   - 전처리 산출물 저장: {path}")
+    return path
+
+
+def read_compact_artifact(path):
+    """write_compact_artifact 로 만든 Parquet 파일을 대시보드 형식의 DataFrame 으로 읽습니다."""
+    df = pd.read_parquet(path)
+    # pyarrow 는 리스트 컬럼을 ndarray 로 돌려주므로 list 로만 바꿔줍니다. (문자열 파싱 없음)
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            df[col] = [list(x) if x is not None else [] for x in df[col]]
+    df['analysis_date'] = pd.to_datetime(df['analysis_date']).dt.date
+    return df
+
+
+def load_articles_file(path):
+    """확장자에 맞춰 Parquet 산출물 또는 원본 CSV 를 읽어 전처리된 DataFrame 을 돌려줍니다."""
+    if path.endswith(".parquet"):
+        return read_compact_artifact(path)
+    return prepare_articles_frame(pd.read_csv(path, encoding='utf-8'))
@@ -0,0 +1,255 @@
+# backend/stock_crawl/clustering.py
+# -*- coding: utf-8 -*-
+"""
+기사 테마 클러스터링 단계입니다. 외부 서비스 없이 로컬에서 계산합니다.
+
+1) 제목/요약/키워드의 문자 n-gram 을 부호 있는 해싱으로 고정 크기 벡터에 담고 TF-IDF 가중치를 줍니다.
+2) 시드가 고정된 가우시안 랜덤 투영으로 저차원(기본 96차원)으로 줄입니다.
+3) 미니배치 k-means 를 누적 상태 위에서 갱신합니다. 기존 중심과 충분히 가깝지 않은 기사가
+   모이면 새 클러스터를 만들기 때문에, 날이 바뀌어도 기존 클러스터 ID 가 유지됩니다.
+
+상태(중심점, 클러스터별 기사 수, 문서 빈도, 이미 학습한 URL, 라벨용 키워드 집계)는
+`state_dir` 에 저장되며, 이미 학습한 URL 은 다시 학습하지 않고 배정만 합니다.
+학습한 URL 해시는 학습한 날짜와 함께 SEEN_RETAIN_DAYS 일만 보관합니다. (일일/백필 실행이 같은 상태를 쓰므로
+전체 기록을 쌓지 않음. 수집 기간이 겹쳐 다시 들어오는 기사는 보관 기간 안이라 다시 학습하지 않습니다)
+"""
+import os
+import json
+import zlib
+import collections
+from datetime import date
+
+import numpy as np
+from scipy import sparse
+
+from stock_crawl.artifacts import to_str_list
+from stock_crawl.records import iter_fields, url_hash
+
+HASH_BITS = 14
+HASH_DIM = 1 << HASH_BITS
+REDUCED_DIM = 96
+NGRAM_RANGE = (2, 3)
+PROJECTION_SEED = 20250801
+DEFAULT_INITIAL_CLUSTERS = 24
+MAX_CLUSTERS = 200
+MAX_NEW_PER_BATCH = 4           # 미니배치 하나에서 새로 만들 수 있는 클러스터 수
+NEW_CLUSTER_SIMILARITY = 0.35   # 가장 가까운 중심과의 코사인 유사도가 이보다 낮으면 새 클러스터 후보
+LABEL_TOP_N = 3
+LABEL_KEEP = 50                 # 클러스터별로 보관하는 라벨 키워드 수
+SEEN_RETAIN_DAYS = 90           # 학습한 URL 해시 보관 기간 (학습한 날 기준)
+
+STATE_FILE = "cluster_state.npz"
+LABEL_FILE = "cluster_labels.json"
+
+
+# 클러스터링 텍스트에 쓰는 컬럼 (text_fn 인자 순서)
+TEXT_COLUMNS = ("title", "summary_ai", "summary", "analysis_keywords")
+
+
+def _article_text(title, summary_ai, summary, keywords):
+    text = " ".join(p for p in (title, summary_ai, summary) if isinstance(p, str))
+    return f"{text} {' '.join(to_str_list(keywords))}".lower()
+
+
+def hash_vectorize(texts):
+    """문자 n-gram 을 부호 있는 해싱으로 (n_docs × HASH_DIM) CSR 행렬에 담습니다."""
+    rows, cols, vals = [], [], []
+    lo, hi = NGRAM_RANGE
+    for i, text in enumerate(texts):
+        text = " ".join(text.split())
+        grams = collections.Counter(
+            text[j:j + n] for n in range(lo, hi + 1) for j in range(len(text) - n + 1)
+        )
+        for gram, count in grams.items():
+            if gram.isspace():
+                continue
+            h = zlib.crc32(gram.encode("utf-8"))
+            rows.append(i)
+            cols.append(h & (HASH_DIM - 1))
+            vals.append(count if (h >> 31) & 1 else -count)
+    return sparse.csr_matrix(
+        (np.asarray(vals, dtype=np.float32), (rows, cols)), shape=(len(texts), HASH_DIM)
+    )
+
+
+def _projection_matrix():
+    rng = np.random.default_rng(PROJECTION_SEED)
+    return (rng.standard_normal((HASH_DIM, REDUCED_DIM)) / np.sqrt(REDUCED_DIM)).astype(np.float32)
+
+
+def _normalize_rows(mat):
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    return mat / np.maximum(norms, 1e-12)
+
+
+class ClusterModel:
+    """누적 학습되는 미니배치 k-means 상태"""
+
+    def __init__(self, centroids=None, sizes=None, doc_freq=None, n_docs=0, seen=None, label_counts=None,
+                 seen_days=None):
+        self.centroids = centroids if centroids is not None else np.zeros((0, REDUCED_DIM), dtype=np.float32)
+        self.sizes = sizes if sizes is not None else np.zeros(0, dtype=np.int64)
+        self.doc_freq = doc_freq if doc_freq is not None else np.zeros(HASH_DIM, dtype=np.int64)
+        self.n_docs = int(n_docs)
+        # 학습한 URL 해시 → 학습한 날(date ordinal). 예전 상태 파일에는 날짜가 없어 불러온 날로 봅니다.
+        if seen is None:
+            self.seen = {}
+        else:
+            days = seen_days if seen_days is not None else np.full(len(seen), date.today().toordinal())
+            self.seen = dict(zip(seen.tolist(), days.tolist()))
+        self.label_counts = label_counts or {}
+        self._projection = None
+
+    # ---------------- 저장/불러오기 ----------------
+    @classmethod
+    def load(cls, state_dir):
+        state_path = os.path.join(state_dir, STATE_FILE)
+        if not os.path.exists(state_path):
+            return cls()
+        data = np.load(state_path)
+        label_counts = {}
+        label_path = os.path.join(state_dir, LABEL_FILE)
+        if os.path.exists(label_path):
+            with open(label_path, encoding="utf-8") as f:
+                label_counts = {int(k): collections.Counter(v) for k, v in json.load(f).items()}
+        return cls(data["centroids"], data["sizes"], data["doc_freq"], int(data["n_docs"]),
+                   data["seen"], label_counts, data["seen_days"] if "seen_days" in data.files else None)
+
+    def save(self, state_dir):
+        os.makedirs(state_dir, exist_ok=True)
+        np.savez_compressed(
+            os.path.join(state_dir, STATE_FILE),
+            centroids=self.centroids, sizes=self.sizes, doc_freq=self.doc_freq,
+            n_docs=np.int64(self.n_docs), seen=np.fromiter(self.seen, dtype=np.uint64, count=len(self.seen)),
+            seen_days=np.fromiter(self.seen.values(), dtype=np.int32, count=len(self.seen)),
+        )
+        trimmed = {str(k): dict(c.most_common(LABEL_KEEP)) for k, c in self.label_counts.items()}
+        with open(os.path.join(state_dir, LABEL_FILE), "w", encoding="utf-8") as f:
+            json.dump(trimmed, f, ensure_ascii=False)
+
+    # ---------------- 벡터화 ----------------
+    def embed(self, texts, update_idf=False):
+        """TF-IDF(누적 문서 빈도 기준) → 랜덤 투영 → 정규화된 저차원 벡터"""
+        X = hash_vectorize(texts)
+        if update_idf:
+            self.doc_freq += np.bincount(X.indices, minlength=HASH_DIM)
+            self.n_docs += X.shape[0]
+        idf = np.log((1.0 + self.n_docs) / (1.0 + self.doc_freq)) + 1.0
+        # 부호가 반대인 해시 충돌로 합이 0 이 된 칸은 log(0) → NaN 이 되므로 먼저 지웁니다.
+        X.eliminate_zeros()
+        X.data = np.sign(X.data) * (1.0 + np.log(np.abs(X.data)))
+        X = X.multiply(idf.astype(np.float32)[np.newaxis, :]).tocsr()
+        if self._projection is None:
+            self._projection = _projection_matrix()
+        return _normalize_rows(np.asarray(X @ self._projection, dtype=np.float32))
+
+    # ---------------- 클러스터링 ----------------
+    def _seed(self, vectors, k, rng):
+        """k-means++ 방식으로 초기 중심을 고릅니다."""
+        first = rng.integers(len(vectors))
+        centers = [vectors[first]]
+        dist = 1.0 - vectors @ centers[0]
+        for _ in range(1, k):
+            probs = np.maximum(dist, 0)
+            if probs.sum() <= 0:
+                break
+            nxt = rng.choice(len(vectors), p=probs / probs.sum())
+            centers.append(vectors[nxt])
+            dist = np.minimum(dist, 1.0 - vectors @ vectors[nxt])
+        self.centroids = np.vstack(centers).astype(np.float32)
+        self.sizes = np.zeros(len(centers), dtype=np.int64)
+
+    def assign(self, vectors):
+        """가장 가까운 클러스터 ID 와 코사인 유사도"""
+        if len(self.centroids) == 0:
+            return np.full(len(vectors), -1), np.zeros(len(vectors))
+        sims = vectors @ _normalize_rows(self.centroids).T
+        ids = sims.argmax(axis=1)
+        return ids, sims[np.arange(len(vectors)), ids]
+
+    def partial_fit(self, vectors, n_initial=DEFAULT_INITIAL_CLUSTERS, batch_size=256, seed=0):
+        """미니배치 단위로 중심을 갱신하고, 멀리 떨어진 기사들로 새 클러스터를 만듭니다."""
+        rng = np.random.default_rng(seed)
+        if len(vectors) == 0:
+            return
+        if len(self.centroids) == 0:
+            self._seed(vectors, min(n_initial, len(vectors)), rng)
+        order = rng.permutation(len(vectors))
+        for start in range(0, len(order), batch_size):
+            batch = vectors[order[start:start + batch_size]]
+            ids, sims = self.assign(batch)
+            spawn = self._pick_new_seeds(batch, sims)
+            if spawn:
+                # 기존 중심과 먼 기사 일부를 새 클러스터의 씨앗으로 삼고 다시 배정합니다.
+                self.centroids = np.vstack([self.centroids, batch[spawn]]).astype(np.float32)
+                self.sizes = np.concatenate([self.sizes, np.zeros(len(spawn), dtype=np.int64)])
+                ids, sims = self.assign(batch)
+            for cid in np.unique(ids):
+                members = batch[ids == cid]
+                self.sizes[cid] += len(members)
+                lr = len(members) / self.sizes[cid]
+                self.centroids[cid] += lr * (members.mean(axis=0) - self.centroids[cid])
+
+    def _pick_new_seeds(self, batch, sims, per_batch=MAX_NEW_PER_BATCH):
+        """기존 중심 및 서로 간에 충분히 먼 기사만 골라 새 클러스터 씨앗으로 씁니다."""
+        room = min(MAX_CLUSTERS - len(self.centroids), per_batch)
+        picked = []
+        for i in np.flatnonzero(sims < NEW_CLUSTER_SIMILARITY):
+            if len(picked) >= room:
+                break
+            if picked and (batch[picked] @ batch[i]).max() >= NEW_CLUSTER_SIMILARITY:
+                continue
+            picked.append(int(i))
+        return picked
+
+    def prune_seen(self, keep_days=SEEN_RETAIN_DAYS, today=None):
+        """keep_days 일 전보다 먼저 학습한 URL 해시를 지웁니다. (지운 수)"""
+        cutoff = (today or date.today()).toordinal() - keep_days
+        old = [h for h, day in self.seen.items() if day < cutoff]
+        for h in old:
+            del self.seen[h]
+        return len(old)
+
+    def label_of(self, cluster_id):
+        counts = self.label_counts.get(int(cluster_id))
+        if not counts:
+            return ""
+        return " · ".join(k for k, _ in counts.most_common(LABEL_TOP_N))
+
+
+def assign_clusters(df, state_dir, text_fn=_article_text):
+    """
+    기사 DataFrame 에 cluster_id / cluster_label 컬럼을 붙이고 누적 상태를 저장합니다.
+    처음 보는 URL 만 학습에 쓰고, 이미 학습한 기사는 현재 중심 기준으로 배정만 합니다.
+    """
+    if df.empty:
+        return df
+    model = ClusterModel.load(state_dir)
+    # 행 dict 없이 필요한 컬럼만 튜플로 읽습니다.
+    fields = list(iter_fields(df, TEXT_COLUMNS))
+    texts = [text_fn(*row) for row in fields]
+    keys = [url_hash(url) for url in df['url']] if 'url' in df.columns else [url_hash(None)] * len(df)
+    is_new = np.array([k not in model.seen for k in keys], dtype=bool)
+
+    if is_new.any():
+        new_vectors = model.embed([t for t, n in zip(texts, is_new) if n], update_idf=True)
+        model.partial_fit(new_vectors)
+        today = date.today().toordinal()
+        model.seen.update((k, today) for k, n in zip(keys, is_new) if n)
+
+    vectors = model.embed(texts)
+    ids, _ = model.assign(vectors)
+
+    keyword_pos = TEXT_COLUMNS.index("analysis_keywords")
+    for cid, row, new in zip(ids, fields, is_new):
+        if new and cid >= 0:
+            counts = model.label_counts.setdefault(int(cid), collections.Counter())
+            counts.update(to_str_list(row[keyword_pos]))
+
+    df = df.copy()
+    df['cluster_id'] = ids.astype(np.int64)
+    df['cluster_label'] = [model.label_of(cid) for cid in ids]
+    model.prune_seen()
+    model.save(state_dir)
+    print(f"   - 테마 클러스터링: 신규 학습 {int(is_new.sum())}건, 클러스터 {len(model.centroids)}개")
+    return df
@@ -0,0 +1,80 @@
+# backend/stock_crawl/compaction.py
+# -*- coding: utf-8 -*-
+"""
+Gemini 프롬프트에 넣기 전에 기사 본문을 글자 예산(char budget) 안으로 줄입니다.
+
+본문에는 같은 문단 반복(사진 설명, 요약 박스), 바이라인/이메일/저작권 줄처럼 분석에 쓸모없는 부분이 많아
+토큰과 지연만 늘립니다. 여기서는
+  1) 문단을 나눠 공백만 다른 중복 문단과 짧은 바이라인·저작권 줄을 지우고,
+  2) 문장으로 나눈 뒤 앞 문장(lead_sentences 개)은 항상 남기고,
+  3) 나머지는 "키워드 밀도"(시장 용어 + 기사 안에서 두 번 이상 나온 토큰 + 숫자 표현 수 / √길이)가 높은 문장부터
+     예산이 찰 때까지 고른 다음, 원래 순서대로 이어 붙입니다.
+예산보다 짧은 본문은 1) 만 적용합니다.
+"""
+import re
+import math
+import collections
+
+from stock_crawl.analyzers import tokenize
+from stock_crawl.relevance import MARKET_TERMS
+
+DEFAULT_CHAR_BUDGET = 1200
+LEAD_SENTENCES = 2
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|(?<=다\.)")
+_NUMBER_RE = re.compile(r"\d[\d,.]*\s*(?:%|원|억|조|만|배|달러|주|bp)")
+_MARKET_RE = re.compile("|".join(map(re.escape, MARKET_TERMS)))
+# 짧은 줄 중 이런 표시가 있으면 바이라인/저작권/사진 설명으로 보고 지웁니다.
+_BOILERPLATE_RE = re.compile(r"@|ⓒ|©|무단|저작권|기자$|특파원$|^\[?사진|^\(사진|^/")
+BOILERPLATE_MAX_CHARS = 60
+
+
+def clean_paragraphs(text):
+    """중복 문단과 짧은 바이라인/저작권 줄을 지운 문단 목록"""
+    out, seen = [], set()
+    for line in text.split("\n"):
+        para = " ".join(line.split())
+        if not para:
+            continue
+        key = para.casefold()
+        if key in seen:
+            continue
+        if len(para) <= BOILERPLATE_MAX_CHARS and _BOILERPLATE_RE.search(para):
+            continue
+        seen.add(key)
+        out.append(para)
+    return out
+
+
+def split_sentences(paragraphs):
+    return [s.strip() for para in paragraphs for s in _SENTENCE_RE.split(para) if s.strip()]
+
+
+def compact_text(text, budget=DEFAULT_CHAR_BUDGET, lead_sentences=LEAD_SENTENCES):
+    """본문을 budget 글자 안의 핵심 문장으로 줄입니다. budget 이 None 이면 정리만 합니다."""
+    paragraphs = clean_paragraphs(text)
+    cleaned = "\n".join(paragraphs)
+    if budget is None or len(cleaned) <= budget:
+        return cleaned
+
+    sentences = split_sentences(paragraphs)
+    counts = collections.Counter(tokenize(cleaned))
+    topical = {tok for tok, n in counts.items() if n >= 2}
+
+    def density(sentence):
+        hits = len(_MARKET_RE.findall(sentence)) + len(_NUMBER_RE.findall(sentence))
+        hits += sum(1 for tok in tokenize(sentence) if tok in topical)
+        return hits / math.sqrt(len(sentence))
+
+    chosen, used = set(), 0
+    for i in range(min(lead_sentences, len(sentences))):
+        if used + len(sentences[i]) > budget and chosen:
+            break
+        chosen.add(i)
+        used += len(sentences[i]) + 1
+    ranked = sorted((i for i in range(len(sentences)) if i not in chosen), key=lambda i: -density(sentences[i]))
+    for i in ranked:
+        if used + len(sentences[i]) <= budget:
+            chosen.add(i)
+            used += len(sentences[i]) + 1
+    return " ".join(sentences[i] for i in sorted(chosen))[:budget]
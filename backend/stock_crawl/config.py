@@ -0,0 +1,76 @@
+# backend/stock_crawl/config.py
+# -*- coding: utf-8 -*-
+"""
+파이프라인 설정입니다. 스크립트마다 모듈 전역(BATCH_SIZE, DATA_COLLECTION_DAYS, ...)으로 흩어져 있던 값을
+PipelineConfig 하나로 모아, 수집/본문 추출/분석/저장 엔진(stock_crawl.pipeline)에 넘깁니다.
+
+    config = PipelineConfig.from_env(batch_size=5, collection_days=3, max_pages=1)   # GitHub Actions
+    config = PipelineConfig.from_env()                                               # 로컬 (기본값)
+
+API 키와 분석 백엔드는 환경 변수에서 읽고, 스크립트별 차이는 키워드 인자로 덮어씁니다.
+dataclass 라서 백필 작업 프로세스에도 그대로 넘길 수 있습니다(pickle).
+"""
+import os
+import dataclasses
+from dataclasses import dataclass
+from typing import Optional
+
+from stock_crawl.paths import WAREHOUSE_DB, MERGED_CSV
+
+NAVER_API_URL = "https://openapi.naver.com/v1/search/news.json"
+GEMINI_MODEL_NAME = "models/gemini-1.5-flash"
+
+
+@dataclass
+class PipelineConfig:
+    # --- API 키 및 ID ---
+    google_api_key: Optional[str] = None
+    naver_client_id: Optional[str] = None
+    naver_client_secret: Optional[str] = None
+
+    # --- 수집 (stock_crawl.crawl) ---
+    collection_days: int = 4                 # 수집할 기간 (일)
+    articles_per_day: int = 100              # 키워드당 하루에 수집할 최대 기사 수
+    max_pages: int = 10                      # 키워드당 최대 API 페이지 (스케줄러가 없을 때)
+    crawl_page_budget: Optional[int] = None  # 실행당 전체 페이지 예산 (None: 키워드별 필요량만큼, stock_crawl.scheduler)
+    naver_api_url: str = NAVER_API_URL
+    rate_limit_delay: float = 1
+    extract_delay: float = 0.1               # 본문 요청 사이 대기 (초)
+
+    # --- 분석 (stock_crawl.analysis) ---
+    batch_size: int = 7
+    analyzer_backend: str = "gemini"                # gemini | lexicon | stub (stock_crawl.analyzers)
+    summary_only_analyzer: Optional[str] = None     # 요약만 있는 기사 (None: analyzer_backend 와 같음)
+    relevance_fallback: str = "lexicon"             # 관련도 낮은 기사 ("off": 관련도 판별 없음)
+    prompt_char_budget: Optional[int] = 1200        # 기사 본문 글자 예산 (None: 중복 문단·바이라인 정리만)
+    gemini_model_name: str = GEMINI_MODEL_NAME
+
+    # --- 저장 (stock_crawl.storage) ---
+    keep_days: Optional[int] = 30            # 최근 N일만 저장 (None: 기간 필터 없음)
+    warehouse_path: Optional[str] = WAREHOUSE_DB  # 저장 결과를 upsert 할 SQLite 창고 (None: CSV/Parquet 만)
+    warehouse_seed_csv: Optional[str] = MERGED_CSV  # 창고가 비어 있으면 먼저 채울 병합본 (None: 채우지 않음)
+
+    @classmethod
+    def from_env(cls, **overrides):
+        """환경 변수(API 키, ANALYZER_BACKEND 등)를 읽고 overrides 로 덮어쓴 설정"""
+        values = {
+            "google_api_key": os.getenv("GOOGLE_API_KEY"),
+            "naver_client_id": os.getenv("NAVER_CLIENT_ID"),
+            "naver_client_secret": os.getenv("NAVER_CLIENT_SECRET"),
+            "analyzer_backend": os.getenv("ANALYZER_BACKEND", "gemini"),
+            "summary_only_analyzer": os.getenv("SUMMARY_ONLY_ANALYZER"),
+            "relevance_fallback": os.getenv("RELEVANCE_FALLBACK", "lexicon"),
+        }
+        values.update(overrides)
+        return cls(**values)
+
+    def replace(self, **changes):
+        return dataclasses.replace(self, **changes)
+
+    @property
+    def summary_backend(self):
+        return self.summary_only_analyzer or self.analyzer_backend
+
+    def needs_gemini(self):
+        """설정된 분석 백엔드 중 Gemini 가 있는지 (없으면 API 키/모델 초기화가 필요 없음)"""
+        return "gemini" in (self.analyzer_backend, self.summary_backend)
@@ -0,0 +1,132 @@
+# backend/stock_crawl/crawl.py
+# -*- coding: utf-8 -*-
+"""
+네이버 뉴스 검색 API 수집 단계입니다. (GitHub Actions / 로컬 / cli / 백필 공용)
+
+키워드마다 최신순(sort=date) 페이지를 start=1, 101, ... 순으로 읽어 수집 기간(config.collection_days) 안의 기사를
+날짜별 한도(config.articles_per_day)까지 담고, 실행 전체에서 URL 중복을 뺍니다.
+scheduler(KeywordScheduler)를 주면 키워드별 페이지 예산/수집 주기를 따르고, 없으면 config.max_pages 까지 읽습니다.
+"""
+import os
+import re
+import time
+from datetime import datetime, timedelta
+
+from stock_crawl.metrics import instrumented_get
+from stock_crawl.records import Article, default_body_store
+from stock_crawl.scheduler import KeywordScheduler
+
+PAGE_SIZE = 100
+MAX_START = 1000  # 네이버 검색 API 의 start 상한
+_TAG_RE = re.compile("<[^<]+?>")
+
+
+def naver_headers(config):
+    return {"X-Naver-Client-Id": config.naver_client_id, "X-Naver-Client-Secret": config.naver_client_secret}
+
+
+def parse_naver_item(item):
+    """검색 결과 한 건 → {pub_date, url, title, summary} (날짜/URL 이 없으면 None)"""
+    try:
+        pub_date = datetime.strptime(item["pubDate"], "%a, %d %b %Y %H:%M:%S %z").date()
+    except (KeyError, ValueError, TypeError):
+        return None
+    url = item.get("originallink") or item.get("link")
+    if not url:
+        return None
+    return {
+        "pub_date": pub_date, "url": url,
+        "title": _TAG_RE.sub("", item.get("title", "")),
+        "summary": _TAG_RE.sub("", item.get("description", "")),
+    }
+
+
+def create_scheduler(output_dir, config):
+    """키워드별 수집 성과(output_dir/keyword_yield.json)로 페이지 예산/주기를 정하는 스케줄러"""
+    return KeywordScheduler(os.path.join(output_dir, "keyword_yield.json"), page_budget=config.crawl_page_budget,
+                            max_pages=config.max_pages, collection_days=config.collection_days)
+
+
+def crawl_naver_news(keywords, existing_urls, config, scheduler=None):
+    """
+    지정된 키워드 목록으로 네이버 뉴스를 수집합니다.
+    페이지네이션을 통해 날짜별로 지정된 개수만큼 수집하고, 전체 URL 중복을 제거합니다. (existing_urls 에 추가됨)
+    scheduler(KeywordScheduler)를 주면 키워드별 페이지 예산/수집 주기를 따르고, 키워드별 수집 성과를 기록합니다.
+    """
+    headers = naver_headers(config)
+    per_day = config.articles_per_day
+    all_new_articles = []
+    today = datetime.now()
+
+    # 1. 수집 대상 날짜 목록 (빠른 조회를 위해 set 사용)
+    target_dates_str = {(today - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(config.collection_days)}
+
+    print(f"\n--- 1단계: 네이버 뉴스 수집 시작 (대상 기간: 최근 {config.collection_days}일, 일별 최대 {per_day}개) ---")
+    plans = scheduler.plan(keywords, today.date()) if scheduler is not None else {}
+
+    # 2. 각 키워드에 대해 수집 시작
+    for keyword in keywords:
+        plan = plans.get(keyword)
+        if plan is not None and not plan.due:
+            print(f"\n ⏭️ 키워드 '{keyword}' 건너뜀 ({plan.reason})")
+            continue
+        max_pages = plan.pages if plan is not None else config.max_pages
+        print(f"\n 🔎 키워드 '{keyword}' 수집 중..." + (f" (최대 {max_pages}페이지: {plan.reason})" if plan else ""))
+        pages = new_count = duplicates = 0
+
+        # 키워드별로 날짜당 몇 개를 수집했는지 카운트
+        daily_counts = {date_str: 0 for date_str in target_dates_str}
+        start_index = 1
+
+        # 3. 페이지네이션 루프 (API의 start 값을 1, 101, 201... 순으로 증가, 최대 1000)
+        while start_index <= MAX_START and pages < max_pages:
+            params = {"query": keyword, "display": PAGE_SIZE, "start": start_index, "sort": "date"}
+            try:
+                response = instrumented_get(config.naver_api_url, headers=headers, params=params, verify=False,
+                                            timeout=10)
+                response.raise_for_status()
+                items = response.json().get('items', [])
+                pages += 1
+
+                if not items:
+                    print(f"   - '{keyword}' 키워드에 대한 결과가 더 이상 없습니다.")
+                    break
+
+                for raw in items:
+                    item = parse_naver_item(raw)
+                    if item is None:
+                        continue
+                    pub_date_str = item["pub_date"].strftime('%Y-%m-%d')
+                    # 수집 대상 날짜가 아니거나 그 날짜의 한도를 채웠으면 건너뛰기
+                    if pub_date_str not in target_dates_str or daily_counts[pub_date_str] >= per_day:
+                        continue
+                    if item["url"] in existing_urls:
+                        duplicates += 1
+                        continue
+
+                    all_new_articles.append(Article(
+                        store=default_body_store(), search_keyword=keyword, url=item["url"], title=item["title"],
+                        summary=item["summary"], crawled_at=datetime.now().isoformat(), published_at=pub_date_str
+                    ))
+                    existing_urls.add(item["url"])
+                    daily_counts[pub_date_str] += 1
+                    new_count += 1
+
+                start_index += PAGE_SIZE
+                time.sleep(config.rate_limit_delay)
+
+                # 모든 날짜에 대해 수집 목표를 달성했는지 체크
+                if all(count >= per_day for count in daily_counts.values()):
+                    print(f"   - '{keyword}' 키워드의 모든 날짜별 수집 목표를 달성했습니다.")
+                    break
+
+            except Exception as e:
+                print(f" ❌ '{keyword}' 수집 중 오류: {e}")
+                break  # 오류 발생 시 해당 키워드 검색 중단
+
+        if scheduler is not None:
+            saturated = sum(1 for count in daily_counts.values() if count >= per_day)
+            scheduler.record(keyword, pages, new_count, duplicates, saturated, len(daily_counts), today.date())
+
+    print(f"\n--- ✅ 전체 뉴스 수집 완료. 총 {len(all_new_articles)}개의 새 기사 발견 ---")
+    return all_new_articles
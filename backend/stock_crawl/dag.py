@@ -0,0 +1,239 @@
+# backend/stock_crawl/dag.py
+# -*- coding: utf-8 -*-
+"""
+단계(stage)를 입력/출력이 선언된 의존 그래프로 실행하는 작은 엔진입니다.
+
+- Artifact: 단계 사이를 오가는 데이터. path 가 있으면 파일로도 저장되어 다음 실행에서 다시 읽을 수 있고,
+  없으면 한 프로세스 안에서 메모리로만 전달됩니다.
+- Stage: inputs(아티팩트 이름) → outputs(아티팩트 이름). run(ctx, **inputs) 는 {출력 이름: 값} 을 돌려줍니다.
+- 지문(fingerprint): 단계 이름 + params + 입력 아티팩트 지문 + sources(외부 파일 내용)의 해시.
+  지난 실행 때와 지문이 같고 출력 파일이 그대로면 그 단계는 건너뜁니다.
+  건너뛴 단계의 출력은 뒤 단계가 실제로 실행될 때만 파일에서 읽습니다.
+
+같은 프로세스에서 앞 단계가 만든 값은 파일을 다시 읽지 않고 그대로 넘깁니다.
+"""
+import os
+import json
+import hashlib
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional, Sequence
+
+STATE_VERSION = 1
+_CHUNK = 1 << 20
+
+
+def file_fingerprint(path):
+    """파일 내용의 sha1 (없으면 None)"""
+    if not path or not os.path.exists(path):
+        return None
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Artifact:
+    name: str
+    path: Optional[str] = None
+    load: Optional[Callable[[str], object]] = None
+    save: Optional[Callable[[object, str], None]] = None
+
+    @property
+    def persistent(self):
+        return self.path is not None and self.load is not None
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable
+    inputs: Sequence[str] = ()
+    outputs: Sequence[str] = ()
+    # 외부 입력 파일 (또는 파일 목록을 돌려주는 함수). 내용이 바뀌면 다시 실행합니다.
+    sources: object = ()
+    # 지문에 포함할 설정값 (또는 dict 를 돌려주는 함수). 예: 날짜, 키워드 목록
+    params: object = field(default_factory=dict)
+    description: str = ""
+
+    def source_files(self):
+        files = self.sources() if callable(self.sources) else self.sources
+        return sorted(files or ())
+
+    def param_values(self):
+        return self.params() if callable(self.params) else dict(self.params or {})
+
+
+class Pipeline:
+    """단계 그래프와 실행 상태(state_path 의 JSON)"""
+
+    def __init__(self, artifacts, stages, state_path):
+        self.artifacts = {a.name: a for a in artifacts}
+        self.stages = {}
+        self.producer = {}
+        for stage in stages:
+            self.stages[stage.name] = stage
+            for out in stage.outputs:
+                if out in self.producer:
+                    raise ValueError(f"아티팩트 '{out}' 를 두 단계가 만듭니다: {self.producer[out]}, {stage.name}")
+                self.producer[out] = stage.name
+        for stage in stages:
+            for name in stage.inputs:
+                if name not in self.producer:
+                    raise ValueError(f"단계 '{stage.name}' 의 입력 '{name}' 을 만드는 단계가 없습니다.")
+        self.state_path = state_path
+        self.state = self._load_state()
+        self.values = {}          # 이번 실행에서 메모리에 있는 아티팩트 값
+        self.fingerprints = {}    # 이번 실행에서 계산된 아티팩트 지문
+
+    # ---------------- 상태 ----------------
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            return state if state.get("version") == STATE_VERSION else {"version": STATE_VERSION, "stages": {}}
+        except (OSError, ValueError):
+            return {"version": STATE_VERSION, "stages": {}}
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.state_path)
+
+    # ---------------- 그래프 ----------------
+    def upstream(self, targets):
+        """targets 와 그 선행 단계를 실행 순서(위상 정렬)로 돌려줍니다."""
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"단계 의존 관계에 순환이 있습니다: {name}")
+            visiting.add(name)
+            for inp in self.stages[name].inputs:
+                visit(self.producer[inp])
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for target in targets:
+            if target not in self.stages:
+                raise KeyError(f"알 수 없는 단계: {target} (가능: {', '.join(self.stages)})")
+            visit(target)
+        return order
+
+    # ---------------- 지문 ----------------
+    def stage_fingerprint(self, stage):
+        inputs = {}
+        for name in stage.inputs:
+            fp = self.fingerprints.get(name)
+            if fp is None:
+                fp = self.state["stages"].get(self.producer[name], {}).get("outputs", {}).get(name)
+            inputs[name] = fp
+        sources = {path: file_fingerprint(path) for path in stage.source_files()}
+        return _hash({"stage": stage.name, "params": stage.param_values(), "inputs": inputs, "sources": sources})
+
+    def _outputs_intact(self, stage, recorded):
+        """기록된 출력 파일이 그대로 있는지 (메모리 전용 출력은 다음 단계가 필요로 하면 다시 실행해야 함)"""
+        for name in stage.outputs:
+            art = self.artifacts[name]
+            if not art.persistent:
+                continue
+            if file_fingerprint(art.path) != recorded.get("files", {}).get(name):
+                return False
+        return True
+
+    def is_up_to_date(self, stage, fingerprint):
+        recorded = self.state["stages"].get(stage.name)
+        return bool(recorded) and recorded.get("fingerprint") == fingerprint and self._outputs_intact(stage, recorded)
+
+    def plan(self, targets, force=()):
+        """
+        [(단계 이름, 실행 여부, 이유)] — 실제로 실행하지 않고 지문만 비교합니다.
+        (앞 단계가 다시 실행되면 그 결과에 따라 뒤 단계의 지문이 달라질 수 있고,
+         메모리 전용 출력을 만드는 단계는 뒤 단계가 실행될 때 필요하면 함께 실행됩니다.)
+        """
+        plan = []
+        for name in self.upstream(targets):
+            stage = self.stages[name]
+            if name in force:
+                plan.append((name, True, "강제 실행"))
+            elif not self.is_up_to_date(stage, self.stage_fingerprint(stage)):
+                plan.append((name, True, "입력/설정 변경 또는 첫 실행"))
+            else:
+                plan.append((name, False, "최신 상태"))
+        return plan
+
+    # ---------------- 실행 ----------------
+    def _value(self, name, needed_by, ctx, metrics, executed):
+        if name in self.values:
+            return self.values[name]
+        art = self.artifacts[name]
+        if art.persistent and os.path.exists(art.path):
+            value = art.load(art.path)
+        elif not art.persistent:
+            # 메모리 전용 출력: 건너뛰었던 생산 단계를 지금 실행합니다.
+            producer = self.producer[name]
+            print(f"  ↪ '{needed_by}' 단계에 '{name}' 이 필요해 '{producer}' 단계를 실행합니다.")
+            self._execute(producer, ctx, metrics, executed)
+            value = self.values.get(name)
+        else:
+            raise RuntimeError(f"'{needed_by}' 단계에 필요한 '{name}' 파일이 없습니다: {art.path}")
+        self.values[name] = value
+        return value
+
+    def _execute(self, name, ctx, metrics, executed):
+        stage = self.stages[name]
+        inputs = {inp: self._value(inp, name, ctx, metrics, executed) for inp in stage.inputs}
+        fingerprint = self.stage_fingerprint(stage)
+        print(f"\n▶️  [{name}] 실행 {('— ' + stage.description) if stage.description else ''}")
+        with (metrics.stage(name) if metrics else nullcontext({})) as span:
+            outputs = stage.run(ctx, **inputs) or {}
+            counts = [len(v) for v in outputs.values() if hasattr(v, "__len__") and not isinstance(v, str)]
+            if counts:
+                span["items"] = max(counts)
+
+        recorded = {"fingerprint": fingerprint, "outputs": {}, "files": {},
+                    "finished_at": datetime.now().isoformat(timespec="seconds")}
+        for out in stage.outputs:
+            value = outputs.get(out)
+            self.values[out] = value
+            art = self.artifacts[out]
+            if art.persistent and art.save is not None and value is not None:
+                os.makedirs(os.path.dirname(art.path), exist_ok=True)
+                art.save(value, art.path)
+            recorded["files"][out] = file_fingerprint(art.path) if art.persistent else None
+            # 출력 지문: 파일이 있으면 내용, 없으면 단계 지문에서 파생
+            recorded["outputs"][out] = recorded["files"][out] or _hash([fingerprint, out])
+            self.fingerprints[out] = recorded["outputs"][out]
+        self.state["stages"][name] = recorded
+        self._save_state()
+        executed.append(name)
+
+    def run(self, targets, ctx=None, force=(), metrics=None):
+        """
+        targets 까지 필요한 단계를 순서대로 실행합니다. 지문이 같고 출력이 그대로인 단계는 건너뜁니다.
+        metrics(RunMetrics) 가 있으면 실행한 단계를 stage 구간으로 기록합니다.
+        """
+        executed = []
+        for name in self.upstream(targets):
+            if name in executed:
+                continue
+            stage = self.stages[name]
+            if name not in force and self.is_up_to_date(stage, self.stage_fingerprint(stage)):
+                print(f"⏭️  [{name}] 최신 상태 — 건너뜀")
+                for out, fp in self.state["stages"][name].get("outputs", {}).items():
+                    self.fingerprints[out] = fp
+                continue
+            self._execute(name, ctx, metrics, executed)
+        return executed
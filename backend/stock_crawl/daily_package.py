@@ -0,0 +1,260 @@
+# backend/stock_crawl/daily_package.py
+# -*- coding: utf-8 -*-
+"""
+AI 일일 패키지(ai_daily_package.json)를 발행일별 누적 상태(package_state.json)로 만드는 증분 빌더입니다.
+
+build_ai_package.build_package 는 병합본 전체를 읽고 날짜/리스트 컬럼을 다시 해석한 뒤 7일/14일 구간을 매번 새로 계산합니다.
+여기서는 발행일마다
+  - n / sentiment : 기사 수, 감성 라벨별 기사 수
+  - keywords/orgs : analysis_keywords / analysis_orgs 언급 수 (build_count_matrix 와 같이 리스트 항목마다 1)
+  - top           : 감성 라벨별로 먼저 들어온 TOP_ARTICLES 개 기사 (들어온 순번 기준 최대 힙)
+  - urls          : 이미 센 기사 URL 해시 (같은 기사를 두 번 세지 않음)
+만 보관합니다. 새 기사는 발행일 항목에만 더하므로 집계 비용은 새 기사 수에 비례하고(O(new)),
+패키지는 기준일 주변 WINDOW_DAYS 일 항목만 읽어 만듭니다. 다만 상태 파일은 실행마다 통째로 읽고 다시 쓰므로
+그 비용은 보관 중인 기사 수에 비례합니다. 그래서 refresh_daily_package 는 가장 최근 발행일 기준 RETAIN_DAYS 일만 남깁니다.
+(보관 기간보다 긴 백테스트는 상태 파일 대신 병합본에서 채운 빌더로 만듭니다. build_ai_package --series)
+
+패키지 형식과 기간 정의는 build_package 와 같습니다.
+  - 감성 비율/주요 기사: 기준일 - 7일 이후 발행 기사 (point_in_time=True 이면 기준일까지만)
+  - 급상승 키워드/종목: compute_momentum(최근 7일 vs 직전 7일, 최근 3회 이상 & 증가) 의 delta 상위 10개
+  - 주요 기사: 감성 라벨 오름차순(Negative → Neutral → Positive → 라벨 없음), 발행일 내림차순, 들어온 순
+build_package 와 달리 급상승 후보의 순서는 (종류, 이름) 정렬 순이라, delta 가 같은 항목의 순서만 다를 수 있습니다.
+
+백테스트용 series() 는 날짜마다 그날까지 발행된 기사만 보고(point_in_time) 만든 패키지 목록을 돌려줍니다.
+"""
+import os
+import json
+import heapq
+from datetime import date, datetime, timedelta
+
+from stock_crawl.paths import MERGED_CSV, PACKAGE_STATE_JSON
+from stock_crawl.records import iter_fields, publish_day, url_hash
+
+RECENT_DAYS = 7
+PREV_DAYS = 7
+BASELINE_DAYS = 28
+MIN_COUNT = 3
+TOP_K = 10
+TOP_ARTICLES = 10
+# 모멘텀 계산(최근 + baseline)에 필요한 기준일 이전 일수
+WINDOW_DAYS = RECENT_DAYS + BASELINE_DAYS
+# package_state.json 보관 기간 (WINDOW_DAYS 보다 길게: 늦게 들어온 기사와 최근 구간 백테스트용)
+RETAIN_DAYS = 90
+ENTITY_COLUMNS = {"keywords": "analysis_keywords", "orgs": "analysis_orgs"}
+ARTICLE_FIELDS = ("title", "summary_ai", "url", "sentiment_label")
+ROW_COLUMNS = ("url", "published_at", "sentiment_label", "title", "summary_ai") + tuple(ENTITY_COLUMNS.values())
+
+
+def _cell(value):
+    """NaN/빈 문자열 → None (패키지 JSON 에 NaN 이 들어가지 않도록)"""
+    if value is None or value != value or value == "":
+        return None
+    return value
+
+
+def _label_order(label):
+    """주요 기사 정렬 순서: 라벨 오름차순, 라벨 없는 기사("")는 마지막"""
+    return (label == "", label)
+
+
+class DailyPackageBuilder:
+    """package_state.json 한 파일에 발행일별 카운터와 라벨별 상위 기사 힙을 보관합니다."""
+
+    def __init__(self, path=PACKAGE_STATE_JSON):
+        self.path = path
+        self.state = self._load()
+
+    # ---------------- 저장/불러오기 ----------------
+    def _load(self):
+        empty = {"version": 1, "seq": 0, "days": {}}
+        if not self.path:
+            return empty
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return {**empty, **json.load(f)}
+        except (OSError, ValueError):
+            return empty
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    # ---------------- 일별 누적 ----------------
+    def add_articles(self, articles):
+        """새 기사를 발행일 항목에 더합니다. 이미 센 URL 과 발행일을 해석할 수 없는 기사는 건너뜁니다. (더한 기사 수)"""
+        from stock_crawl.artifacts import to_str_list
+
+        days = self.state["days"]
+        seen = {}
+        added = 0
+        for url, published_at, label, title, summary_ai, *entity_cells in iter_fields(articles, ROW_COLUMNS):
+            day = publish_day(published_at)
+            if day is None or not url:
+                continue
+            entry = days.setdefault(day, {"n": 0, "sentiment": {}, "keywords": {}, "orgs": {}, "top": {}, "urls": []})
+            urls = seen.get(day)
+            if urls is None:
+                urls = seen[day] = set(entry["urls"])
+            h = url_hash(url)
+            if h in urls:
+                continue
+            urls.add(h)
+            entry["urls"].append(h)
+            entry["n"] += 1
+
+            label = _cell(label) or ""
+            if label:
+                entry["sentiment"][label] = entry["sentiment"].get(label, 0) + 1
+            for entity_type, cell in zip(ENTITY_COLUMNS, entity_cells):
+                counts = entry[entity_type]
+                for term in to_str_list(cell):
+                    if term:
+                        counts[term] = counts.get(term, 0) + 1
+
+            # 라벨별 최대 힙: (-순번, 기사). 먼저 들어온 TOP_ARTICLES 개만 남깁니다.
+            self.state["seq"] += 1
+            record = dict(zip(ARTICLE_FIELDS, map(_cell, (title, summary_ai, url, label or None))))
+            heap = entry["top"].setdefault(label, [])
+            item = [-self.state["seq"], record]
+            if len(heap) < TOP_ARTICLES:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+            added += 1
+        return added
+
+    def bootstrap(self, merged_csv=MERGED_CSV):
+        """상태가 비어 있으면 병합본에서 한 번만 채웁니다. (청크 단위로 필요한 컬럼만 읽음)"""
+        if self.state["days"] or not os.path.exists(merged_csv):
+            return 0
+        from stock_crawl.records import iter_csv_chunks
+        added = 0
+        for chunk in iter_csv_chunks(merged_csv, usecols=list(ROW_COLUMNS)):
+            added += self.add_articles(chunk)
+        return added
+
+    def prune(self, keep_days):
+        """가장 최근 발행일 기준 keep_days 일보다 오래된 항목을 지웁니다. (기본은 전부 보관: 백테스트용)"""
+        if not self.state["days"]:
+            return 0
+        latest = date.fromisoformat(max(self.state["days"]))
+        cutoff = (latest - timedelta(days=keep_days)).isoformat()
+        old = [d for d in self.state["days"] if d < cutoff]
+        for day in old:
+            del self.state["days"][day]
+        return len(old)
+
+    def day_range(self):
+        """(첫 발행일, 마지막 발행일) date. 비어 있으면 (None, None)"""
+        if not self.state["days"]:
+            return None, None
+        return date.fromisoformat(min(self.state["days"])), date.fromisoformat(max(self.state["days"]))
+
+    # ---------------- 패키지 ----------------
+    def _count_matrix(self, start, end):
+        """start <= 발행일 <= end 의 키워드/기관 일별 언급 수 → momentum.CountMatrix"""
+        import numpy as np
+        from stock_crawl.momentum import CountMatrix
+
+        n_days = (end - start).days + 1
+        all_days = [start + timedelta(days=i) for i in range(n_days)]
+        rows = {}
+        for i, day in enumerate(all_days):
+            entry = self.state["days"].get(day.isoformat())
+            if entry is None:
+                continue
+            for entity_type in ENTITY_COLUMNS:
+                for term, count in entry[entity_type].items():
+                    rows.setdefault((entity_type, term), {})[i] = count
+        pairs = sorted(rows)
+        counts = np.zeros((len(pairs), n_days), dtype=np.int32)
+        for r, pair in enumerate(pairs):
+            for i, count in rows[pair].items():
+                counts[r, i] = count
+        return CountMatrix(
+            terms=np.array([term for _, term in pairs], dtype=object),
+            entity_types=np.array([entity_type for entity_type, _ in pairs], dtype=object),
+            days=np.array(all_days, dtype=object),
+            counts=counts,
+        )
+
+    def package(self, today=None, point_in_time=False):
+        """
+        기준일(today, 기본 오늘)의 패키지 dict. (build_package 와 같은 형식)
+        point_in_time=True 이면 기준일 이후 발행 기사를 보지 않습니다. (백테스트)
+        """
+        from stock_crawl.momentum import compute_momentum, top_trending
+
+        today = today or datetime.now().date()
+        recent_start = (today - timedelta(days=RECENT_DAYS)).isoformat()
+        recent_end = today.isoformat() if point_in_time else max(self.state["days"], default=recent_start)
+        recent_days = sorted((d for d in self.state["days"] if recent_start <= d <= recent_end), reverse=True)
+
+        sentiment = {}
+        for day in recent_days:
+            for label, count in self.state["days"][day]["sentiment"].items():
+                sentiment[label] = sentiment.get(label, 0) + count
+        total = sum(sentiment.values())
+        sentiment_ratio = {label: round(count / total, 2)
+                           for label, count in sorted(sentiment.items(), key=lambda kv: (-kv[1], kv[0]))}
+
+        # 라벨 순 → 발행일 내림차순 → 들어온 순으로 TOP_ARTICLES 개
+        top_articles = []
+        labels = sorted({label for day in recent_days for label in self.state["days"][day]["top"]}, key=_label_order)
+        for label in labels:
+            for day in recent_days:
+                heap = self.state["days"][day]["top"].get(label, [])
+                top_articles.extend(record for _, record in sorted(heap, reverse=True))
+                if len(top_articles) >= TOP_ARTICLES:
+                    break
+            if len(top_articles) >= TOP_ARTICLES:
+                break
+
+        matrix = self._count_matrix(today - timedelta(days=WINDOW_DAYS), today)
+        momentum = compute_momentum(matrix, as_of=today, recent_days=RECENT_DAYS, prev_days=PREV_DAYS,
+                                    baseline_days=BASELINE_DAYS, min_count=MIN_COUNT)
+        trending = top_trending(momentum, k=TOP_K, by="delta")
+
+        def get_trending(entity_type):
+            table = trending.get(entity_type)
+            return [] if table is None else table['term'].tolist()
+
+        kw_momentum = momentum[(momentum['entity_type'] == 'keywords') & (momentum['recent'] > 0)]
+        sector = kw_momentum.nlargest(TOP_K, 'recent')
+        return {
+            "date": str(today),
+            "trending_keywords": get_trending('keywords'),
+            "trending_stocks": get_trending('orgs'),
+            "sentiment_ratio": sentiment_ratio,
+            "top_articles": top_articles[:TOP_ARTICLES],
+            "sector_briefs": [{"keyword": k, "mentions": int(v)} for k, v in zip(sector['term'], sector['recent'])],
+        }
+
+    def series(self, start=None, end=None):
+        """start ~ end (기본: 보관된 첫/마지막 발행일) 날짜별 point-in-time 패키지 목록 (백테스트)"""
+        first, last = self.day_range()
+        start, end = start or first, end or last
+        if start is None:
+            return []
+        return [self.package(start + timedelta(days=i), point_in_time=True)
+                for i in range((end - start).days + 1)]
+
+
+def refresh_daily_package(articles=(), path=PACKAGE_STATE_JSON, today=None, keep_days=RETAIN_DAYS,
+                          merged_csv=MERGED_CSV):
+    """
+    새 기사(DataFrame/레코드)를 더한 뒤 기준일 패키지를 돌려주고 상태를 저장합니다.
+    처음이면 병합본(merged_csv)에서 상태를 한 번 채우고, 저장 전에 keep_days 일보다 오래된 발행일 항목을 지웁니다. (None: 전부 보관)
+    """
+    builder = DailyPackageBuilder(path)
+    bootstrapped = builder.bootstrap(merged_csv)
+    counted = builder.add_articles(articles)
+    pruned = builder.prune(keep_days) if keep_days is not None else 0
+    builder.save()
+    print(f"\n--- 📦 패키지 상태 갱신: 새 기사 {counted}건"
+          + (f" (병합본에서 {bootstrapped}건 초기화)" if bootstrapped else "")
+          + (f", 오래된 발행일 {pruned}일 정리" if pruned else "") + " ---")
+    return builder.package(today)
@@ -0,0 +1,215 @@
+# backend/stock_crawl/entities.py
+# -*- coding: utf-8 -*-
+"""
+Gemini 가 돌려주는 기관/기업명 표기 차이("삼성전자" / "삼성전자㈜" / "Samsung Electronics")를
+하나의 정식 명칭으로 모으는 정규화 사전입니다.
+
+- 정식 명칭: 코스피.txt / 코스닥.txt 의 종목명 + data/entity_aliases.tsv 의 별칭
+- 정규화 규칙: 유니코드 NFKC, 공백 제거, 법인 표기((주), 주식회사, Co., Ltd., Inc. 등) 제거,
+  한글로 읽은 영문 약칭(에스케이→SK, 엘지→LG 등) 통일, 대소문자 무시
+- 조회: 정규화 키 → 정식 명칭 dict 조회 한 번 (O(1)), 같은 원문은 메모이즈
+- 기본 사전(get_default_normalizer)은 위 파일을 미리 컴파일해 mmap 한 사전(stock_crawl.stock_dict)을 씁니다.
+
+수집 단계에서 한 번만 적용하고(normalize_entity_columns), 해석되지 않은 이름의 통계를 함께 남깁니다.
+"""
+import os
+import re
+import json
+import unicodedata
+import collections
+
+from stock_crawl.paths import STOCK_LIST_FILES, ENTITY_ALIASES_TSV
+
+# 법인 표기 (NFKC 이후 기준: ㈜ → (주))
+_CORP_PATTERNS = [
+    r"\(주\)", r"\(유\)", r"주식회사", r"\(株\)",
+    r",?\s*\bco\.?\s*,?\s*ltd\b\.?", r",?\s*\binc\b\.?", r",?\s*\bcorp(oration)?\b\.?", r",?\s*\blimited\b",
+    r",?\s*\bltd\b\.?",
+]
+_CORP_RE = re.compile("|".join(_CORP_PATTERNS), re.IGNORECASE)
+_PUNCT_RE = re.compile(r"[\s\.\,·ㆍ'\"`‘’“”\-_/]+")
+
+# 한글로 읽은 영문 약칭 → 영문 (키 계산에만 사용)
+_HANGUL_LATIN = {
+    "에스케이": "SK", "엘지": "LG", "케이티": "KT", "씨제이": "CJ", "지에스": "GS",
+    "엘에스": "LS", "에이치디": "HD", "디비": "DB", "비지에프": "BGF", "케이비": "KB",
+    "에이치엘": "HL", "에스디아이": "SDI",
+}
+_HANGUL_LATIN_RE = re.compile("|".join(sorted(_HANGUL_LATIN, key=len, reverse=True)))
+
+
+def clean_surface(name):
+    """표시용 정리: NFKC, 법인 표기 제거, 공백 정리 (정식 명칭을 못 찾았을 때 쓰는 이름)"""
+    text = unicodedata.normalize("NFKC", name)
+    text = _CORP_RE.sub(" ", text)
+    return " ".join(text.split()).strip(" ,.")
+
+
+def normalize_key(name):
+    """비교용 키: 표기 차이를 모두 지운 문자열"""
+    text = clean_surface(name)
+    text = _HANGUL_LATIN_RE.sub(lambda m: _HANGUL_LATIN[m.group(0)], text)
+    return _PUNCT_RE.sub("", text).casefold()
+
+
+def _read_lines(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+    except OSError:
+        print(f"  ⚠️ 엔티티 사전 파일을 찾지 못했습니다: {path}")
+        return []
+
+
+class EntityNormalizer:
+    """정규화 키 → 정식 명칭 사전과 해석 통계"""
+
+    def __init__(self, canonical_names=(), aliases=None, dictionary=None):
+        self.canonical = set()
+        self.listed = set(canonical_names)  # 종목 리스트에 있는 이름 (별칭 파일에만 있는 정식 명칭 제외)
+        self.lookup = {}
+        self._ambiguous = set()
+        self.dictionary = dictionary  # 컴파일된 사전(StockDictionary)이 있으면 lookup 대신 조회
+        for name in canonical_names:
+            self.add(name, name)
+        for alias, name in (aliases or {}).items():
+            self.add(alias, name, override=True)
+        self._memo = {}
+        self.resolved = collections.Counter()
+        self.unresolved = collections.Counter()
+
+    @classmethod
+    def from_files(cls, stock_files=STOCK_LIST_FILES, alias_file=ENTITY_ALIASES_TSV):
+        names = [n for path in stock_files for n in _read_lines(path)]
+        aliases = {}
+        for line in _read_lines(alias_file):
+            if line.startswith("#") or "\t" not in line:
+                continue
+            alias, name = line.split("\t", 1)
+            aliases[alias.strip()] = name.strip()
+        return cls(names, aliases)
+
+    @classmethod
+    def from_dictionary(cls, dictionary):
+        """컴파일된 종목 사전(stock_crawl.stock_dict)으로 조회하는 정규화기 (별칭 키를 다시 계산하지 않음)"""
+        return cls(dictionary=dictionary)
+
+    def entries(self):
+        """(정규화 키, 정식 명칭) 목록. 모호한 키는 정식 명칭이 None"""
+        for key, canonical in self.lookup.items():
+            yield key, None if key in self._ambiguous else canonical
+
+    def add(self, alias, canonical, override=False):
+        """별칭을 등록합니다. 서로 다른 종목이 같은 키가 되면 그 키는 모호한 것으로 보고 쓰지 않습니다."""
+        self.canonical.add(canonical)
+        key = normalize_key(alias)
+        if not key:
+            return
+        current = self.lookup.get(key)
+        if current is None or override:
+            self.lookup[key] = canonical
+            self._ambiguous.discard(key)
+        elif current != canonical:
+            self._ambiguous.add(key)
+
+    def resolve(self, name):
+        """정식 명칭을 돌려주고, 모르는 이름이면 None"""
+        key = normalize_key(name)
+        if self.dictionary is not None:
+            return self.dictionary.resolve_key(key)
+        if key in self._ambiguous:
+            return None
+        return self.lookup.get(key)
+
+    def normalize(self, name, keep_unresolved=True):
+        """
+        정식 명칭으로 바꿉니다. 해석되지 않으면 keep_unresolved=True 일 때 clean_surface 결과,
+        False 일 때 원문을 그대로 돌려줍니다. 결과는 원문 기준으로 메모이즈됩니다.
+        """
+        memo_key = (name, keep_unresolved)
+        hit = self._memo.get(memo_key)
+        if hit is None:
+            canonical = self.resolve(name)
+            if canonical is not None:
+                hit = (canonical, True)
+            else:
+                hit = (clean_surface(name) if keep_unresolved else name, False)
+            self._memo[memo_key] = hit
+        value, ok = hit
+        if ok:
+            self.resolved[value] += 1
+        else:
+            self.unresolved[value] += 1
+        return value
+
+    def normalize_list(self, names, keep_unresolved=True):
+        """리스트 전체를 정규화하고, 같은 엔티티가 두 번 나오면 하나만 남깁니다."""
+        from stock_crawl.artifacts import to_str_list  # pandas/numpy 는 정규화를 실제로 할 때만 불러옵니다.
+
+        out, seen = [], set()
+        for name in to_str_list(names):
+            value = self.normalize(name, keep_unresolved=keep_unresolved)
+            if value and value not in seen:
+                seen.add(value)
+                out.append(value)
+        return out
+
+    def reset_stats(self):
+        self.resolved.clear()
+        self.unresolved.clear()
+
+    def stats(self, top_n=30):
+        total_resolved = sum(self.resolved.values())
+        total_unresolved = sum(self.unresolved.values())
+        total = total_resolved + total_unresolved
+        return {
+            "mentions": total,
+            "resolved_mentions": total_resolved,
+            "unresolved_mentions": total_unresolved,
+            "resolved_ratio": round(total_resolved / total, 4) if total else 0.0,
+            "distinct_resolved": len(self.resolved),
+            "distinct_unresolved": len(self.unresolved),
+            "top_unresolved": self.unresolved.most_common(top_n),
+        }
+
+
+_DEFAULT = None
+
+
+def get_default_normalizer():
+    """종목 리스트/별칭 파일을 컴파일한 mmap 사전으로 만든 기본 정규화기 (프로세스당 한 번 생성)"""
+    global _DEFAULT
+    if _DEFAULT is None:
+        from stock_crawl.stock_dict import load_stock_dictionary
+        _DEFAULT = EntityNormalizer.from_dictionary(load_stock_dictionary())
+    return _DEFAULT
+
+
+def normalize_entity_columns(df, normalizer=None, stats_path=None):
+    """
+    기사 DataFrame 의 analysis_orgs / analysis_keywords 를 정식 명칭으로 바꿉니다.
+    - analysis_orgs: 해석되지 않은 이름도 법인 표기/공백을 정리해서 남깁니다.
+    - analysis_keywords: 종목/별칭으로 해석되는 것만 바꾸고 나머지 키워드는 그대로 둡니다.
+    해석 통계는 출력하고, stats_path 가 있으면 JSON 으로도 저장합니다.
+    """
+    normalizer = normalizer or get_default_normalizer()
+    normalizer.reset_stats()
+    if 'analysis_orgs' in df.columns:
+        df['analysis_orgs'] = df['analysis_orgs'].apply(normalizer.normalize_list)
+    org_stats = normalizer.stats()
+
+    if 'analysis_keywords' in df.columns:
+        df['analysis_keywords'] = df['analysis_keywords'].apply(
+            lambda kws: normalizer.normalize_list(kws, keep_unresolved=False)
+        )
+
+    print(f"   - 기관명 정규화: 언급 {org_stats['mentions']}건 중 {org_stats['resolved_mentions']}건 종목/별칭으로 해석 "
+          f"({org_stats['resolved_ratio']:.0%}), 미해석 고유 이름 {org_stats['distinct_unresolved']}개")
+    if org_stats['top_unresolved']:
+        preview = ", ".join(f"{name}({count})" for name, count in org_stats['top_unresolved'][:10])
+        print(f"     미해석 상위: {preview}")
+    if stats_path:
+        os.makedirs(os.path.dirname(stats_path), exist_ok=True)
+        with open(stats_path, "w", encoding="utf-8") as f:
+            json.dump(org_stats, f, ensure_ascii=False, indent=2)
+    return df
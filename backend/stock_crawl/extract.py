@@ -0,0 +1,82 @@
+# backend/stock_crawl/extract.py
+# -*- coding: utf-8 -*-
+"""
+기사 URL 에서 본문을 추출하는 단계입니다. (GitHub Actions / 로컬 / cli / 백필 공용)
+
+언론사별 본문 영역 선택자 중 처음 찾은 곳의 텍스트를 줄 단위로 읽다가, 광고/저작권/기자 소개 같은
+끝 표시(ARTICLE_END_MARKERS)가 나오면 거기서 자릅니다. 실패하면 "[실패] ..." / "[오류] ..." 문자열을 돌려줍니다.
+"""
+import time
+
+from stock_crawl.metrics import current_run, instrumented_get
+
+ARTICLE_END_MARKERS = [
+    "무단전재", "무단 전재", "재배포 금지", "저작권자", "광고문의",
+    "광고 문의", "AD링크", "타불라", "관련기사", "기자소개", "기자 소개",
+    "기자의 다른기사", "편집패널", "본문하단", "nBYLINE", "좋아요 버튼",
+    "속보는", "t.me/", "텔레그램", "영상취재", "기사제보", "보도자료",
+    "팟캐스트", "많이 본 기사", "공유하기", "공유버튼", "nCopyright",
+    "기사 전체보기", "입력 :", "지면 :", "AI학습 이용 금지", "기사 공유",
+    "댓글", "좋아요", "광고", "관련 뉴스", "추천 뉴스", "영상편집",
+    "뉴스제공", "기사제공", "기사 하단 광고", "기사 영역 하단 광고",
+    "기자 정보", "전체기사 보기", "장기영 기자", "공감언론",
+    "기자 (", "기자 =", "기자]", "[사진=", "자료=", "(서울=연합뉴스)",
+    "[파이낸셜뉴스]", "페이스북", "트위터", "카카오톡", "제보하기",
+    "독자 여러분의 소중한 제보를 기다립니다", "▶", "※", "☞", "[ⓒ", "◎"
+]
+CONTENT_SELECTORS = [
+    "#article-view-content-div", "#CmAdContent", "#articleBody", "#article-body", "#view_content_wrap",
+    "#article-content-body", "#news_body_area", "#article_content", "#news-contents", "#articleText",
+    "article", ".article_body", ".news_end"
+]
+REQUEST_HEADERS = {"User-Agent": "Mozilla/5.0", "Accept-Language": "ko-KR,ko;q=0.9"}
+FAILURE_PREFIXES = ("[실패]", "[오류]")
+
+
+def is_extract_failure(content):
+    return content.startswith(FAILURE_PREFIXES)
+
+
+def extract_article_content(url, end_markers=ARTICLE_END_MARKERS):
+    """주어진 URL에서 기사 본문을 추출합니다."""
+    from bs4 import BeautifulSoup  # 본문 추출 단계에서만 필요
+
+    try:
+        response = instrumented_get(url, headers=REQUEST_HEADERS, timeout=15, verify=False)
+        response.raise_for_status()
+        if response.encoding.lower() in ['iso-8859-1', 'euc-kr']:
+            response.encoding = response.apparent_encoding
+        soup = BeautifulSoup(response.text, "lxml")
+        for tag in soup(['script', 'style', 'header', 'footer', 'nav', 'aside', 'iframe', 'figure']):
+            tag.decompose()
+        content_area = next((area for area in map(soup.select_one, CONTENT_SELECTORS) if area), None)
+        if content_area:
+            text = content_area.get_text(separator='\n', strip=True)
+            if len(text) > 100:
+                cleaned_lines = []
+                for line in text.split('\n'):
+                    if any(marker in line for marker in end_markers):
+                        break
+                    cleaned_lines.append(line)
+                return '\n'.join(cleaned_lines).strip()
+        return "[실패] 본문 영역 추출 실패"
+    except Exception as e:
+        return f"[오류] {str(e)}"
+
+
+def extract_articles(articles, config, progress=False):
+    """본문이 비어 있는 기사만 채웁니다. (레코드를 그대로 수정, 실패 수는 extract_failures 로 기록)"""
+    print("\n--- 2단계: 기사 본문 추출 시작 ---")
+    items = articles
+    if progress:
+        from tqdm import tqdm  # 진행 표시줄은 본문 추출 단계에서만 사용
+        items = tqdm(articles, desc="  - 본문 추출 중")
+    for article in items:
+        if article.get('content'):
+            continue
+        article['content'] = extract_article_content(article.get('url', ''))
+        if is_extract_failure(article['content']):
+            current_run().incr("extract_failures")
+        time.sleep(config.extract_delay)
+    print(f"--- ✅ 본문 추출 완료 ({len(articles)}개) ---")
+    return articles
@@ -0,0 +1,268 @@
+# backend/stock_crawl/keywords.py
+# -*- coding: utf-8 -*-
+"""
+검색 키워드 목록을 한 곳(keyword_store.json)에서 관리하고, 일별 키워드 집계로 추가/정리 후보를 갱신합니다.
+
+- active: 지금 네이버에서 수집하는 검색 키워드. crawl_naver_news 는 이 목록을 그대로 씁니다.
+  파일이 없으면 DEFAULT_KEYWORDS 로 시작합니다.
+- days: 발행일별 analysis_keywords 등장 횟수와 이미 센 기사 URL 해시. 새로 분석한 기사만 더하므로
+  (URL 해시로 같은 기사를 두 번 세지 않음) 전체 병합본을 다시 읽지 않습니다. RETAIN_DAYS 일만 보관합니다.
+- 키워드 비교는 공백을 뺀 소문자 키로 합니다. ("금리 인상" = "금리인상", "한미 관세협상" = "한미 관세 협상")
+- 히스테리시스:
+    추가: 최근 ADD_WINDOW_DAYS 일 ADD_MIN_COUNT 회 이상인 상태가 ADD_STREAK_DAYS 번 연속 (집계 기준일이 바뀔 때마다 1)
+    정리: 최근 RETIRE_WINDOW_DAYS 일 RETIRE_MAX_COUNT 회 이하인 상태가 RETIRE_STREAK_DAYS 번 연속,
+          그리고 활성화된 지 RETIRE_MIN_AGE_DAYS 일 이상, 고정(pinned)이 아닌 키워드만
+  추가 기준이 정리 기준보다 훨씬 높아서 경계에 걸친 키워드가 매일 들어왔다 나갔다 하지 않습니다.
+- 집계 기준일은 오늘이 아니라 '데이터가 있는 가장 최근 날짜'라서, 수집이 며칠 멈춰도 키워드가 한꺼번에 정리되지 않습니다.
+- 사람이 직접 정리한 키워드(blocked)는 자동으로 다시 추가하지 않습니다.
+"""
+import os
+import json
+import collections
+from datetime import date, timedelta
+
+from stock_crawl.paths import KEYWORD_STORE_JSON, MERGED_CSV
+from stock_crawl.records import iter_fields, publish_day, url_hash
+
+DEFAULT_KEYWORDS = [
+    "코스피", "코스닥", "환율", "금리인상", "FOMC", "외국인 순매수", "반도체",
+    "HBM", "AI반도체", "2차전지", "바이오", "제약", "밸류업", "기업 실적"
+]
+# 검색어로 쓰기엔 너무 일반적인 키워드 (자동 추가 제외)
+GENERIC_KEYWORDS = {"주가", "주식", "증시", "투자", "시장", "주식시장", "상승", "하락", "주가상승", "주가하락",
+                    "미국", "한국", "경제", "실적"}
+
+RETAIN_DAYS = 35
+ADD_WINDOW_DAYS = 7
+ADD_MIN_COUNT = 10
+ADD_STREAK_DAYS = 2
+RETIRE_WINDOW_DAYS = 30
+RETIRE_MAX_COUNT = 3
+RETIRE_STREAK_DAYS = 3
+RETIRE_MIN_AGE_DAYS = 7
+MAX_ACTIVE = 30
+
+
+def keyword_key(keyword):
+    return "".join(str(keyword).split()).lower()
+
+
+class KeywordStore:
+    """keyword_store.json 한 파일에 활성 키워드, 일별 집계, 추가/정리 후보를 보관합니다."""
+
+    def __init__(self, path=KEYWORD_STORE_JSON, seeds=DEFAULT_KEYWORDS):
+        self.path = path
+        self.state = self._load()
+        if not self.state["active"]:
+            today = date.today().isoformat()
+            for kw in seeds:
+                self.state["active"][kw] = {"since": today, "source": "seed", "pinned": False}
+
+    # ---------------- 저장/불러오기 ----------------
+    def _load(self):
+        empty = {"version": 1, "active": {}, "retired": {}, "days": {}, "labels": {},
+                 "candidates": {"add": {}, "retire": {}}, "last_evaluated": None, "history": []}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return {**empty, **json.load(f)}
+        except (OSError, ValueError):
+            return empty
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+    # ---------------- 활성 키워드 ----------------
+    def active_keywords(self):
+        return list(self.state["active"])
+
+    def _active_keys(self):
+        return {keyword_key(kw): kw for kw in self.state["active"]}
+
+    def add(self, keyword, pinned=False, source="manual", today=None):
+        keyword = keyword.strip()
+        self.state["active"][keyword] = {"since": (today or date.today()).isoformat(), "source": source,
+                                         "pinned": pinned}
+        self.state["retired"].pop(keyword, None)
+        self.state["candidates"]["add"].pop(keyword_key(keyword), None)
+        self._log("add", keyword, source, today)
+
+    def retire(self, keyword, source="manual", today=None):
+        keyword = self._active_keys().get(keyword_key(keyword), keyword)
+        if self.state["active"].pop(keyword, None) is None:
+            return False
+        # 사람이 정리한 키워드는 자동으로 다시 추가하지 않습니다.
+        self.state["retired"][keyword] = {"retired_at": (today or date.today()).isoformat(), "source": source,
+                                          "blocked": source == "manual"}
+        self.state["candidates"]["retire"].pop(keyword_key(keyword), None)
+        self._log("retire", keyword, source, today)
+        return True
+
+    def pin(self, keyword, pinned=True):
+        keyword = self._active_keys().get(keyword_key(keyword), keyword)
+        if keyword in self.state["active"]:
+            self.state["active"][keyword]["pinned"] = pinned
+
+    def _log(self, action, keyword, source, today):
+        self.state["history"].append({"date": (today or date.today()).isoformat(), "action": action,
+                                      "keyword": keyword, "source": source})
+        self.state["history"] = self.state["history"][-200:]
+
+    # ---------------- 일별 집계 ----------------
+    def update_from_articles(self, articles):
+        """새로 분석된 기사의 analysis_keywords 를 발행일별로 더합니다. 이미 센 URL 은 건너뜁니다. (더한 기사 수)"""
+        from stock_crawl.artifacts import to_str_list
+
+        days, labels = self.state["days"], self.state["labels"]
+        seen = {day: set(entry["urls"]) for day, entry in days.items()}
+        added = 0
+        for url, published_at, keywords in iter_fields(articles, ("url", "published_at", "analysis_keywords")):
+            day = publish_day(published_at)
+            if day is None or not url:
+                continue
+            h = url_hash(url)
+            if h in seen.setdefault(day, set()):
+                continue
+            seen[day].add(h)
+            entry = days.setdefault(day, {"counts": {}, "urls": []})
+            entry["urls"].append(h)
+            for kw in set(to_str_list(keywords)):
+                key = keyword_key(kw)
+                if not key:
+                    continue
+                labels.setdefault(key, kw.strip())
+                entry["counts"][key] = entry["counts"].get(key, 0) + 1
+            added += 1
+        self._prune()
+        return added
+
+    def bootstrap(self, merged_csv=MERGED_CSV):
+        """일별 집계가 비어 있으면 병합본에서 한 번만 채웁니다. (청크 단위로 필요한 컬럼만 읽음)"""
+        if self.state["days"] or not os.path.exists(merged_csv):
+            return 0
+        from stock_crawl.records import iter_csv_chunks
+        added = 0
+        for chunk in iter_csv_chunks(merged_csv, usecols=["url", "published_at", "analysis_keywords"]):
+            added += self.update_from_articles(chunk)
+        return added
+
+    def _prune(self):
+        if not self.state["days"]:
+            return
+        latest = max(self.state["days"])
+        cutoff = (date.fromisoformat(latest) - timedelta(days=RETAIN_DAYS)).isoformat()
+        for day in [d for d in self.state["days"] if d < cutoff]:
+            del self.state["days"][day]
+
+    def anchor_day(self, today=None):
+        """집계 기준일: today 이전에서 데이터가 있는 가장 최근 날짜"""
+        limit = (today or date.today()).isoformat()
+        days = [d for d in self.state["days"] if d <= limit]
+        return date.fromisoformat(max(days)) if days else None
+
+    def window_counts(self, days, anchor):
+        start = (anchor - timedelta(days=days - 1)).isoformat()
+        end = anchor.isoformat()
+        counts = collections.Counter()
+        for day, entry in self.state["days"].items():
+            if start <= day <= end:
+                counts.update(entry["counts"])
+        return counts
+
+    def label(self, key):
+        return self.state["labels"].get(key, key)
+
+    # ---------------- 후보 평가 ----------------
+    def eligible(self, key):
+        """자동 추가/추천 대상인지 (한 글자, 일반 키워드, 사람이 정리한(blocked) 키워드 제외)"""
+        if len(key) <= 1 or key in GENERIC_KEYWORDS:
+            return False
+        return not any(info.get("blocked") and keyword_key(kw) == key for kw, info in self.state["retired"].items())
+
+    def evaluate(self, today=None, apply=True):
+        """
+        추가/정리 후보의 연속 횟수를 갱신하고, apply=True 면 기준을 넘은 키워드를 실제로 추가/정리합니다.
+        {"anchor", "added", "retired", "add_candidates", "retire_candidates"}
+        """
+        today = today or date.today()
+        anchor = self.anchor_day(today)
+        result = {"anchor": anchor.isoformat() if anchor else None, "added": [], "retired": [],
+                  "add_candidates": [], "retire_candidates": []}
+        if anchor is None:
+            return result
+        # 같은 기준일로 여러 번 평가해도 연속 횟수는 한 번만 늘어납니다.
+        new_day = self.state["last_evaluated"] != anchor.isoformat()
+        self.state["last_evaluated"] = anchor.isoformat()
+        active = self._active_keys()
+        cands = self.state["candidates"]
+
+        add_counts = self.window_counts(ADD_WINDOW_DAYS, anchor)
+        hot = {key: n for key, n in add_counts.items()
+               if n >= ADD_MIN_COUNT and key not in active and self.eligible(key)}
+        cands["add"] = {key: {"streak": cands["add"].get(key, {}).get("streak", 0) + (1 if new_day else 0),
+                              "count": n}
+                        for key, n in hot.items()}
+
+        retire_counts = self.window_counts(RETIRE_WINDOW_DAYS, anchor)
+        cold = {}
+        for key, kw in active.items():
+            info = self.state["active"][kw]
+            age = (today - date.fromisoformat(info["since"])).days
+            if retire_counts[key] <= RETIRE_MAX_COUNT and not info.get("pinned") and age >= RETIRE_MIN_AGE_DAYS:
+                cold[key] = retire_counts[key]
+        cands["retire"] = {key: {"streak": cands["retire"].get(key, {}).get("streak", 0) + (1 if new_day else 0),
+                                 "count": n, "keyword": active[key]}
+                           for key, n in cold.items()}
+
+        ready_add = sorted((k for k, c in cands["add"].items() if c["streak"] >= ADD_STREAK_DAYS),
+                           key=lambda k: -cands["add"][k]["count"])
+        ready_retire = [c["keyword"] for c in cands["retire"].values() if c["streak"] >= RETIRE_STREAK_DAYS]
+        if apply:
+            for kw in ready_retire:
+                self.retire(kw, source="auto", today=today)
+                result["retired"].append(kw)
+            room = MAX_ACTIVE - len(self.state["active"])
+            for key in ready_add[:max(0, room)]:
+                self.add(self.label(key), source="auto", today=today)
+                result["added"].append(self.label(key))
+
+        result["add_candidates"] = [{"keyword": self.label(k), **c}
+                                    for k, c in sorted(cands["add"].items(), key=lambda kv: -kv[1]["count"])]
+        result["retire_candidates"] = [{**c} for c in cands["retire"].values()]
+        return result
+
+
+def load_search_keywords(path=KEYWORD_STORE_JSON, fallback=DEFAULT_KEYWORDS):
+    """수집에 쓸 활성 검색 키워드 목록 (저장소가 없으면 fallback)"""
+    if not os.path.exists(path):
+        return list(fallback)
+    return KeywordStore(path, seeds=fallback).active_keywords()
+
+
+def refresh_keyword_store(articles, path=KEYWORD_STORE_JSON, today=None, apply=True):
+    """
+    새로 분석한 기사(DataFrame/레코드)로 일별 집계를 갱신하고 후보를 평가한 뒤 저장합니다.
+    처음이면 병합본에서 집계를 한 번 채웁니다. 실행 리포트에 넣을 dict 를 돌려줍니다.
+    """
+    store = KeywordStore(path)
+    bootstrapped = store.bootstrap()
+    counted = store.update_from_articles(articles)
+    result = store.evaluate(today, apply=apply)
+    store.save()
+    print(f"\n--- 🔑 키워드 집계 갱신: 새 기사 {counted}건" + (f" (병합본에서 {bootstrapped}건 초기화)" if bootstrapped else "")
+          + f", 기준일 {result['anchor']} ---")
+    for kw in result["added"]:
+        print(f"  ➕ 검색 키워드 추가: {kw}")
+    for kw in result["retired"]:
+        print(f"  ➖ 검색 키워드 정리: {kw}")
+    pending = [c for c in result["add_candidates"] if c["keyword"] not in result["added"]]
+    if pending:
+        print("  - 추가 후보: " + ", ".join(f"{c['keyword']}({c['count']}회, {c['streak']}/{ADD_STREAK_DAYS})"
+                                          for c in pending[:10]))
+    if result["retire_candidates"]:
+        print("  - 정리 후보: " + ", ".join(f"{c['keyword']}({c['count']}회, {c['streak']}/{RETIRE_STREAK_DAYS})"
+                                          for c in result["retire_candidates"]))
+    return {"articles": counted, "bootstrapped": bootstrapped, "active": store.active_keywords(), **result}
@@ -0,0 +1,30 @@
+# backend/stock_crawl/lazy.py
+# -*- coding: utf-8 -*-
+"""
+무거운 의존성(pandas, google.generativeai 등)을 실제로 쓰는 순간에 불러오기 위한 도우미입니다.
+
+    pd = lazy_import("pandas")      # 이 시점에는 pandas 를 실행하지 않음
+    ...
+    df = pd.DataFrame(rows)         # 첫 속성 접근에서 import
+
+importlib.util.LazyLoader 를 사용하므로 모듈 객체는 sys.modules 에 그대로 등록되고,
+다른 곳의 `import pandas` 도 같은 객체를 받습니다. 설치되지 않은 모듈이면 즉시 ImportError 를 냅니다.
+"""
+import sys
+import importlib.util
+
+
+def lazy_import(name):
+    """모듈을 지연 로드 객체로 돌려줍니다. 이미 로드되어 있으면 그 모듈을 그대로 돌려줍니다."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
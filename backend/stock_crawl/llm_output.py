@@ -0,0 +1,113 @@
+# backend/stock_crawl/llm_output.py
+# -*- coding: utf-8 -*-
+"""
+Gemini 배치 응답(JSON 배열)을 원소 단위로 읽고 검증합니다.
+
+응답은 보통 ```json 코드 블록 안의 배열이지만, 앞뒤에 설명 문장이 붙거나 원소 하나가 깨져
+(따옴표 누락, 잘린 응답 등) 전체 json.loads 가 실패하는 경우가 있습니다. 여기서는
+  1) 배열 시작("[" 다음의 "{")을 찾고,
+  2) JSONDecoder.raw_decode 로 객체를 하나씩 읽으며, 깨진 원소는 다음 "{" 까지 건너뛰고,
+  3) 원소마다 스키마(id, 리스트 필드, 요약 문자열, 감성 라벨)를 검증해
+유효한 원소만 돌려주고, 결과를 얻지 못한 id 는 따로 돌려줘 그 기사만 다시 요청할 수 있게 합니다.
+"""
+import re
+import json
+
+SENTIMENT_LABELS = ("Positive", "Negative", "Neutral")
+LIST_FIELDS = ("analysis_keywords", "analysis_orgs")
+TEXT_FIELDS = ("summary_ai",)
+
+_SENTIMENT_ALIASES = {
+    "positive": "Positive", "negative": "Negative", "neutral": "Neutral",
+    "긍정": "Positive", "부정": "Negative", "중립": "Neutral",
+}
+_ARRAY_START_RE = re.compile(r"\[\s*\{")
+_decoder = json.JSONDecoder()
+
+
+def iter_json_objects(text):
+    """
+    text 안의 JSON 객체를 앞에서부터 하나씩 (객체, None) 으로 돌려줍니다.
+    읽지 못한 조각은 (None, 오류 메시지) 로 알리고 다음 "{" 부터 이어 읽습니다. 배열이 "]" 로 닫히면 멈춥니다.
+    """
+    match = _ARRAY_START_RE.search(text)
+    pos = match.start() + 1 if match else text.find("{")
+    if pos < 0:
+        return
+    end = len(text)
+    while pos < end:
+        # 원소 사이의 공백/쉼표를 건너뜁니다.
+        while pos < end and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= end or text[pos] == "]":
+            return
+        if text[pos] != "{":
+            nxt = text.find("{", pos)
+            if nxt < 0:
+                return
+            pos = nxt
+        try:
+            obj, pos = _decoder.raw_decode(text, pos)
+        except ValueError as e:
+            yield None, str(e)
+            nxt = text.find("{", pos + 1)
+            if nxt < 0:
+                return
+            pos = nxt
+            continue
+        yield obj, None
+
+
+def _str_list(value):
+    if isinstance(value, str):
+        value = re.split(r"[,、]", value)
+    if not isinstance(value, list):
+        return None
+    return [str(v).strip() for v in value if isinstance(v, (str, int, float)) and str(v).strip()]
+
+
+def validate_result(obj, expected_ids):
+    """스키마에 맞게 정리한 dict, 또는 (None, 이유). 쉼표로 이은 문자열 키워드/대소문자 다른 라벨은 고쳐 받습니다."""
+    if not isinstance(obj, dict):
+        return None, "객체가 아님"
+    aid = obj.get("id")
+    if not isinstance(aid, str) or aid not in expected_ids:
+        return None, f"알 수 없는 id: {str(aid)[:40]!r}"
+    result = {"id": aid}
+    for field in LIST_FIELDS:
+        values = _str_list(obj.get(field))
+        if values is None:
+            return None, f"{aid}: {field} 가 리스트가 아님"
+        result[field] = values
+    for field in TEXT_FIELDS:
+        value = obj.get(field)
+        if not isinstance(value, str):
+            return None, f"{aid}: {field} 가 문자열이 아님"
+        result[field] = value.strip()
+    label = _SENTIMENT_ALIASES.get(str(obj.get("sentiment_label", "")).strip().lower())
+    if label is None:
+        return None, f"{aid}: sentiment_label 값이 {SENTIMENT_LABELS} 가 아님 ({obj.get('sentiment_label')!r})"
+    result["sentiment_label"] = label
+    return result, None
+
+
+def parse_analysis_response(text, expected_ids):
+    """
+    (유효한 결과 목록, 결과를 얻지 못한 id 목록, 문제 목록).
+    같은 id 가 여러 번 나오면 처음 유효한 것만 씁니다. 실패 id 는 expected_ids 순서를 따릅니다.
+    """
+    expected = list(expected_ids)
+    expected_set = set(expected)
+    valid, problems, seen = [], [], set()
+    for obj, error in iter_json_objects(text or ""):
+        if error is not None:
+            problems.append(f"JSON 파싱 실패: {error}")
+            continue
+        result, reason = validate_result(obj, expected_set)
+        if result is None:
+            problems.append(reason)
+        elif result["id"] not in seen:
+            seen.add(result["id"])
+            valid.append(result)
+    failed = [aid for aid in expected if aid not in seen]
+    return valid, failed, problems
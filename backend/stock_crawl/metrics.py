@@ -0,0 +1,236 @@
+# backend/stock_crawl/metrics.py
+# -*- coding: utf-8 -*-
+"""
+파이프라인 실행 기록(단계별 소요 시간, HTTP 요청 지연/바이트, Gemini 호출 지연/토큰, 실패 횟수)을
+모아 실행마다 JSON 리포트로 남기는 모듈입니다.
+
+    run = start_run("run_pipeline")
+    with run.stage("crawl") as span:
+        articles = crawl_naver_news(...)
+        span["items"] = len(articles)
+    run.write_report(reports_dir)
+
+HTTP 요청은 instrumented_get() 을 requests.get 대신 쓰면 호스트별로 자동 집계됩니다.
+start_run(..., profile_dir=...) 을 주고 STOCK_CRAWL_PROFILE=1 또는 --profile 로 실행하면
+각 stage 구간이 cProfile 로도 기록됩니다. (stock_crawl.profiling 참고)
+"""
+import os
+import json
+import time
+import socket
+import collections
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from urllib.parse import urlparse
+
+from stock_crawl.profiling import create_profiler
+
+# 지연 시간 히스토그램 경계 (초)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, float("inf"))
+REPORT_SCHEMA_VERSION = 1
+
+
+def _percentiles(values, points=(50, 90, 99)):
+    if not values:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(values)
+    out = {}
+    for p in points:
+        idx = min(len(ordered) - 1, max(0, int(round(p / 100.0 * (len(ordered) - 1)))))
+        out[f"p{p}"] = round(ordered[idx], 4)
+    return out
+
+
+def _bucketize(values):
+    counts = collections.OrderedDict((f"le_{b:g}", 0) for b in LATENCY_BUCKETS)
+    for v in values:
+        for b in LATENCY_BUCKETS:
+            if v <= b:
+                counts[f"le_{b:g}"] += 1
+                break
+    return counts
+
+
+class RunMetrics:
+    """한 번의 파이프라인 실행 동안의 측정값"""
+
+    def __init__(self, run_name):
+        self.run_name = run_name
+        self.started_at = datetime.now()
+        self._t0 = time.perf_counter()
+        self.stages = []
+        self.counters = collections.Counter()
+        self.http = collections.defaultdict(lambda: {"latencies": [], "bytes": 0, "errors": 0, "status": collections.Counter()})
+        self.llm_calls = []
+        self.extra = {}
+        self.profiler = None
+
+    # ---------------- 단계 ----------------
+    @contextmanager
+    def stage(self, name, **attrs):
+        """단계 구간을 기록합니다. yield 되는 dict 에 items 등 값을 넣으면 리포트에 함께 남습니다."""
+        span = {"name": name, **attrs}
+        start_wall = datetime.now()
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            with self.profiler.profile(name) if self.profiler else nullcontext():
+                yield span
+        except BaseException as e:
+            status = f"error: {type(e).__name__}"
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            span.update({
+                "started_at": start_wall.isoformat(timespec="seconds"),
+                "seconds": round(elapsed, 4),
+                "status": status,
+            })
+            items = span.get("items")
+            if isinstance(items, (int, float)) and elapsed > 0:
+                span["items_per_second"] = round(items / elapsed, 3)
+            self.stages.append(span)
+
+    # ---------------- 카운터 ----------------
+    def incr(self, name, n=1):
+        self.counters[name] += n
+
+    # ---------------- HTTP ----------------
+    def record_request(self, url, seconds, nbytes=0, status=None, ok=True):
+        stats = self.http[urlparse(url).netloc or "unknown"]
+        stats["latencies"].append(seconds)
+        stats["bytes"] += nbytes
+        if status is not None:
+            stats["status"][str(status)] += 1
+        if not ok:
+            stats["errors"] += 1
+            self.incr("http_errors")
+
+    # ---------------- Gemini ----------------
+    def record_llm_call(self, batch_index, n_articles, seconds, response=None, ok=True, prompt_chars=None,
+                        raw_prompt_chars=None):
+        """
+        Gemini 응답의 usage_metadata 에서 토큰 수를 읽어 함께 기록합니다.
+        raw_prompt_chars 는 본문을 줄이기 전 프롬프트 길이이고, 줄이기 전 토큰 수는 실측 토큰 × 글자 비율로 추정합니다.
+        """
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None)
+        raw_tokens = None
+        if prompt_tokens and prompt_chars and raw_prompt_chars:
+            raw_tokens = round(prompt_tokens * raw_prompt_chars / prompt_chars)
+        self.llm_calls.append({
+            "batch": batch_index,
+            "articles": n_articles,
+            "seconds": round(seconds, 4),
+            "ok": ok,
+            "prompt_chars": prompt_chars,
+            "raw_prompt_chars": raw_prompt_chars,
+            "raw_prompt_tokens_est": raw_tokens,
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": getattr(usage, "candidates_token_count", None),
+            "total_tokens": getattr(usage, "total_token_count", None),
+        })
+        if not ok:
+            self.incr("llm_batch_failures")
+
+    # ---------------- 리포트 ----------------
+    def summary(self):
+        hosts = {}
+        for host, stats in sorted(self.http.items(), key=lambda kv: -len(kv[1]["latencies"])):
+            lat = stats["latencies"]
+            hosts[host] = {
+                "requests": len(lat),
+                "errors": stats["errors"],
+                "bytes": stats["bytes"],
+                "seconds_total": round(sum(lat), 4),
+                **_percentiles(lat),
+                "buckets": _bucketize(lat),
+                "status": dict(stats["status"]),
+            }
+        llm_lat = [c["seconds"] for c in self.llm_calls]
+
+        def _sum(key):
+            return sum(c[key] or 0 for c in self.llm_calls)
+
+        return {
+            "schema_version": REPORT_SCHEMA_VERSION,
+            "run_name": self.run_name,
+            "host": socket.gethostname(),
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_seconds": round(time.perf_counter() - self._t0, 4),
+            "stages": self.stages,
+            "counters": dict(self.counters),
+            "http": {
+                "requests": sum(h["requests"] for h in hosts.values()),
+                "bytes": sum(h["bytes"] for h in hosts.values()),
+                "by_host": hosts,
+            },
+            "llm": {
+                "calls": len(self.llm_calls),
+                "failures": sum(1 for c in self.llm_calls if not c["ok"]),
+                "prompt_chars": _sum("prompt_chars"),
+                "raw_prompt_chars": _sum("raw_prompt_chars"),
+                "prompt_tokens": _sum("prompt_tokens"),
+                "raw_prompt_tokens_est": _sum("raw_prompt_tokens_est"),
+                "output_tokens": _sum("output_tokens"),
+                "seconds_total": round(sum(llm_lat), 4),
+                **_percentiles(llm_lat),
+                "buckets": _bucketize(llm_lat),
+                "batches": self.llm_calls,
+            },
+            **self.extra,
+        }
+
+    def write_report(self, reports_dir):
+        """타임스탬프 파일과 최신본(run_report.json)을 함께 저장합니다."""
+        os.makedirs(reports_dir, exist_ok=True)
+        if self.profiler is not None:
+            self.profiler.write_summary()
+            self.extra["profile_dir"] = self.profiler.output_dir
+        report = self.summary()
+        stamp = self.started_at.strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(reports_dir, f"run_report_{self.run_name}_{stamp}.json")
+        for target in (path, os.path.join(reports_dir, "run_report.json")):
+            with open(target, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        print(f"📊 실행 리포트 저장: {path} (총 {report['total_seconds']:.1f}초)")
+        return path
+
+
+_CURRENT = RunMetrics("default")
+
+
+def start_run(run_name, profile_dir=None):
+    """
+    새 실행 기록을 시작하고 현재 기록으로 지정합니다.
+    profile_dir 가 있고 프로파일링이 요청되었으면 단계별 프로파일을 그 아래에 남깁니다.
+    """
+    global _CURRENT
+    _CURRENT = RunMetrics(run_name)
+    if profile_dir:
+        _CURRENT.profiler = create_profiler(profile_dir, run_name)
+        if _CURRENT.profiler is not None:
+            print(f"🔬 프로파일링 모드: {_CURRENT.profiler.output_dir}")
+    return _CURRENT
+
+
+def current_run():
+    return _CURRENT
+
+
+def instrumented_get(url, session=None, **kwargs):
+    """requests.get 과 같지만 호스트별 지연/바이트/상태 코드를 현재 실행 기록에 남깁니다."""
+    if session is None:
+        import requests as http  # 수집 단계에서만 필요하므로 첫 요청 때 불러옵니다.
+    else:
+        http = session
+    start = time.perf_counter()
+    try:
+        response = http.get(url, **kwargs)
+    except Exception:
+        _CURRENT.record_request(url, time.perf_counter() - start, ok=False)
+        raise
+    nbytes = len(response.content) if not kwargs.get("stream") else int(response.headers.get("Content-Length", 0) or 0)
+    _CURRENT.record_request(url, time.perf_counter() - start, nbytes=nbytes,
+                            status=response.status_code, ok=response.ok)
+    return response
@@ -0,0 +1,181 @@
+# backend/stock_crawl/momentum.py
+# -*- coding: utf-8 -*-
+"""
+급상승(모멘텀) 키워드/기관/종목 계산 엔진입니다. 대시보드와 build_ai_package.py 가 함께 사용합니다.
+
+기사 DataFrame 의 리스트 컬럼들을 (엔티티 × 날짜) 일별 언급 수 행렬 하나로 만든 뒤,
+모든 엔티티 종류(키워드/기관/종목)를 한 번의 NumPy 연산으로 계산합니다.
+
+- recent / prev : 최근 N일, 직전 N일 언급 수 (기존 로직과 같은 기간 정의)
+- delta         : recent - prev
+- growth_pct    : 일평균 기준 증가율(%). 0 대비 증가를 1000% 로 고정하지 않도록 +smoothing 으로 평활화
+- zscore        : 최근 일평균이 직전 baseline 기간의 일별 분포에서 얼마나 벗어났는지
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+SCORE_COLUMNS = ("delta", "growth_pct", "zscore", "recent")
+
+
+@dataclass
+class CountMatrix:
+    """엔티티 × 날짜 일별 언급 수 행렬"""
+    terms: np.ndarray          # (n_terms,) 엔티티 이름
+    entity_types: np.ndarray   # (n_terms,) 'keywords' / 'orgs' / 'stocks' 등
+    days: np.ndarray           # (n_days,) datetime.date, 하루 간격으로 빠짐없이 채워짐
+    counts: np.ndarray         # (n_terms, n_days) int32
+
+    def day_mask(self, start, end):
+        """start <= day < end 인 날짜 열 마스크"""
+        return (self.days >= start) & (self.days < end)
+
+
+def _explode_column(df, column, date_col, exclude):
+    """리스트 컬럼을 (날짜, 엔티티) 쌍으로 펼칩니다."""
+    pairs = df[[date_col, column]].explode(column).dropna()
+    pairs = pairs[pairs[column].map(lambda x: isinstance(x, str) and len(x) > 0)]
+    if exclude:
+        pairs = pairs[~pairs[column].isin(exclude)]
+    return pairs[date_col].to_numpy(), pairs[column].to_numpy()
+
+
+def build_count_matrix(df, columns, date_col='analysis_date', exclude=None):
+    """
+    여러 리스트 컬럼을 한 번에 (엔티티 × 날짜) 행렬로 만듭니다.
+
+    columns: {엔티티 종류: 컬럼명} 예) {"keywords": "analysis_keywords", "orgs": "analysis_orgs"}
+    exclude: {엔티티 종류: 제외할 이름 집합} (선택)
+    """
+    exclude = exclude or {}
+    day_parts, term_parts, type_parts = [], [], []
+    for entity_type, column in columns.items():
+        if column not in df.columns:
+            continue
+        days, terms = _explode_column(df, column, date_col, exclude.get(entity_type))
+        day_parts.append(days)
+        term_parts.append(terms)
+        type_parts.append(np.full(len(terms), entity_type, dtype=object))
+
+    if not day_parts or not sum(len(d) for d in day_parts):
+        empty = np.array([], dtype=object)
+        return CountMatrix(empty, empty, empty, np.zeros((0, 0), dtype=np.int32))
+
+    days = np.concatenate(day_parts)
+    terms = np.concatenate(term_parts)
+    types = np.concatenate(type_parts)
+
+    # (종류, 이름) 쌍을 정수 코드 하나로 만들어 행 번호를 매깁니다.
+    type_codes, type_uniques = pd.factorize(types)
+    term_codes, term_uniques = pd.factorize(terms)
+    n_unique_terms = max(len(term_uniques), 1)
+    row_codes, pair_uniques = pd.factorize(type_codes.astype(np.int64) * n_unique_terms + term_codes)
+    day_ts = pd.to_datetime(pd.Series(days))
+    first_day = day_ts.min().normalize()
+    day_codes = (day_ts - first_day).dt.days.to_numpy()
+    n_days = int(day_codes.max()) + 1
+    n_terms = len(pair_uniques)
+
+    flat = np.bincount(row_codes * n_days + day_codes, minlength=n_terms * n_days)
+    counts = flat.reshape(n_terms, n_days).astype(np.int32)
+    all_days = np.array([(first_day + pd.Timedelta(days=i)).date() for i in range(n_days)], dtype=object)
+    return CountMatrix(
+        terms=np.asarray(term_uniques, dtype=object)[pair_uniques % n_unique_terms],
+        entity_types=np.asarray(type_uniques, dtype=object)[pair_uniques // n_unique_terms],
+        days=all_days,
+        counts=counts,
+    )
+
+
+def compute_momentum(matrix, as_of=None, recent_days=7, prev_days=7, baseline_days=28,
+                     min_count=3, smoothing=1.0):
+    """
+    모든 엔티티의 모멘텀 지표를 한 번에 계산합니다.
+
+    기간 정의는 기존 코드와 같습니다.
+      - 최근: as_of - recent_days <= day <= as_of
+      - 직전: as_of - recent_days - prev_days <= day < as_of - recent_days
+      - baseline(z-score 기준): 최근 구간 시작 전 baseline_days 일
+
+    반환 DataFrame 의 `eligible` 은 기존 필터(최근 >= min_count, 최근 > 직전)를 만족하는지 여부입니다.
+    """
+    as_of = as_of or date.today()
+    recent_start = as_of - timedelta(days=recent_days)
+    prev_start = recent_start - timedelta(days=prev_days)
+    base_start = recent_start - timedelta(days=baseline_days)
+    end = as_of + timedelta(days=1)
+
+    counts = matrix.counts.astype(np.float64)
+    recent_mask = matrix.day_mask(recent_start, end)
+    prev_mask = matrix.day_mask(prev_start, recent_start)
+    base_mask = matrix.day_mask(base_start, recent_start)
+
+    recent = counts[:, recent_mask].sum(axis=1)
+    prev = counts[:, prev_mask].sum(axis=1)
+
+    # 행렬에 없는 날짜(수집 공백)도 0건으로 보고 일평균을 구합니다.
+    n_recent = (end - recent_start).days
+    n_prev = max(prev_days, 1)
+    recent_rate = recent / n_recent
+    prev_rate = prev / n_prev
+    growth_pct = ((recent_rate + smoothing) / (prev_rate + smoothing) - 1.0) * 100.0
+
+    n_base = max(baseline_days, 1)
+    base = counts[:, base_mask]
+    base_sum = base.sum(axis=1)
+    base_mean = base_sum / n_base
+    base_var = (np.square(base).sum(axis=1) / n_base) - np.square(base_mean)
+    # 언급이 드문 엔티티는 분산이 0에 가까워 z-score 가 폭주하므로 포아송 분산(평균)과 최소값으로 하한을 둡니다.
+    scale = np.sqrt(np.maximum(base_var, base_mean) + 1.0 / n_base) / np.sqrt(n_recent)
+    zscore = (recent_rate - base_mean) / scale
+
+    result = pd.DataFrame({
+        "entity_type": matrix.entity_types,
+        "term": matrix.terms,
+        "recent": recent.astype(np.int64),
+        "prev": prev.astype(np.int64),
+        "delta": (recent - prev).astype(np.int64),
+        "growth_pct": np.round(growth_pct, 1),
+        "zscore": np.round(zscore, 2),
+    })
+    result["eligible"] = (recent >= min_count) & (recent > prev)
+    return result
+
+
+def top_k_indices(scores, k):
+    """점수 상위 k개의 인덱스를 내림차순으로 돌려줍니다. (argpartition 으로 전체 정렬을 피함)"""
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.array([], dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def top_trending(momentum, k=10, by="delta", eligible_only=True):
+    """
+    엔티티 종류별 상위 k개를 {종류: DataFrame} 으로 돌려줍니다.
+    by: 'delta' / 'growth_pct' / 'zscore' / 'recent'
+    """
+    if by not in SCORE_COLUMNS:
+        raise ValueError(f"지원하지 않는 정렬 기준입니다: {by}")
+    out = {}
+    types = momentum["entity_type"].to_numpy()
+    scores = momentum[by].to_numpy(dtype=np.float64)
+    mask_all = momentum["eligible"].to_numpy() if eligible_only else np.ones(len(momentum), dtype=bool)
+    for entity_type in pd.unique(types):
+        rows = np.flatnonzero((types == entity_type) & mask_all)
+        picked = rows[top_k_indices(scores[rows], k)]
+        out[entity_type] = momentum.iloc[picked].reset_index(drop=True)
+    return out
+
+
+def trending_from_frame(df, columns, k=10, by="delta", date_col='analysis_date', exclude=None, **kwargs):
+    """build_count_matrix → compute_momentum → top_trending 을 한 번에 수행합니다."""
+    matrix = build_count_matrix(df, columns, date_col=date_col, exclude=exclude)
+    momentum = compute_momentum(matrix, **kwargs)
+    return top_trending(momentum, k=k, by=by)
@@ -0,0 +1,36 @@
+# backend/stock_crawl/paths.py
+# -*- coding: utf-8 -*-
+"""
+저장소 기준 경로 모음입니다. 스크립트를 어느 위치에서 실행하든 같은 파일을 가리키도록
+이 파일의 위치(backend/stock_crawl)를 기준으로 경로를 계산합니다.
+"""
+import os
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(PACKAGE_DIR)
+REPO_ROOT = os.path.dirname(BACKEND_DIR)
+DASHBOARD_DIR = os.path.join(REPO_ROOT, "dashboard")
+DATA_DIR = os.path.join(PACKAGE_DIR, "data")
+
+# --- 종목 리스트 (대시보드와 공용) ---
+KOSPI_TXT = os.path.join(DASHBOARD_DIR, "코스피.txt")
+KOSDAQ_TXT = os.path.join(DASHBOARD_DIR, "코스닥.txt")
+STOCK_LIST_FILES = (KOSPI_TXT, KOSDAQ_TXT)
+ENTITY_ALIASES_TSV = os.path.join(DATA_DIR, "entity_aliases.tsv")
+
+# --- 산출물 폴더 ---
+OUTPUT_DIR = os.path.join(BACKEND_DIR, "output")
+INTERMEDIATE_DIR = os.path.join(OUTPUT_DIR, "intermediate")
+AGGREGATED_DIR = os.path.join(OUTPUT_DIR, "aggregated")
+MERGED_CSV = os.path.join(OUTPUT_DIR, "merged_no_duplicate.csv")
+AI_PACKAGE_JSON = os.path.join(OUTPUT_DIR, "ai_daily_package.json")
+# AI 일일 패키지 증분 상태: 발행일별 카운터 + 상위 기사 힙 (stock_crawl.daily_package)
+PACKAGE_STATE_JSON = os.path.join(OUTPUT_DIR, "package_state.json")
+# 검색 키워드 목록과 일별 키워드 집계 (stock_crawl.keywords)
+KEYWORD_STORE_JSON = os.path.join(OUTPUT_DIR, "keyword_store.json")
+# Gemini 전 관련도 판별 모델 (stock_crawl.relevance)
+RELEVANCE_MODEL_NPZ = os.path.join(OUTPUT_DIR, "relevance_model.npz")
+# 기사/분석 결과/엔티티 언급 SQLite 창고 (stock_crawl.warehouse)
+WAREHOUSE_DB = os.path.join(OUTPUT_DIR, "warehouse.sqlite")
+# 종목 리스트 + 별칭을 컴파일한 mmap 사전 (stock_crawl.stock_dict, 원본 해시가 바뀌면 다시 만듦)
+STOCK_DICT_BIN = os.path.join(OUTPUT_DIR, "stock_dict.bin")
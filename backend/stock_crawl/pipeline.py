@@ -0,0 +1,63 @@
+# backend/stock_crawl/pipeline.py
+# -*- coding: utf-8 -*-
+"""
+수집 → 본문 추출 → AI 분석 → 저장 엔진입니다.
+
+GitHub Actions(run_pipeline.py), 로컬 이어하기(run_pipeline_local.py), AI 분석만(run_ai_only.py),
+cli.py, backfill.py 가 같은 단계 함수를 쓰고, 스크립트별 차이(배치 크기, 수집 기간/페이지, 저장 기간)는
+PipelineConfig 로만 정합니다. Gemini 모델은 엔진이 들고 있다가 Gemini 를 쓰는 분석 직전에 한 번만 초기화합니다.
+
+    pipeline = NewsPipeline(PipelineConfig.from_env(batch_size=5))
+    articles = pipeline.crawl(keywords, set())
+    pipeline.extract(articles)
+    pipeline.analyze(articles)
+    pipeline.save(articles, output_dir)
+"""
+from stock_crawl.analysis import build_analyzer_router, create_gemini_model, prompt_compactor
+from stock_crawl.analyzers import analyze_articles
+from stock_crawl.crawl import crawl_naver_news, create_scheduler
+from stock_crawl.extract import extract_articles
+from stock_crawl.storage import aggregate_and_save_to_csv
+
+_DEFAULT = object()
+
+
+class NewsPipeline:
+    """PipelineConfig 하나로 설정되는 단계 모음 (Gemini 모델 상태 포함)"""
+
+    def __init__(self, config, gemini_model=None):
+        self.config = config
+        self.gemini_model = gemini_model
+
+    def ensure_gemini(self):
+        """Gemini 를 쓰는 설정이면 모델을 (한 번만) 초기화합니다. API 키가 없으면 ValueError."""
+        if self.config.needs_gemini() and self.gemini_model is None:
+            self.gemini_model = create_gemini_model(self.config)
+        return self.gemini_model
+
+    def create_scheduler(self, output_dir):
+        return create_scheduler(output_dir, self.config)
+
+    def crawl(self, keywords, existing_urls, scheduler=None):
+        return crawl_naver_news(keywords, existing_urls, self.config, scheduler)
+
+    def extract(self, articles, progress=False):
+        return extract_articles(articles, self.config, progress)
+
+    def compact_for_prompt(self, text):
+        return prompt_compactor(self.config)(text)
+
+    def analyze(self, articles):
+        """기사 목록을 분석 백엔드(기본 Gemini)로 분석하고 구조화된 데이터를 추가합니다."""
+        self.ensure_gemini()
+        print("\n--- 3단계: AI 구조화 분석 시작 ---")
+        analyze_articles(articles, build_analyzer_router(self.config, self.gemini_model))
+        print("--- ✅ AI 분석 완료 ---")
+        return articles
+
+    def save(self, articles, output_dir, keep_days=_DEFAULT, state_dir=None, warehouse_path=_DEFAULT):
+        """keep_days / warehouse_path 를 주지 않으면 설정값을 씁니다."""
+        keep_days = self.config.keep_days if keep_days is _DEFAULT else keep_days
+        warehouse_path = self.config.warehouse_path if warehouse_path is _DEFAULT else warehouse_path
+        return aggregate_and_save_to_csv(articles, output_dir, keep_days, state_dir, warehouse_path,
+                                         self.config.warehouse_seed_csv)
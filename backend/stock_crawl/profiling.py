@@ -0,0 +1,165 @@
+# backend/stock_crawl/profiling.py
+# -*- coding: utf-8 -*-
+"""
+단계별 cProfile 프로파일링입니다. 꺼져 있을 때는 아무것도 감싸지 않으므로 부담이 없습니다.
+
+켜는 방법 (둘 중 하나)
+- 환경 변수: STOCK_CRAWL_PROFILE=1
+- 실행 인자: python run_pipeline_local.py --profile
+
+결과
+- <출력 폴더>/profiles/<실행 ID>/<실행 ID>_<순번>_<단계>.prof  : snakeviz / pstats 로 열 수 있는 원본
+  실행 ID 는 <실행이름>_<시각>_<pid>(같은 초에 다시 시작하면 _2, _3 ...) 이고 순번은 실행 안에서 구간마다 1씩 늘어나므로, 같은 단계가 한 실행에서
+  여러 번 돌거나 여러 실행(백필 작업 프로세스, 대시보드)이 같은 폴더를 써도 서로 덮어쓰지 않습니다.
+- 같은 폴더의 profile_summary.txt / profile_summary.json : 구간별 상위 N개 함수 (누적/자체 시간)
+
+    run = start_run("local", profile_dir=os.path.join(SCRIPT_DIR, "output", "profiles"))
+    with run.stage("extract"):      # 프로파일링이 켜져 있으면 이 구간이 <dir>/<실행 ID>_001_extract.prof 로 저장됨
+        ...
+
+대시보드처럼 실행 단위가 없는 코드는 @profiled("load_data") 데코레이터를 씁니다.
+"""
+import os
+import io
+import sys
+import json
+import pstats
+import cProfile
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_ENV = "STOCK_CRAWL_PROFILE"
+PROFILE_DIR_ENV = "STOCK_CRAWL_PROFILE_DIR"
+PROFILE_FLAG = "--profile"
+DEFAULT_TOP_N = 25
+SUMMARY_NAME = "profile_summary"
+
+# 한 번에 하나의 cProfile 만 켤 수 있으므로(3.12+), 중첩 구간은 바깥 구간에 합쳐서 기록합니다.
+_ACTIVE = False
+
+
+def profiling_requested(argv=None):
+    """환경 변수나 --profile 인자로 프로파일링이 요청되었는지"""
+    if os.getenv(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on"):
+        return True
+    return PROFILE_FLAG in (sys.argv if argv is None else argv)
+
+
+def _top_functions(stats, sort_key, top_n):
+    rows = []
+    for func, (cc, nc, tt, ct, _callers) in stats.stats.items():
+        filename, line, name = func
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({name})" if line else name,
+            "calls": nc,
+            "tottime": round(tt, 4),
+            "cumtime": round(ct, 4),
+        })
+    rows.sort(key=lambda r: r[sort_key], reverse=True)
+    return rows[:top_n]
+
+
+class StageProfiler:
+    """이름 붙은 구간마다 .prof 파일을 남기고, 마지막에 상위 함수 요약을 씁니다."""
+
+    def __init__(self, output_dir, top_n=DEFAULT_TOP_N, run_id=None):
+        self.output_dir = output_dir
+        self.run_id = run_id or os.path.basename(os.path.normpath(output_dir))
+        self.top_n = top_n
+        self.stages = {}
+        self.seq = 0
+
+    @contextmanager
+    def profile(self, name):
+        global _ACTIVE
+        if _ACTIVE:
+            yield
+            return
+        profiler = cProfile.Profile()
+        _ACTIVE = True
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            _ACTIVE = False
+            self._dump(name, profiler)
+
+    def _dump(self, name, profiler):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.seq += 1
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+        key = f"{self.seq:03d}_{safe}"
+        path = os.path.join(self.output_dir, f"{self.run_id}_{key}.prof")
+        profiler.dump_stats(path)
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        self.stages[key] = {
+            "stage": name,
+            "prof_file": path,
+            "total_seconds": round(stats.total_tt, 4),
+            "top_cumulative": _top_functions(stats, "cumtime", self.top_n),
+            "top_self": _top_functions(stats, "tottime", self.top_n),
+        }
+
+    def write_summary(self):
+        """단계별 상위 함수 표를 텍스트/JSON 으로 저장하고 텍스트 경로를 돌려줍니다."""
+        if not self.stages:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, f"{SUMMARY_NAME}.json"), "w", encoding="utf-8") as f:
+            json.dump(self.stages, f, ensure_ascii=False, indent=2)
+
+        lines = []
+        for name, info in self.stages.items():
+            lines.append(f"=== {name} ({info['total_seconds']:.2f}s) — {info['prof_file']}")
+            lines.append(f"{'self(s)':>9} {'cum(s)':>9} {'calls':>9}  function  [자체 시간 상위]")
+            for row in info["top_self"]:
+                lines.append(f"{row['tottime']:>9.3f} {row['cumtime']:>9.3f} {row['calls']:>9}  {row['function']}")
+            lines.append("")
+        path = os.path.join(self.output_dir, f"{SUMMARY_NAME}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        print(f"🔬 프로파일 저장: {self.output_dir} (요약: {SUMMARY_NAME}.txt)")
+        return path
+
+
+def create_profiler(base_dir, run_name, argv=None):
+    """프로파일링이 요청된 경우에만 <base_dir>/<실행 ID> 폴더의 StageProfiler 를 만듭니다. (실행 ID: <run_name>_<시각>_<pid>)"""
+    if not profiling_requested(argv):
+        return None
+    base_dir = os.getenv(PROFILE_DIR_ENV) or base_dir
+    run_id = base_id = f"{run_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+    n = 1
+    while os.path.exists(os.path.join(base_dir, run_id)):  # 같은 프로세스가 같은 초에 다시 시작한 실행
+        n += 1
+        run_id = f"{base_id}_{n}"
+    os.makedirs(os.path.join(base_dir, run_id))
+    return StageProfiler(os.path.join(base_dir, run_id), run_id=run_id)
+
+
+_DEFAULT_PROFILER = None
+
+
+def profiled(name, base_dir=None):
+    """
+    함수 호출을 name 구간으로 프로파일링하는 데코레이터입니다.
+    프로파일링이 꺼져 있으면 원래 함수를 그대로 돌려줍니다. (호출 부담 없음)
+    st.cache_data 아래에 붙이면 캐시가 비었을 때의 실제 계산만 기록됩니다.
+    """
+    def decorator(fn):
+        if not profiling_requested():
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            global _DEFAULT_PROFILER
+            if _DEFAULT_PROFILER is None:
+                from stock_crawl.paths import OUTPUT_DIR
+                _DEFAULT_PROFILER = create_profiler(base_dir or os.path.join(OUTPUT_DIR, "profiles"), "dashboard")
+            with _DEFAULT_PROFILER.profile(name):
+                result = fn(*args, **kwargs)
+            _DEFAULT_PROFILER.write_summary()
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,319 @@
+# backend/stock_crawl/records.py
+# -*- coding: utf-8 -*-
+"""
+수집 → 본문 추출 → AI 분석 → 저장 단계가 주고받는 기사 레코드입니다.
+
+기존에는 기사 하나가 dict 였고, 본문(content)이 분석용 사본(content_to_analyze)으로 한 번 더 복사되고
+단계 사이에서 DataFrame ↔ to_dict('records') 변환이 반복되어 본문이 메모리에 여러 벌 올라갔습니다.
+
+- Article: __slots__ 레코드. dict 처럼 article['url'], .get(), .update() 를 그대로 쓸 수 있어
+  기존 단계 코드를 거의 바꾸지 않습니다. 반복되는 짧은 값(search_keyword, published_at)은 intern 합니다.
+- BodyStore: 추출이 끝난 긴 본문은 임시 파일에 이어 쓰고 레코드에는 (offset, length) 만 둡니다.
+  본문은 AI 프롬프트를 만들 때와 저장할 때만 다시 읽습니다.
+- articles_to_frame / articles_from_frame: 레코드 목록 ↔ DataFrame 을 행 dict 없이 컬럼 단위로 변환합니다.
+- iter_csv_chunks / iter_articles: 큰 중간 CSV 를 청크 단위(명시적 dtype)로 읽는 제너레이터.
+- url_hash / publish_day / iter_fields: 누적 상태 파일들(키워드 저장소, 패키지 상태, 클러스터 상태)이 함께 쓰는
+  기사 URL 해시와 발행일 해석, DataFrame/레코드 공통 컬럼 읽기.
+
+단계들은 같은 Article 객체 목록을 그대로 넘기고 제자리에서 채웁니다. (사본을 만들지 않음)
+"""
+import os
+import sys
+import zlib
+import tempfile
+import threading
+from datetime import date, datetime
+
+FIELDS = (
+    "search_keyword", "url", "title", "summary", "crawled_at", "published_at", "content",
+    "analysis_keywords", "analysis_orgs", "summary_ai", "sentiment_label",
+)
+# 같은 값이 수천 번 반복되는 필드
+INTERNED_FIELDS = ("search_keyword", "published_at", "sentiment_label")
+FAILED_PREFIXES = ("[실패]", "[오류]")
+# 이보다 짧은 본문(실패 메시지 등)은 파일로 내보내지 않고 레코드에 그대로 둡니다.
+DEFAULT_SPILL_THRESHOLD = 512
+
+
+class BodyRef:
+    """BodyStore 안의 본문 위치"""
+    __slots__ = ("offset", "length")
+
+    def __init__(self, offset, length):
+        self.offset = offset
+        self.length = length
+
+
+class BodyStore:
+    """
+    본문을 추가 전용 임시 파일(UTF-8)에 저장합니다. path 를 주지 않으면 프로세스 종료 시 지워지는
+    익명 임시 파일을 씁니다. deepcopy/copy 는 같은 저장소를 공유합니다.
+    """
+
+    def __init__(self, path=None, spill_threshold=DEFAULT_SPILL_THRESHOLD):
+        self.spill_threshold = spill_threshold
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(path, "w+b")
+        else:
+            self._file = tempfile.TemporaryFile(prefix="stock_crawl_bodies_")
+        self._size = 0
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def put(self, text):
+        """본문을 저장하고 참조를 돌려줍니다. 짧은 문자열은 그대로 돌려줍니다."""
+        if not isinstance(text, str) or len(text) < self.spill_threshold:
+            return text
+        data = text.encode("utf-8")
+        with self._lock:
+            self._file.seek(self._size)
+            self._file.write(data)
+            ref = BodyRef(self._size, len(data))
+            self._size += len(data)
+            self.count += 1
+        return ref
+
+    def get(self, ref):
+        if not isinstance(ref, BodyRef):
+            return ref
+        with self._lock:
+            self._file.seek(ref.offset)
+            return self._file.read(ref.length).decode("utf-8")
+
+    @property
+    def size_bytes(self):
+        return self._size
+
+    def close(self):
+        self._file.close()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+_default_store = None
+
+
+def default_body_store():
+    """프로세스 공용 BodyStore (처음 쓸 때 만듦)"""
+    global _default_store
+    if _default_store is None:
+        _default_store = BodyStore()
+    return _default_store
+
+
+class Article:
+    """
+    기사 한 건. FIELDS 밖의 키(클러스터 컬럼 등)는 extra dict 에 둡니다.
+    content 는 store 가 있으면 저장 시점에 파일로 내보내고, 읽을 때 다시 불러옵니다.
+    """
+    __slots__ = FIELDS[:6] + ("_content", "analysis_keywords", "analysis_orgs", "summary_ai",
+                              "sentiment_label", "store", "extra")
+
+    def __init__(self, store=None, **values):
+        for name in FIELDS:
+            object.__setattr__(self, "_content" if name == "content" else name, None)
+        self.store = store
+        self.extra = None
+        self.update(values)
+
+    # ---------------- 본문 ----------------
+    @property
+    def content(self):
+        value = self._content
+        return self.store.get(value) if isinstance(value, BodyRef) else value
+
+    @content.setter
+    def content(self, text):
+        self._content = self.store.put(text) if self.store is not None else text
+
+    # ---------------- dict 호환 ----------------
+    def _set(self, key, value):
+        if key in FIELDS:
+            if key in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __getitem__(self, key):
+        if key in FIELDS:
+            value = getattr(self, key)
+            if value is None and key != "content":
+                raise KeyError(key)
+            return value
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        self._set(key, value)
+
+    def __contains__(self, key):
+        if key in FIELDS:
+            return getattr(self, "_content" if key == "content" else key) is not None
+        return self.extra is not None and key in self.extra
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def update(self, values=(), **kwargs):
+        items = values.items() if hasattr(values, "items") else values
+        for key, value in items:
+            self._set(key, value)
+        for key, value in kwargs.items():
+            self._set(key, value)
+
+    def pop(self, key, default=None):
+        if key in FIELDS:
+            value = self.get(key, default)
+            setattr(self, key, None)
+            return value
+        if self.extra is None:
+            return default
+        return self.extra.pop(key, default)
+
+    def keys(self):
+        keys = [k for k in FIELDS if k in self]
+        return keys + list(self.extra or ())
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def to_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self):
+        return f"Article(url={self.url!r}, title={self.title!r})"
+
+
+def has_body(article):
+    """추출에 성공한 본문이 있는지. Article/dict 모두 받습니다."""
+    text = article.get("content", "")
+    return isinstance(text, str) and bool(text) and not text.startswith(FAILED_PREFIXES)
+
+
+def analysis_text(article):
+    """AI 분석에 넣을 글: 본문이 없거나 추출에 실패했으면 요약(summary). Article/dict 모두 받습니다."""
+    text = article.get("content", "") if has_body(article) else article.get("summary", "")
+    return text if isinstance(text, str) else ""
+
+
+def frame_columns(articles):
+    """레코드 목록의 컬럼 이름. 기존 pd.DataFrame(list_of_dicts) 와 같게 첫 등장 순서를 따릅니다."""
+    columns = []
+    seen = set()
+    for article in articles:
+        for key in article.keys():
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+    return columns
+
+
+def articles_to_frame(articles, include_content=True):
+    """
+    레코드 목록 → DataFrame. 행 dict 를 만들지 않고 컬럼 단위로 채웁니다.
+    dict 기사도 받습니다. 컬럼 순서는 frame_columns 를 따르고, include_content=False 이면 본문을 읽지 않습니다.
+    """
+    import pandas as pd
+
+    columns = [col for col in frame_columns(articles) if include_content or col != "content"]
+    data = {col: [article.get(col) for article in articles] for col in columns}
+    return pd.DataFrame(data, columns=columns)
+
+
+def url_hash(url):
+    """기사 URL → 64비트 해시 (crc32 | adler32 << 32). 상태 파일에 저장되므로 바꾸면 기존 상태와 맞지 않습니다."""
+    data = str(url).encode("utf-8")
+    return zlib.crc32(data) | (zlib.adler32(data) << 32)
+
+
+def publish_day(value):
+    """'2025-07-31', '2025-07-31 09:00:00', ISO 시각, datetime/date → 'YYYY-MM-DD' (해석 불가면 None)"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value or "").strip()[:10]
+    try:
+        return date.fromisoformat(text).isoformat()
+    except ValueError:
+        return None
+
+
+def iter_fields(articles, columns):
+    """DataFrame 또는 기사 레코드(Article/dict) 목록 → columns 순서의 튜플 (없는 컬럼은 None)"""
+    if hasattr(articles, "itertuples"):
+        positions = [articles.columns.get_loc(c) if c in articles.columns else None for c in columns]
+        for row in articles.itertuples(index=False, name=None):
+            yield tuple(None if i is None else row[i] for i in positions)
+    else:
+        for article in articles:
+            yield tuple(article.get(c) for c in columns)
+
+
+def articles_from_frame(df, store=None):
+    """DataFrame → Article 목록. 본문은 store 로 바로 내보내 DataFrame 과 중복 보관하지 않습니다."""
+    store = store if store is not None else default_body_store()
+    columns = list(df.columns)
+    articles = []
+    for row in df.itertuples(index=False, name=None):
+        article = Article(store=store)
+        for key, value in zip(columns, row):
+            if value is None or value != value:  # NaN
+                value = ""
+            article[key] = value
+        articles.append(article)
+    return articles
+
+
+# ==============================================================================
+# 큰 CSV 를 청크 단위로 읽기
+# ==============================================================================
+DEFAULT_CHUNK_ROWS = 2000
+
+
+def csv_header(path, encoding="utf-8-sig"):
+    """CSV 첫 줄(컬럼 이름)만 읽습니다."""
+    import csv
+    with open(path, encoding=encoding, newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def iter_csv_chunks(path, usecols=None, chunksize=DEFAULT_CHUNK_ROWS, dtype=str, keep_default_na=False,
+                    encoding="utf-8-sig"):
+    """
+    CSV 를 chunksize 행씩 DataFrame 으로 돌려주는 제너레이터입니다.
+    기사 CSV 는 모두 문자열 컬럼이므로 dtype 을 명시해 타입 추론을 건너뜁니다. (dict 로 컬럼별 지정도 가능)
+    usecols 중 파일에 없는 컬럼은 조용히 빠집니다. (utf-8-sig 는 BOM 이 없는 utf-8 파일도 그대로 읽음)
+    """
+    import pandas as pd
+
+    header = csv_header(path, encoding)
+    if usecols is not None:
+        usecols = [c for c in usecols if c in header]
+    if isinstance(dtype, dict):
+        dtype = {c: t for c, t in dtype.items() if c in header}
+    reader = pd.read_csv(path, usecols=usecols, dtype=dtype, keep_default_na=keep_default_na,
+                         encoding=encoding, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_articles(path, chunksize=DEFAULT_CHUNK_ROWS, store=None):
+    """기사 CSV → Article 을 한 건씩. 청크 하나만 메모리에 두고, 본문은 바로 BodyStore 로 내보냅니다."""
+    for chunk in iter_csv_chunks(path, chunksize=chunksize):
+        yield from articles_from_frame(chunk, store)
+
@@ -0,0 +1,221 @@
+# backend/stock_crawl/relevance.py
+# -*- coding: utf-8 -*-
+"""
+Gemini 로 보내기 전에 기사가 시장 뉴스(종목/증시/거시)인지 가늠하는 로컬 관련도 점수입니다.
+
+"환율", "바이오" 처럼 넓은 키워드로 수집한 기사 중에는 시장과 상관없는 기사가 섞이는데,
+이런 기사까지 전부 Gemini 배치로 보내지 않도록 분석 라우터(stock_crawl.analyzers)의 규칙으로 씁니다.
+
+점수 (0~1, 셋 중 가장 큰 값):
+  - 종목명: 제목/요약에 종목(코스피·코스닥 목록 + 별칭)이 나오면 1.0, 본문 앞부분에만 나오면 0.8
+  - 시장 용어: 제목/요약/본문 앞부분의 시장 용어 수 / LEXICON_SATURATION
+  - 학습 모델(선택): 제목의 해싱 n-gram 로지스틱 회귀 확률. merged_no_duplicate.csv 의 과거 Gemini 결과로
+    "상장 종목이 기관으로 잡혔거나 키워드에 시장 용어가 있는 기사"를 양성으로 학습합니다. (train_relevance_model)
+threshold 미만인 기사는 fallback 백엔드(기본 lexicon)로 보내 로컬에서 분석하고, 나머지는 점수 높은 순으로 배치합니다.
+기사를 버리지 않으므로 저장/대시보드에는 그대로 남습니다.
+"""
+import os
+import re
+import math
+import zlib
+import random
+from datetime import datetime
+
+from stock_crawl.analyzers import tokenize, resolve_stock_tokens
+from stock_crawl.metrics import current_run
+from stock_crawl.paths import MERGED_CSV, RELEVANCE_MODEL_NPZ
+from stock_crawl.records import analysis_text
+
+RELEVANCE_THRESHOLD = 0.3
+LEXICON_SATURATION = 3      # 시장 용어가 이만큼 나오면 1.0
+BODY_STOCK_SCORE = 0.8      # 종목명이 본문 앞부분에만 나올 때
+BODY_HEAD_CHARS = 1500      # 본문은 앞부분만 봅니다
+
+# 시장 용어 (부분 문자열로 셉니다)
+MARKET_TERMS = [
+    "주가", "주식", "증시", "증권", "코스피", "코스닥", "나스닥", "뉴욕증시", "다우", "S&P", "상장", "공모주",
+    "시가총액", "시총", "목표주가", "투자의견", "실적", "영업이익", "매출", "순이익", "배당", "자사주", "주주",
+    "밸류업", "순매수", "순매도", "외국인", "개인투자자", "ETF", "펀드", "상한가", "하한가", "금리", "기준금리",
+    "환율", "연준", "FOMC", "채권", "국채", "인플레이션", "물가", "관세", "수출", "투자자", "거래대금", "공매도",
+]
+
+MODEL_HASH_BITS = 18
+MODEL_L2 = 1.0
+MODEL_MAX_ITER = 300
+HOLDOUT_RATIO = 0.2
+HOLDOUT_SEED = 20250801
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + math.exp(-z)) if z >= 0 else math.exp(z) / (1.0 + math.exp(z))
+
+
+def model_features(text, hash_bits=MODEL_HASH_BITS):
+    """토큰 1·2-gram + 토큰 안 문자 2-gram 을 해싱한 특징 인덱스 (중복 없음, 이진 특징)"""
+    tokens = tokenize(text.lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    grams += [f"#{t[i:i + 2]}" for t in tokens for i in range(len(t) - 1)]
+    mask = (1 << hash_bits) - 1
+    return sorted({zlib.crc32(g.encode("utf-8")) & mask for g in grams})
+
+
+class RelevanceModel:
+    """해싱 n-gram 로지스틱 회귀 (제목 → 시장 뉴스 확률)"""
+
+    def __init__(self, weights, bias, hash_bits=MODEL_HASH_BITS, meta=None):
+        self.weights = weights
+        self.bias = float(bias)
+        self.hash_bits = hash_bits
+        self.meta = meta or {}
+
+    def predict(self, text):
+        idx = model_features(text, self.hash_bits)
+        return _sigmoid(self.bias + (float(self.weights[idx].sum()) if idx else 0.0))
+
+    @classmethod
+    def fit(cls, texts, labels, hash_bits=MODEL_HASH_BITS, l2=MODEL_L2, max_iter=MODEL_MAX_ITER):
+        """L2 정규화 로지스틱 손실을 L-BFGS 로 최소화합니다."""
+        import numpy as np
+        from scipy import sparse
+        from scipy.optimize import minimize
+
+        rows, cols = [], []
+        for i, text in enumerate(texts):
+            idx = model_features(text, hash_bits)
+            rows += [i] * len(idx)
+            cols += idx
+        X = sparse.csr_matrix((np.ones(len(cols), dtype=np.float64), (rows, cols)),
+                              shape=(len(texts), 1 << hash_bits))
+        y = np.asarray(labels, dtype=np.float64)
+        n = max(1, len(y))
+
+        def loss_and_grad(params):
+            w, b = params[:-1], params[-1]
+            z = X @ w + b
+            # log(1 + e^z) - y·z (수치 안정형)
+            loss = (np.logaddexp(0, z) - y * z).sum() / n + l2 * (w @ w) / (2 * n)
+            err = (1.0 / (1.0 + np.exp(-z)) - y) / n
+            grad = np.empty_like(params)
+            grad[:-1] = X.T @ err + l2 * w / n
+            grad[-1] = err.sum()
+            return loss, grad
+
+        result = minimize(loss_and_grad, np.zeros(X.shape[1] + 1), jac=True, method="L-BFGS-B",
+                          options={"maxiter": max_iter})
+        return cls(result.x[:-1].astype(np.float32), result.x[-1], hash_bits,
+                   meta={"rows": len(texts), "positive_ratio": round(float(y.mean()), 4) if len(y) else 0.0,
+                         "iterations": int(result.nit)})
+
+    def save(self, path=RELEVANCE_MODEL_NPZ):
+        import numpy as np
+        import json
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, weights=self.weights, bias=np.float64(self.bias),
+                            hash_bits=np.int64(self.hash_bits), meta=json.dumps(self.meta, ensure_ascii=False))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=RELEVANCE_MODEL_NPZ):
+        """저장된 모델. 파일이 없거나 읽을 수 없으면 None (용어/종목 점수만 사용)"""
+        if not os.path.exists(path):
+            return None
+        import json
+        import numpy as np
+
+        try:
+            with np.load(path) as data:
+                return cls(data["weights"], float(data["bias"]), int(data["hash_bits"]), json.loads(str(data["meta"])))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  ⚠️ 관련도 모델을 읽지 못했습니다({path}): {e}")
+            return None
+
+
+class RelevanceScorer:
+    """기사 → 관련도 점수. 라우터 규칙(rule)과 배치 우선순위(priority)로 씁니다."""
+
+    def __init__(self, normalizer=None, model=None, threshold=RELEVANCE_THRESHOLD):
+        if normalizer is None:
+            from stock_crawl.entities import get_default_normalizer
+            normalizer = get_default_normalizer()
+        self.normalizer = normalizer
+        self.model = model
+        self.threshold = threshold
+        self._market_re = re.compile("|".join(map(re.escape, MARKET_TERMS)))
+        self._resolved = {}
+        self._scores = {}  # id(기사) → 점수 (한 번의 분석 호출 동안만 사용)
+
+    def score(self, article):
+        title, summary = article.get("title", "") or "", article.get("summary", "") or ""
+        head = f"{title} {summary}"
+        if resolve_stock_tokens(tokenize(head), self.normalizer, self._resolved):
+            return 1.0
+        body = analysis_text(article)[:BODY_HEAD_CHARS]
+        score = min(1.0, len(self._market_re.findall(f"{head} {body}")) / LEXICON_SATURATION)
+        if score < BODY_STOCK_SCORE and resolve_stock_tokens(tokenize(body), self.normalizer, self._resolved):
+            score = BODY_STOCK_SCORE
+        if self.model is not None and score < 1.0:
+            score = max(score, self.model.predict(title))
+        return round(score, 4)
+
+    def rule(self, fallback):
+        """threshold 미만 기사는 fallback 백엔드로 보내는 라우터 규칙"""
+        def route(article):
+            score = self._scores[id(article)] = self.score(article)
+            if score < self.threshold:
+                current_run().incr("relevance_low")
+                return fallback
+            return None
+        return route
+
+    def priority(self, article):
+        score = self._scores.get(id(article))
+        return self.score(article) if score is None else score
+
+
+def market_label(orgs, keywords, normalizer, market_re):
+    """학습 라벨: 상장 종목이 기관으로 잡혔거나 키워드에 시장 용어가 있으면 1"""
+    if any(normalizer.resolve(o) for o in orgs):
+        return 1
+    return int(any(market_re.search(k) for k in keywords))
+
+
+def train_relevance_model(path=MERGED_CSV, model_path=RELEVANCE_MODEL_NPZ):
+    """과거 Gemini 분석 결과(병합본)로 제목 → 시장 뉴스 모델을 학습해 저장하고 돌려줍니다. (학습 요약은 model.meta)"""
+    from stock_crawl.artifacts import to_str_list
+    from stock_crawl.entities import get_default_normalizer
+    from stock_crawl.records import iter_csv_chunks
+
+    normalizer = get_default_normalizer()
+    market_re = re.compile("|".join(map(re.escape, MARKET_TERMS)))
+    texts, labels = [], []
+    for chunk in iter_csv_chunks(path, usecols=["title", "analysis_orgs", "analysis_keywords"]):
+        for title, orgs, keywords in zip(chunk["title"], chunk["analysis_orgs"], chunk["analysis_keywords"]):
+            if title:
+                texts.append(title)
+                labels.append(market_label(to_str_list(orgs), to_str_list(keywords), normalizer, market_re))
+    if not texts or len(set(labels)) < 2:
+        print("  ⚠️ 학습할 기사가 없거나 라벨이 한쪽뿐이라 관련도 모델을 만들지 않습니다.")
+        return None
+
+    # 홀드아웃으로 성능을 확인한 뒤 전체로 다시 학습합니다.
+    order = list(range(len(texts)))
+    random.Random(HOLDOUT_SEED).shuffle(order)
+    cut = int(len(order) * (1 - HOLDOUT_RATIO))
+    train, test = order[:cut], order[cut:]
+    model = RelevanceModel.fit([texts[i] for i in train], [labels[i] for i in train])
+    hits = [(model.predict(texts[i]) >= RELEVANCE_THRESHOLD, labels[i]) for i in test]
+    positives = [pred for pred, label in hits if label]
+    holdout = {
+        "rows": len(test),
+        "accuracy": round(sum(pred == bool(label) for pred, label in hits) / max(1, len(hits)), 4),
+        "positive_recall": round(sum(positives) / max(1, len(positives)), 4),
+    }
+
+    model = RelevanceModel.fit(texts, labels)
+    model.meta.update({"trained_at": datetime.now().isoformat(timespec="seconds"), "holdout": holdout})
+    model.save(model_path)
+    print(f"✅ 관련도 모델 저장: {model_path} ({len(texts)}건, 양성 {model.meta['positive_ratio']:.0%}, "
+          f"홀드아웃 정확도 {holdout['accuracy']:.1%} / 양성 재현율 {holdout['positive_recall']:.1%})")
+    return model
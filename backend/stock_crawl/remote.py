@@ -0,0 +1,108 @@
+# backend/stock_crawl/remote.py
+# -*- coding: utf-8 -*-
+"""
+원격 파일(GitHub Raw 등)을 로컬에 보관하고 ETag / If-None-Match 로 재검증하는 로더입니다.
+
+- 처음 한 번만 전체를 내려받고, 이후에는 조건부 요청만 보냅니다.
+- 서버가 304(Not Modified)를 돌려주면 본문을 받지 않고 로컬 사본을 그대로 사용합니다.
+- 네트워크 오류가 나도 로컬 사본이 있으면 그것을 돌려줍니다.
+
+`url` 은 http://127.0.0.1:PORT/... 같은 로컬 서버 주소여도 동일하게 동작하므로,
+간단한 http.server 스탠드인으로 캐시 동작을 확인할 수 있습니다.
+"""
+import os
+import json
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from urllib.parse import urlparse
+
+import requests
+
+CHUNK_SIZE = 1 << 16
+
+
+@dataclass
+class RemoteFile:
+    """조건부 요청 결과. `version` 은 파싱 결과 캐시 키로 쓰기 좋은 값입니다."""
+    path: str
+    etag: str
+    last_modified: str
+    changed: bool       # 이번 호출에서 새 본문을 내려받았는지 여부
+    from_cache: bool    # 네트워크 없이(304 또는 오류) 로컬 사본을 사용했는지 여부
+
+    @property
+    def version(self):
+        if self.etag or self.last_modified:
+            return f"{self.etag}|{self.last_modified}"
+        # 검증자가 없는 서버라면 파일 수정 시각으로 대신합니다.
+        return str(os.path.getmtime(self.path))
+
+
+def _cache_paths(url, cache_dir):
+    """URL 별 로컬 사본 경로와 메타데이터(JSON) 경로를 돌려줍니다."""
+    suffix = os.path.splitext(urlparse(url).path)[1]
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    body_path = os.path.join(cache_dir, f"{key}{suffix}")
+    return body_path, body_path + ".meta.json"
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def fetch_if_changed(url, cache_dir, session=None, timeout=10):
+    """
+    `url` 을 `cache_dir` 에 보관된 사본과 비교해 바뀐 경우에만 내려받습니다.
+    로컬 사본도 없고 요청도 실패하면 예외를 그대로 올립니다.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    body_path, meta_path = _cache_paths(url, cache_dir)
+    meta = _read_meta(meta_path) if os.path.exists(body_path) else {}
+
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    http = session or requests
+    try:
+        response = http.get(url, headers=headers, timeout=timeout, stream=True)
+        if response.status_code == 304 and meta:
+            response.close()
+            return RemoteFile(body_path, meta.get("etag", ""), meta.get("last_modified", ""),
+                              changed=False, from_cache=True)
+        response.raise_for_status()
+
+        # 임시 파일에 받은 뒤 교체해서, 도중에 실패해도 기존 사본이 깨지지 않도록 합니다.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+            os.replace(tmp_path, body_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "fetched_at": datetime.now().isoformat(),
+        }
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        return RemoteFile(body_path, meta["etag"], meta["last_modified"], changed=True, from_cache=False)
+    except requests.RequestException:
+        if meta:
+            return RemoteFile(body_path, meta.get("etag", ""), meta.get("last_modified", ""),
+                              changed=False, from_cache=True)
+        raise
@@ -0,0 +1,133 @@
+# backend/stock_crawl/scheduler.py
+# -*- coding: utf-8 -*-
+"""
+키워드별 수집 성과(yield)를 실행마다 기록하고, 그 기록으로 다음 실행의 페이지 예산과 수집 주기를 정합니다.
+
+모든 키워드가 매번 같은 페이지 수(최대 10페이지 = start 1000)를 쓰면, 금방 일별 한도를 채우는 키워드와
+중복/기간 밖 기사만 돌려주는 키워드가 같은 API 호출을 씁니다. 여기서는 키워드마다
+  - new_per_page     : 페이지당 새 기사 수 (EWMA)
+  - dup_ratio        : 수집 기간 안 기사 중 이미 본 URL 비율 (EWMA)
+  - saturated_ratio  : 일별 한도를 채운 날짜 비율 (EWMA)
+  - pages_used       : 실제로 쓴 페이지 수 (EWMA, 한도 도달/결과 소진으로 멈춘 지점)
+를 keyword_yield.json 에 남기고,
+  - 페이지 예산: 처음 보는 키워드는 최대치, 나머지는 최소 1페이지 + 페이지당 새 기사가 많은 순으로
+    필요량(pages_used + 1)까지 나눠 줍니다. (page_budget 이 있으면 그 안에서)
+  - 수집 주기: 수율이 괜찮은 키워드는 매 실행 수집하고, 새 기사가 거의 없는 키워드는 연속 횟수만큼 날짜를 건너뜁니다.
+    단, 수집 기간(collection_days)보다 길게 쉬면 그 사이 기사를 놓치므로 collection_days - 1 일이 상한입니다.
+"""
+import os
+import json
+import math
+from dataclasses import dataclass
+from datetime import date
+
+EWMA_ALPHA = 0.3
+LOW_YIELD_NEW_PER_PAGE = 2.0  # 페이지당 새 기사가 이보다 적으면 '저수율'
+DEFAULT_MAX_PAGES = 10        # 네이버 API start 상한(1000) / display(100)
+
+
+@dataclass
+class KeywordPlan:
+    keyword: str
+    pages: int
+    due: bool
+    reason: str
+
+
+def _ewma(old, new, alpha=EWMA_ALPHA):
+    return new if old is None else round((1 - alpha) * old + alpha * new, 4)
+
+
+class KeywordScheduler:
+    """keyword_yield.json 을 읽고 쓰며 키워드별 페이지 예산/주기를 계산합니다."""
+
+    def __init__(self, path, page_budget=None, max_pages=DEFAULT_MAX_PAGES, min_pages=1, collection_days=4):
+        self.path = path
+        self.page_budget = page_budget
+        self.max_pages = max_pages
+        self.min_pages = min_pages
+        self.max_interval = max(1, collection_days - 1)
+        self.stats = self._load()
+        self.plans = {}
+
+    # ---------------- 저장/불러오기 ----------------
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("keywords", {})
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "keywords": self.stats}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    # ---------------- 계획 ----------------
+    def interval_days(self, stat):
+        """수율이 괜찮으면 매 실행(0일), 저수율이면 연속 횟수만큼 (상한 collection_days - 1)"""
+        if stat.get("new_per_page", 0) >= LOW_YIELD_NEW_PER_PAGE:
+            return 0
+        return min(self.max_interval, stat.get("low_yield_streak", 0))
+
+    def demand(self, stat):
+        return max(self.min_pages, min(self.max_pages, math.ceil(stat.get("pages_used", self.max_pages)) + 1))
+
+    def plan(self, keywords, today=None):
+        """{키워드: KeywordPlan}. due=False 인 키워드는 이번 실행에서 건너뜁니다."""
+        today = today or date.today()
+        plans, known = {}, []
+        for kw in keywords:
+            stat = self.stats.get(kw)
+            if stat is None:
+                plans[kw] = KeywordPlan(kw, self.max_pages, True, "처음 수집")
+                continue
+            last = date.fromisoformat(stat["last_crawled"])
+            interval = self.interval_days(stat)
+            if interval and (today - last).days < interval:
+                plans[kw] = KeywordPlan(kw, 0, False, f"저수율 — {interval}일 주기 (마지막 {last})")
+            else:
+                known.append(kw)
+
+        remaining = None
+        if self.page_budget is not None:
+            remaining = self.page_budget - sum(p.pages for p in plans.values())
+            remaining -= self.min_pages * len(known)
+        # 페이지당 새 기사가 많은 키워드부터 필요량만큼 추가 페이지를 나눠 줍니다.
+        for kw in sorted(known, key=lambda k: -self.stats[k].get("new_per_page", 0)):
+            stat = self.stats[kw]
+            extra = self.demand(stat) - self.min_pages
+            if remaining is not None:
+                extra = max(0, min(extra, remaining))
+                remaining -= extra
+            plans[kw] = KeywordPlan(kw, self.min_pages + extra, True,
+                                    f"페이지당 새 기사 {stat.get('new_per_page', 0):.1f}, "
+                                    f"중복 {stat.get('dup_ratio', 0):.0%}, 한도 도달 {stat.get('saturated_ratio', 0):.0%}")
+        self.plans = {kw: plans[kw] for kw in keywords}
+        return self.plans
+
+    # ---------------- 기록 ----------------
+    def record(self, keyword, pages, new, duplicates, saturated_days, target_days, today=None):
+        """한 키워드의 이번 실행 결과를 누적합니다. (pages=0 이면 건너뛴 실행이므로 기록하지 않음)"""
+        if pages <= 0:
+            return
+        stat = self.stats.setdefault(keyword, {"runs": 0, "low_yield_streak": 0})
+        new_per_page = new / pages
+        stat["runs"] += 1
+        stat["last_crawled"] = (today or date.today()).isoformat()
+        stat["new_per_page"] = _ewma(stat.get("new_per_page"), new_per_page)
+        stat["dup_ratio"] = _ewma(stat.get("dup_ratio"), duplicates / max(1, new + duplicates))
+        stat["saturated_ratio"] = _ewma(stat.get("saturated_ratio"), saturated_days / max(1, target_days))
+        stat["pages_used"] = _ewma(stat.get("pages_used"), pages)
+        stat["low_yield_streak"] = stat["low_yield_streak"] + 1 if new_per_page < LOW_YIELD_NEW_PER_PAGE else 0
+        stat["last"] = {"pages": pages, "new": new, "duplicates": duplicates, "saturated_days": saturated_days}
+
+    def summary(self):
+        """실행 리포트용 요약"""
+        return {
+            "planned_pages": sum(p.pages for p in self.plans.values()),
+            "skipped": [p.keyword for p in self.plans.values() if not p.due],
+            "pages": {p.keyword: p.pages for p in self.plans.values() if p.due},
+        }
@@ -0,0 +1,157 @@
+# backend/stock_crawl/sentiment_series.py
+# -*- coding: utf-8 -*-
+"""
+종목별 일별 감성(긍/부/중) 기사 수 저장소입니다. 대시보드의 종목별 감성 추이/드릴다운이 사용합니다.
+
+기사 DataFrame 을 매번 explode + (날짜, 종목, 라벨) groupby 하는 대신,
+  - counts : (종목 × 날짜 × 라벨) int32 밀집 배열  (종목 번호는 종목 리스트 순서, 날짜는 first_day 부터 하루 간격)
+  - cumsum : 날짜 축 누적합 (종목 × (날짜 + 1) × 라벨), cumsum[:, d] = d 일 이전까지의 합
+을 들고 있어서, 임의의 종목 집합/기간 합계가 누적합 두 번 빼기(O(종목 수))로 끝납니다.
+새 기사는 add_frame 으로 더하고, 누적합은 가장 이른 변경 날짜부터만 다시 계산합니다.
+
+    series = SentimentSeries(stock_list)
+    series.add_frame(df)                                   # analysis_date, analysis_orgs, sentiment_label
+    series.range_counts(["삼성전자", "SK하이닉스"], start, end)  # (2, 3) 긍/부/중 합계
+    series.ranking(start, end)                             # 기간 안에 언급된 전 종목 합계/순감성 점수
+"""
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+SENTIMENT_LABELS = ("Positive", "Negative", "Neutral")
+_LABEL_CODES = {label: i for i, label in enumerate(SENTIMENT_LABELS)}
+
+
+def net_score(counts):
+    """(긍정 - 부정) / 전체, 언급이 없으면 0. counts 의 마지막 축은 SENTIMENT_LABELS 순서"""
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum(axis=-1)
+    return np.divide(counts[..., 0] - counts[..., 1], total, out=np.zeros_like(total), where=total > 0)
+
+
+class SentimentSeries:
+    """종목 × 날짜 × 감성 라벨 기사 수와 날짜 축 누적합"""
+
+    def __init__(self, stocks):
+        self.stocks = list(stocks)
+        self.index = {name: i for i, name in enumerate(self.stocks)}
+        self.first_day = None
+        self.counts = np.zeros((len(self.stocks), 0, len(SENTIMENT_LABELS)), dtype=np.int32)
+        self.cumsum = np.zeros((len(self.stocks), 1, len(SENTIMENT_LABELS)), dtype=np.int32)
+
+    @property
+    def n_days(self):
+        return self.counts.shape[1]
+
+    @property
+    def last_day(self):
+        return None if self.first_day is None else self.first_day + timedelta(days=self.n_days - 1)
+
+    def days(self):
+        return [self.first_day + timedelta(days=i) for i in range(self.n_days)]
+
+    # ---------------- 누적 ----------------
+    def _extend(self, first, last):
+        """날짜 축을 [first, last] 를 포함하도록 늘립니다. (앞으로 늘리면 기존 칸을 뒤로 밀기)"""
+        if self.first_day is None:
+            self.first_day = first
+            self.counts = np.zeros((len(self.stocks), (last - first).days + 1, len(SENTIMENT_LABELS)), dtype=np.int32)
+            return
+        before = max(0, (self.first_day - first).days)
+        after = max(0, (last - self.last_day).days)
+        if before or after:
+            self.counts = np.pad(self.counts, ((0, 0), (before, after), (0, 0)))
+            self.first_day -= timedelta(days=before)
+
+    def add_frame(self, df, column='analysis_orgs', date_col='analysis_date'):
+        """
+        기사 DataFrame 의 종목 언급(column 리스트 중 종목 리스트에 있는 이름)을 날짜/감성 라벨별로 더합니다.
+        라벨이 SENTIMENT_LABELS 밖이거나 날짜가 없는 기사는 건너뜁니다. 더한 (기사, 종목) 쌍 수를 돌려줍니다.
+        """
+        if df is None or df.empty or column not in df.columns:
+            return 0
+        pairs = df[[date_col, column, 'sentiment_label']].explode(column)
+        stock_ids = pairs[column].map(self.index)
+        label_ids = pairs['sentiment_label'].map(_LABEL_CODES)
+        days = pd.to_datetime(pairs[date_col], errors='coerce')
+        valid = stock_ids.notna() & label_ids.notna() & days.notna()
+        if not valid.any():
+            return 0
+        days = days[valid].dt.normalize()
+        first, last = days.min().date(), days.max().date()
+        self._extend(first, last)
+
+        # 새 기사가 걸친 날짜 구간만 bincount 해서 더합니다.
+        offset, n_days = (first - self.first_day).days, (last - first).days + 1
+        day_ids = (days - pd.Timestamp(first)).dt.days.to_numpy()
+        flat = ((stock_ids[valid].to_numpy(dtype=np.int64) * n_days + day_ids) * len(SENTIMENT_LABELS)
+                + label_ids[valid].to_numpy(dtype=np.int64))
+        shape = (len(self.stocks), n_days, len(SENTIMENT_LABELS))
+        self.counts[:, offset:offset + n_days] += np.bincount(flat, minlength=np.prod(shape)).reshape(shape).astype(np.int32)
+        self._update_cumsum(offset)
+        return int(valid.sum())
+
+    def _update_cumsum(self, from_day):
+        """from_day 이후 칸의 누적합만 다시 계산합니다. (날짜 축이 늘었으면 전체)"""
+        if self.cumsum.shape[1] != self.n_days + 1:
+            from_day = 0
+            self.cumsum = np.zeros((len(self.stocks), self.n_days + 1, len(SENTIMENT_LABELS)), dtype=np.int32)
+        base = self.cumsum[:, from_day:from_day + 1]
+        self.cumsum[:, from_day + 1:] = base + np.cumsum(self.counts[:, from_day:], axis=1, dtype=np.int32)
+
+    # ---------------- 조회 ----------------
+    def _day_bounds(self, start, end):
+        """[start, end] (date, None 이면 끝까지) → 누적합 인덱스 [lo, hi)"""
+        if self.first_day is None:
+            return 0, 0
+        lo = 0 if start is None else min(max((start - self.first_day).days, 0), self.n_days)
+        hi = self.n_days if end is None else min(max((end - self.first_day).days + 1, 0), self.n_days)
+        return lo, max(lo, hi)
+
+    def ids(self, stocks):
+        """종목명 목록 → 종목 번호 배열 (모르는 이름은 제외)"""
+        return np.array([self.index[s] for s in stocks if s in self.index], dtype=np.int64)
+
+    def range_counts(self, stocks=None, start=None, end=None):
+        """종목별 기간 합계 (len(stocks) × 3, SENTIMENT_LABELS 순서). stocks=None 이면 전 종목"""
+        lo, hi = self._day_bounds(start, end)
+        rows = slice(None) if stocks is None else self.ids(stocks)
+        return self.cumsum[rows, hi] - self.cumsum[rows, lo]
+
+    def rolling(self, stock, window=7, start=None, end=None):
+        """한 종목의 일별 합계와 window 일 이동 합계·순감성 점수 DataFrame (기간 [start, end])"""
+        lo, hi = self._day_bounds(start, end)
+        i = self.index[stock]
+        ends = np.arange(lo + 1, hi + 1)
+        rolled = self.cumsum[i, ends] - self.cumsum[i, np.maximum(ends - window, 0)]
+        daily = self.counts[i, lo:hi]
+        frame = pd.DataFrame(daily, columns=list(SENTIMENT_LABELS))
+        frame.insert(0, 'analysis_date', self.days()[lo:hi])
+        frame[f'{window}일 합계'] = rolled.sum(axis=1)
+        frame[f'{window}일 순감성'] = np.round(net_score(rolled), 3)
+        return frame
+
+    def daily_frame(self, stocks, start=None, end=None):
+        """여러 종목의 (날짜, 종목, 라벨, 건수) 긴 형식 DataFrame (0건 칸 제외, 그래프용)"""
+        lo, hi = self._day_bounds(start, end)
+        ids = self.ids(stocks)
+        block = self.counts[ids, lo:hi]
+        s, d, l = np.nonzero(block)
+        days = np.array(self.days()[lo:hi], dtype=object)
+        return pd.DataFrame({
+            'analysis_date': days[d],
+            'stock_mentions': np.array(self.stocks, dtype=object)[ids[s]],
+            'sentiment_label': np.array(SENTIMENT_LABELS, dtype=object)[l],
+            'count': block[s, d, l],
+        })
+
+    def ranking(self, start=None, end=None):
+        """기간 안에 언급된 전 종목의 라벨별 합계, 전체, 순감성 점수 (전체 내림차순)"""
+        totals = self.range_counts(None, start, end)
+        mentioned = np.flatnonzero(totals.sum(axis=1))
+        table = pd.DataFrame(totals[mentioned], columns=list(SENTIMENT_LABELS))
+        table.insert(0, 'stock', np.array(self.stocks, dtype=object)[mentioned])
+        table['total'] = table[list(SENTIMENT_LABELS)].sum(axis=1)
+        table['net_score'] = np.round(net_score(totals[mentioned]), 3)
+        return table.sort_values(['total', 'stock'], ascending=[False, True], ignore_index=True)
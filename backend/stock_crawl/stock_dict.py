@@ -0,0 +1,234 @@
+# backend/stock_crawl/stock_dict.py
+# -*- coding: utf-8 -*-
+"""
+종목 사전(코스피.txt / 코스닥.txt 종목명 + data/entity_aliases.tsv 별칭 → 정규화 키)을 미리 컴파일한
+바이너리 파일과, 그 파일을 mmap 해서 조회하는 StockDictionary 입니다.
+
+대시보드/파이프라인/백필 작업 프로세스가 각자 종목 리스트를 읽고 별칭 키를 다시 계산하는 대신,
+  - 원본 파일(종목 리스트, 별칭, 키 규칙이 있는 entities.py)의 sha256 을 헤더에 기록한 파일을 한 번 만들고
+  - 이후에는 파일을 mmap 해서 그대로 씁니다. (페이지 캐시를 프로세스/Streamlit 세션이 함께 씀)
+원본이 바뀌면 해시가 달라지므로 다음 로드에서 다시 컴파일합니다. 파일을 쓸 수 없는 환경이면 메모리에서 만든 사본을 씁니다.
+
+파일 형식 (같은 기계에서 만들고 읽는 캐시라 정수는 기본 바이트 순서의 uint32, 섹션은 4바이트 정렬):
+  header        : MAGIC(8) | 원본 해시(32) | n_names, n_keys, n_slots, name_blob_len, key_blob_len (uint32 5개) | 패딩
+  name_offsets  : uint32[n_names + 1]   정식 명칭 (UTF-8 바이트 기준 정렬)
+  name_listed   : uint8[n_names]        1 이면 종목 리스트에 있는 이름 (0 은 별칭 파일에만 있는 정식 명칭)
+  name_blob     : 정식 명칭 UTF-8
+  key_offsets   : uint32[n_keys + 1]    정규화 키 (정렬)
+  key_targets   : uint32[n_keys]        정식 명칭 번호 (AMBIGUOUS: 서로 다른 종목이 같은 키 → 쓰지 않음)
+  slots         : uint32[n_slots]       crc32(키) 선형 탐사 해시 테이블, 값은 키 번호 + 1 (0: 빈 칸)
+  key_blob      : 정규화 키 UTF-8
+"""
+import os
+import sys
+import mmap
+import zlib
+import struct
+import hashlib
+
+from stock_crawl import entities
+from stock_crawl.paths import STOCK_DICT_BIN, STOCK_LIST_FILES, ENTITY_ALIASES_TSV
+
+MAGIC = b"SKDICT01"
+HEADER = struct.Struct("=8s32s5I")
+HEADER_SIZE = 64
+AMBIGUOUS = 0xFFFFFFFF
+
+
+def _align(n):
+    return (n + 3) & ~3
+
+
+def _layout(n_names, n_keys, n_slots, name_blob_len, key_blob_len):
+    """섹션별 (시작, 끝) 위치. 쓰기/읽기가 같은 계산을 씁니다."""
+    sizes = [
+        ("name_offsets", 4 * (n_names + 1)),
+        ("name_listed", n_names),
+        ("name_blob", name_blob_len),
+        ("key_offsets", 4 * (n_keys + 1)),
+        ("key_targets", 4 * n_keys),
+        ("slots", 4 * n_slots),
+        ("key_blob", key_blob_len),
+    ]
+    layout, pos = {}, HEADER_SIZE
+    for name, size in sizes:
+        layout[name] = (pos, pos + size)
+        pos = _align(pos + size)
+    layout["end"] = (pos, pos)
+    return layout
+
+
+def source_digest(stock_files=STOCK_LIST_FILES, alias_file=ENTITY_ALIASES_TSV):
+    """원본 파일 내용(없으면 빈 값)과 키 규칙(entities.py)의 sha256"""
+    h = hashlib.sha256(MAGIC)
+    for path in (*stock_files, alias_file, entities.__file__):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            data = b""
+        h.update(struct.pack("=I", len(data)))
+        h.update(data)
+    return h.digest()
+
+
+def _pack_strings(values):
+    offsets, blob = [0], bytearray()
+    for value in values:
+        blob += value
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def compile_stock_dictionary(stock_files=STOCK_LIST_FILES, alias_file=ENTITY_ALIASES_TSV):
+    """EntityNormalizer 와 같은 규칙(모호한 키 포함)으로 만든 사전 파일 내용(bytes)"""
+    normalizer = entities.EntityNormalizer.from_files(stock_files, alias_file)
+    names = sorted(name.encode("utf-8") for name in normalizer.canonical)
+    name_index = {name.decode("utf-8"): i for i, name in enumerate(names)}
+    entries = sorted((key.encode("utf-8"), canonical) for key, canonical in normalizer.entries())
+    keys = [key for key, _ in entries]
+    targets = [AMBIGUOUS if canonical is None else name_index[canonical] for _, canonical in entries]
+
+    n_slots = 1
+    while n_slots < 2 * len(keys):
+        n_slots <<= 1
+    slots = [0] * n_slots
+    for i, key in enumerate(keys):
+        slot = zlib.crc32(key) & (n_slots - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (n_slots - 1)
+        slots[slot] = i + 1
+
+    name_offsets, name_blob = _pack_strings(names)
+    key_offsets, key_blob = _pack_strings(keys)
+    listed = bytes(1 if name.decode("utf-8") in normalizer.listed else 0 for name in names)
+    layout = _layout(len(names), len(keys), n_slots, len(name_blob), len(key_blob))
+
+    buf = bytearray(layout["end"][0])
+    HEADER.pack_into(buf, 0, MAGIC, source_digest(stock_files, alias_file),
+                     len(names), len(keys), n_slots, len(name_blob), len(key_blob))
+    sections = {
+        "name_offsets": struct.pack(f"={len(name_offsets)}I", *name_offsets),
+        "name_listed": listed,
+        "name_blob": name_blob,
+        "key_offsets": struct.pack(f"={len(key_offsets)}I", *key_offsets),
+        "key_targets": struct.pack(f"={len(targets)}I", *targets),
+        "slots": struct.pack(f"={n_slots}I", *slots),
+        "key_blob": key_blob,
+    }
+    for name, data in sections.items():
+        start, end = layout[name]
+        buf[start:end] = data
+    return bytes(buf)
+
+
+class StockDictionary:
+    """컴파일된 종목 사전 조회기 (buffer 는 mmap 또는 bytes)"""
+
+    def __init__(self, buffer, path=None):
+        self.path = path
+        self._buffer = buffer
+        view = memoryview(buffer)
+        magic, self.digest, n_names, n_keys, n_slots, name_blob_len, key_blob_len = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("종목 사전 파일 형식이 아닙니다.")
+        layout = _layout(n_names, n_keys, n_slots, name_blob_len, key_blob_len)
+        if len(view) < layout["end"][0]:
+            raise ValueError("종목 사전 파일이 잘렸습니다.")
+        section = {name: view[start:end] for name, (start, end) in layout.items()}
+        self._name_offsets = section["name_offsets"].cast("I")
+        self._name_listed = section["name_listed"]
+        self._name_blob = section["name_blob"]
+        self._key_offsets = section["key_offsets"].cast("I")
+        self._key_targets = section["key_targets"].cast("I")
+        self._slots = section["slots"].cast("I")
+        self._key_blob = section["key_blob"]
+        self._mask = n_slots - 1
+        self._names = None
+
+    def __len__(self):
+        return len(self._key_targets)
+
+    def name(self, index):
+        return str(self._name_blob[self._name_offsets[index]:self._name_offsets[index + 1]], "utf-8")
+
+    def names(self, listed_only=True):
+        """정식 명칭 목록 (정렬). listed_only=True 이면 종목 리스트에 있는 이름만 (대시보드 종목 목록)"""
+        if self._names is None:
+            self._names = [self.name(i) for i in range(len(self._name_listed))]
+        if not listed_only:
+            return list(self._names)
+        return [name for name, listed in zip(self._names, self._name_listed) if listed]
+
+    def resolve_key(self, key):
+        """정규화 키(entities.normalize_key) → 정식 명칭. 모르는 키나 모호한 키면 None"""
+        raw = key.encode("utf-8")
+        slot = zlib.crc32(raw) & self._mask
+        while True:
+            entry = self._slots[slot]
+            if not entry:
+                return None
+            i = entry - 1
+            if self._key_blob[self._key_offsets[i]:self._key_offsets[i + 1]] == raw:
+                target = self._key_targets[i]
+                return None if target == AMBIGUOUS else self.name(target)
+            slot = (slot + 1) & self._mask
+
+    def resolve(self, name):
+        return self.resolve_key(entities.normalize_key(name))
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)  # 이미 mmap 한 다른 프로세스는 이전 파일을 계속 씁니다.
+
+
+def _map_file(path, digest):
+    """해시가 맞는 사전 파일을 mmap 해서 돌려주고, 없거나 맞지 않으면 None"""
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    dictionary = None
+    try:
+        magic, file_digest = HEADER.unpack_from(mapped, 0)[:2]
+        if magic == MAGIC and file_digest == digest:
+            dictionary = StockDictionary(mapped, path)
+    except (ValueError, struct.error):
+        pass
+    if dictionary is None:
+        mapped.close()  # 다시 컴파일할 오래된/깨진 파일의 mmap 과 파일 핸들을 바로 닫습니다.
+    return dictionary
+
+
+_LOADED = {}
+
+
+def load_stock_dictionary(path=STOCK_DICT_BIN, stock_files=STOCK_LIST_FILES, alias_file=ENTITY_ALIASES_TSV):
+    """
+    사전 파일을 mmap 해서 돌려줍니다. (같은 인자면 프로세스당 한 번만 확인)
+    원본 해시가 다르거나 파일이 없으면 다시 컴파일해서 쓰고, 쓸 수 없으면 메모리 사본을 씁니다.
+    """
+    cache_key = (path, tuple(stock_files), alias_file)
+    dictionary = _LOADED.get(cache_key)
+    if dictionary is not None:
+        return dictionary
+
+    digest = source_digest(stock_files, alias_file)
+    dictionary = _map_file(path, digest) if path else None
+    if dictionary is None:
+        data = compile_stock_dictionary(stock_files, alias_file)
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                _write_atomic(path, data)
+                dictionary = _map_file(path, digest)
+            except OSError as e:
+                print(f"  ⚠️ 종목 사전 파일을 쓰지 못해 메모리 사본을 씁니다({path}): {e}", file=sys.stderr)
+        if dictionary is None:
+            dictionary = StockDictionary(data)
+    _LOADED[cache_key] = dictionary
+    return dictionary
@@ -0,0 +1,127 @@
+# backend/stock_crawl/storage.py
+# -*- coding: utf-8 -*-
+"""
+중간 저장(본문 추출까지 끝난 기사)과 최종 저장(정규화 → 클러스터링 → Parquet/CSV) 단계입니다.
+
+최종 CSV 의 리스트 컬럼(analysis_orgs, analysis_keywords)은 항상 "['a', 'b']" 형태 문자열로 쓰고,
+분석 결과가 없는 행(NaN/None)은 "[]" 로 씁니다. (대시보드/aggregator 의 literal_eval 이 한 가지 형태만 보면 됨)
+
+최종 저장은 본문(content) 없이 DataFrame 을 만들어 정규화/클러스터링/Parquet/창고 저장을 하고,
+본문은 CSV 를 CSV_CHUNK_ROWS 행씩 쓸 때만 BodyStore 에서 읽어 끼워 넣습니다. (본문이 한 번에 한 청크만 메모리에 올라감)
+"""
+import os
+import csv
+from datetime import datetime, timedelta
+
+from stock_crawl.lazy import lazy_import
+from stock_crawl.records import articles_to_frame, frame_columns, iter_articles
+
+pd = lazy_import("pandas")
+
+LIST_COLUMNS = ("analysis_orgs", "analysis_keywords")
+AGGREGATED_CSV_NAME = "aggregated_stock_data.csv"
+CSV_CHUNK_ROWS = 1000
+
+
+def save_intermediate_data(articles, path):
+    """본문 추출까지 완료된 데이터를 CSV 파일로 저장합니다."""
+    if not articles:
+        print("저장할 데이터가 없습니다.")
+        return None
+
+    print("\n--- 💾 중간 저장 단계 ---")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df = articles_to_frame(articles)
+    df.to_csv(path, index=False, encoding='utf-8-sig')
+    print(f"✅ 본문 추출 완료된 기사 {len(df)}개를 다음 경로에 저장했습니다: {path}")
+    return path
+
+
+def load_intermediate_data(path):
+    """파일로 저장된 중간 데이터를 불러옵니다. (없으면 None)"""
+    if not os.path.exists(path):
+        return None
+
+    print("\n--- 💾 중간 데이터 로딩 ---")
+    print(f"✅ 저장된 중간 데이터 파일을 발견했습니다: {path}")
+    print("수집 및 본문 추출 단계를 건너뛰고 이 파일에서 분석을 시작합니다.")
+    # 청크 단위(문자열 dtype, 빈 칸은 "")로 읽고, 본문은 레코드로 옮기면서 BodyStore 로 내보냅니다.
+    # 파일 크기와 상관없이 DataFrame 은 청크 하나만 메모리에 올라갑니다.
+    return list(iter_articles(path))
+
+
+def list_cell_to_str(value):
+    return str(value) if isinstance(value, list) else '[]'
+
+
+def write_aggregated_csv(df, articles, columns, path, chunksize=CSV_CHUNK_ROWS):
+    """
+    df(본문 없음, 인덱스는 articles 의 위치)를 columns 순서로 CSV 에 씁니다.
+    content 는 청크마다 기사 레코드에서 읽고, 리스트 컬럼은 청크마다 문자열로 바꿉니다. (df 는 바꾸지 않음)
+    """
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        for start in range(0, len(df), chunksize) if len(df) else [0]:
+            chunk = df.iloc[start:start + chunksize]
+            data = {}
+            for col in columns:
+                if col == "content":
+                    data[col] = [articles[i].get("content") for i in chunk.index]
+                elif col in LIST_COLUMNS:
+                    data[col] = chunk[col].map(list_cell_to_str)
+                else:
+                    data[col] = chunk[col]
+            pd.DataFrame(data, columns=columns).to_csv(f, index=False, header=start == 0, quoting=csv.QUOTE_ALL)
+
+
+def aggregate_and_save_to_csv(new_articles, output_dir, keep_days=30, state_dir=None, warehouse_path=None,
+                              warehouse_seed_csv=None):
+    """
+    새로운 기사를 output_dir 의 CSV/Parquet 으로 저장하고, 저장한 DataFrame(리스트 컬럼은 list, 본문 제외)을 돌려줍니다.
+    keep_days=None 이면 기간 필터 없이 모두 저장하고(백필/AI 분석만), state_dir 를 주면 정규화 통계/클러스터 상태를
+    output_dir 대신 그 폴더의 것을 이어서 씁니다. warehouse_path 를 주면 같은 행을 SQLite 창고에도 upsert 합니다.
+    (창고가 아직 채워지지 않았으면 warehouse_seed_csv 병합본을 먼저 넣음)
+    """
+    print("\n--- 4단계: 데이터 병합 및 CSV 저장 시작 ---")
+    if not new_articles:
+        print("  - 취합할 새 데이터가 없습니다.")
+        return None
+
+    # 정규화/클러스터링/Parquet 모듈은 numpy·scipy 를 쓰므로 저장 단계에서만 불러옵니다.
+    from stock_crawl.artifacts import write_compact_artifact
+    from stock_crawl.clustering import assign_clusters
+    from stock_crawl.entities import normalize_entity_columns
+
+    # 매 실행의 기사만 저장합니다. 누적은 aggregator 의 병합본(merged_no_duplicate.csv)이 맡습니다.
+    # 1. DataFrame으로 변환 (행 dict 사본 없이 컬럼 단위로, 본문은 CSV 를 쓸 때만 읽음)
+    columns = frame_columns(new_articles)
+    df = articles_to_frame(new_articles, include_content=False)
+
+    # 2. 오래된 데이터 제거 (예: 최근 30일치 데이터만 유지)
+    df['published_at'] = pd.to_datetime(df['published_at'], errors='coerce').dt.strftime('%Y-%m-%d')
+    if keep_days is None:
+        final_df = df
+    else:
+        cutoff = (datetime.now() - timedelta(days=keep_days)).strftime('%Y-%m-%d')
+        final_df = df[df['published_at'] >= cutoff].copy()
+    state_dir = state_dir or output_dir
+
+    # 기관/종목명 표기 통일 (수집 시 한 번만 적용, 미해석 통계는 entity_stats.json)
+    final_df = normalize_entity_columns(final_df, stats_path=os.path.join(state_dir, "entity_stats.json"))
+
+    # 테마 클러스터 배정 (누적 상태는 state_dir/clusters 에 보관)
+    final_df = assign_clusters(final_df, os.path.join(state_dir, "clusters"))
+
+    # 대시보드용 전처리 산출물(Parquet): 리스트 컬럼이 문자열로 바뀌기 전에 저장
+    write_compact_artifact(final_df, output_dir)
+    if warehouse_path:
+        from stock_crawl.warehouse import save_to_warehouse
+        save_to_warehouse(final_df, warehouse_path, seed_csv=warehouse_seed_csv)
+
+    # 3. CSV 파일로 저장 (리스트 컬럼 문자열 변환과 본문은 청크 단위, 반환할 DataFrame 은 list 그대로 유지)
+    os.makedirs(output_dir, exist_ok=True)
+    csv_path = os.path.join(output_dir, AGGREGATED_CSV_NAME)
+    csv_columns = columns + [col for col in final_df.columns if col not in columns]
+    write_aggregated_csv(final_df, new_articles, csv_columns, csv_path)
+    print(f"--- ✅ CSV 저장 완료. 총 {len(final_df)}개 기사 저장 ---")
+    print(f"   - 저장 경로: {csv_path}")
+    return final_df
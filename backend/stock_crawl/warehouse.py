@@ -0,0 +1,370 @@
+# backend/stock_crawl/warehouse.py
+# -*- coding: utf-8 -*-
+"""
+기사/분석 결과/엔티티 언급을 담는 SQLite 창고(warehouse)입니다. (output/warehouse.sqlite, WAL 모드)
+
+타임스탬프 CSV 들과 merged_no_duplicate.csv 는 읽을 때마다 전체를 파싱해야 하지만, 창고에서는
+  - 기간 조회: articles(published_at) 인덱스 범위 검색
+  - 엔티티 조회: mentions(kind, entity, published_at) 인덱스 검색 (키워드/기관별 기사, 일별 언급 수)
+  - 감성 조회: analysis(sentiment_label) 인덱스
+로 필요한 행만 읽습니다. 리스트 컬럼(analysis_keywords/orgs)은 JSON 문자열로 저장해 literal_eval 없이 복원합니다.
+
+테이블
+  articles  : url(UNIQUE), 제목/요약/검색 키워드, published_at(YYYY-MM-DD, 발행일이 없으면 수집일), 클러스터
+  analysis  : 기사별 Gemini/로컬 분석 결과 (요약, 감성, 키워드/기관 JSON)
+  mentions  : (기사, 종류[keyword|org], 엔티티) — 조회용으로 published_at 을 함께 둡니다.
+  meta      : revision (쓰기마다 1 증가, 대시보드 캐시 키), seeded_from / seed_signature (누적 기사를 채운 병합본의
+              경로와 그때의 '크기:수정 시각')
+
+파이프라인 저장 단계(stock_crawl.storage)가 실행마다 새 기사를 한 트랜잭션으로 upsert 하고,
+누적 병합본은 cli 의 warehouse 단계(`python backend/cli.py run warehouse`)가 옮겨 넣습니다.
+저장 단계가 처음 만든(또는 아직 채워지지 않은) 창고는 그 실행의 기사만 있으므로, 쓰기 전에 병합본을
+청크 단위로 먼저 채우고 seeded_from 을 남깁니다. aggregator/백필 등이 병합본을 다시 쓰면 seed_signature 가 맞지 않으므로,
+읽는 쪽(open_warehouse)은 병합본 CSV 를 쓰고 다음 저장 단계가 바뀐 병합본을 다시 채웁니다. (upsert 라 이미 있는 기사는 그대로)
+WAL 모드라 파이프라인이 쓰는 동안에도 대시보드가 읽을 수 있습니다.
+"""
+import os
+import json
+import sqlite3
+import collections
+
+from stock_crawl.paths import WAREHOUSE_DB, MERGED_CSV
+
+BUSY_TIMEOUT_SECONDS = 30
+SEEDED_KEY = "seeded_from"
+SEED_SIGNATURE_KEY = "seed_signature"
+SEED_CHUNK_ROWS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    summary TEXT,
+    search_keyword TEXT,
+    published_at TEXT,
+    crawled_at TEXT,
+    cluster_id INTEGER,
+    cluster_label TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_at);
+
+CREATE TABLE IF NOT EXISTS analysis (
+    article_id INTEGER PRIMARY KEY REFERENCES articles(id) ON DELETE CASCADE,
+    summary_ai TEXT,
+    sentiment_label TEXT,
+    keywords TEXT NOT NULL DEFAULT '[]',
+    orgs TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_analysis_sentiment ON analysis(sentiment_label);
+
+CREATE TABLE IF NOT EXISTS mentions (
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    published_at TEXT,
+    PRIMARY KEY (article_id, kind, entity)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_mentions_entity ON mentions(kind, entity, published_at);
+CREATE INDEX IF NOT EXISTS idx_mentions_published ON mentions(published_at, kind);
+
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# 빈 값(None/"")은 기존 값을 덮어쓰지 않습니다. (병합본처럼 일부 컬럼만 있는 입력도 안전하게 upsert)
+UPSERT_ARTICLE_SQL = """
+INSERT INTO articles (url, title, summary, search_keyword, published_at, crawled_at, cluster_id, cluster_label)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(url) DO UPDATE SET
+    title = COALESCE(excluded.title, title),
+    summary = COALESCE(excluded.summary, summary),
+    search_keyword = COALESCE(excluded.search_keyword, search_keyword),
+    published_at = COALESCE(excluded.published_at, published_at),
+    crawled_at = COALESCE(excluded.crawled_at, crawled_at),
+    cluster_id = COALESCE(excluded.cluster_id, cluster_id),
+    cluster_label = COALESCE(excluded.cluster_label, cluster_label)
+RETURNING id, published_at
+"""
+UPSERT_ANALYSIS_SQL = """
+INSERT INTO analysis (article_id, summary_ai, sentiment_label, keywords, orgs) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(article_id) DO UPDATE SET
+    summary_ai = excluded.summary_ai, sentiment_label = excluded.sentiment_label,
+    keywords = excluded.keywords, orgs = excluded.orgs
+"""
+
+ARTICLE_COLUMNS = ["url", "title", "summary", "search_keyword", "published_at", "crawled_at",
+                   "cluster_id", "cluster_label", "summary_ai", "sentiment_label", "analysis_keywords", "analysis_orgs"]
+
+
+def _text(value):
+    """NaN/None/빈 문자열 → None, 나머지는 앞뒤 공백을 뺀 문자열"""
+    if value is None or value != value:  # NaN
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _day(value):
+    """'2025-07-31', '2025-07-31 09:00:00', ISO 시각 등 → 'YYYY-MM-DD' (읽을 수 없으면 None)"""
+    value = _text(value)
+    if value is None or len(value) < 10 or value[4] != "-" or value[7] != "-":
+        return None
+    return value[:10]
+
+
+def csv_signature(path):
+    """병합본이 바뀌었는지 볼 값 '크기:수정 시각(ns)' (파일이 없으면 None)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _int(value):
+    value = _text(value)
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class Warehouse:
+    """SQLite 창고 연결. 같은 파일을 여러 프로세스가 동시에 열어도 됩니다. (쓰기는 한 번에 하나)"""
+
+    def __init__(self, path=WAREHOUSE_DB, readonly=False):
+        self.path = path
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_SECONDS,
+                                        check_same_thread=False)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+        self.conn.execute("PRAGMA foreign_keys=ON")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------------- 쓰기 ----------------
+    def upsert_frame(self, df):
+        """
+        기사 DataFrame(aggregated / merged 형식, 리스트 컬럼은 list 또는 문자열 표현)을 한 트랜잭션으로 upsert 합니다.
+        분석 결과가 있는 행은 analysis/mentions 를 통째로 바꿉니다. 처리한 행 수를 돌려줍니다.
+        """
+        from stock_crawl.artifacts import to_str_list
+
+        columns = {col: (df[col].tolist() if col in df.columns else [None] * len(df)) for col in ARTICLE_COLUMNS}
+        count = 0
+        with self.conn:
+            cur = self.conn.cursor()
+            for i in range(len(df)):
+                url = _text(columns["url"][i])
+                if url is None:
+                    continue
+                published = _day(columns["published_at"][i]) or _day(columns["crawled_at"][i])
+                article_id, published = cur.execute(UPSERT_ARTICLE_SQL, (
+                    url, _text(columns["title"][i]), _text(columns["summary"][i]),
+                    _text(columns["search_keyword"][i]), published, _text(columns["crawled_at"][i]),
+                    _int(columns["cluster_id"][i]), _text(columns["cluster_label"][i]),
+                )).fetchone()
+                count += 1
+
+                keywords = to_str_list(columns["analysis_keywords"][i])
+                orgs = to_str_list(columns["analysis_orgs"][i])
+                summary_ai, sentiment = _text(columns["summary_ai"][i]), _text(columns["sentiment_label"][i])
+                if not (keywords or orgs or summary_ai or sentiment):
+                    continue  # 분석 전 기사: 기존 분석 결과가 있으면 그대로 둡니다.
+                cur.execute(UPSERT_ANALYSIS_SQL, (article_id, summary_ai, sentiment,
+                                                  json.dumps(keywords, ensure_ascii=False),
+                                                  json.dumps(orgs, ensure_ascii=False)))
+                cur.execute("DELETE FROM mentions WHERE article_id = ?", (article_id,))
+                cur.executemany("INSERT OR IGNORE INTO mentions VALUES (?, ?, ?, ?)",
+                                [(article_id, "keyword", k, published) for k in keywords]
+                                + [(article_id, "org", o, published) for o in orgs])
+            cur.execute("INSERT INTO meta VALUES ('revision', '1') "
+                        "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+        return count
+
+    def seed(self, csv_path=MERGED_CSV, chunksize=SEED_CHUNK_ROWS):
+        """
+        병합본 CSV(본문 컬럼 제외)를 청크 단위로 upsert 하고 seeded_from / seed_signature 를 남깁니다.
+        마지막으로 채운 뒤 병합본이 바뀌지 않았거나 CSV 가 없으면 아무것도 하지 않습니다. 넣은 행 수를 돌려줍니다.
+        """
+        if not csv_path or not os.path.exists(csv_path) or self.seed_is_current(csv_path):
+            return 0
+        from stock_crawl.records import iter_csv_chunks
+
+        # 읽기 전의 서명을 남겨, 읽는 도중 병합본이 바뀌면 다음 번에 다시 채우도록 합니다.
+        signature = csv_signature(csv_path)
+        count = sum(self.upsert_frame(chunk)
+                    for chunk in iter_csv_chunks(csv_path, usecols=ARTICLE_COLUMNS, chunksize=chunksize))
+        self.mark_seeded(csv_path, signature)
+        return count
+
+    def mark_seeded(self, csv_path, signature=None):
+        """csv_path 의 현재 내용(또는 signature 시점)이 창고에 모두 들어 있다고 표시합니다."""
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+                (SEEDED_KEY, os.path.abspath(csv_path)),
+                (SEED_SIGNATURE_KEY, signature or csv_signature(csv_path)),
+            ])
+
+    # ---------------- 읽기 ----------------
+    def _meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def seeded_from(self):
+        """누적 기사를 채운 병합본 경로 (채워지지 않았으면 None)"""
+        return self._meta(SEEDED_KEY)
+
+    def seed_is_current(self, csv_path):
+        """창고가 csv_path 로 채워졌고, 그 뒤로 병합본이 바뀌지 않았는지"""
+        return (self.seeded_from() == os.path.abspath(csv_path)
+                and self._meta(SEED_SIGNATURE_KEY) == csv_signature(csv_path))
+
+    def revision(self):
+        """쓰기마다 바뀌는 값 (캐시 키용, 비어 있으면 0)"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return int(row[0]) if row else 0
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def date_bounds(self):
+        """(가장 이른 날짜, 가장 늦은 날짜) 'YYYY-MM-DD' 문자열, 비어 있으면 (None, None)"""
+        return self.conn.execute(
+            "SELECT MIN(published_at), MAX(published_at) FROM articles WHERE published_at IS NOT NULL").fetchone()
+
+    def articles_frame(self, start=None, end=None, urls=None, include_summary=False):
+        """
+        기간 [start, end] (날짜 또는 'YYYY-MM-DD', None 이면 열린 구간)의 기사를 대시보드/패키지 형식으로 돌려줍니다.
+        (analysis_date 는 date, 리스트 컬럼은 list) urls 를 주면 그 기사만 읽습니다.
+        """
+        import pandas as pd
+
+        where, params = ["a.published_at IS NOT NULL"], []
+        if start is not None:
+            where.append("a.published_at >= ?")
+            params.append(str(start))
+        if end is not None:
+            where.append("a.published_at <= ?")
+            params.append(str(end))
+        if urls is not None:
+            urls = list(urls)
+            where.append(f"a.url IN ({','.join('?' * len(urls))})")
+            params += urls
+        summary_col = "a.summary, a.search_keyword, " if include_summary else ""
+        rows = self.conn.execute(f"""
+            SELECT a.url, a.title, {summary_col}a.published_at, a.crawled_at, a.cluster_id, a.cluster_label,
+                   n.summary_ai, n.sentiment_label, COALESCE(n.keywords, '[]'), COALESCE(n.orgs, '[]')
+            FROM articles a LEFT JOIN analysis n ON n.article_id = a.id
+            WHERE {' AND '.join(where)}
+            ORDER BY a.published_at, a.id
+        """, params).fetchall()
+        names = ["url", "title"] + (["summary", "search_keyword"] if include_summary else []) + [
+            "published_at", "crawled_at", "cluster_id", "cluster_label", "summary_ai", "sentiment_label",
+            "analysis_keywords", "analysis_orgs"]
+        df = pd.DataFrame.from_records(rows, columns=names)
+        for col in ("analysis_keywords", "analysis_orgs"):
+            df[col] = [json.loads(v) for v in df[col]]
+        df["cluster_id"] = pd.to_numeric(df["cluster_id"], errors="coerce")
+        df["analysis_date"] = pd.to_datetime(df["published_at"]).dt.date
+        return df
+
+    def urls_mentioning(self, entity, kind="keyword", start=None, end=None, limit=None):
+        """엔티티를 언급한 기사 url (최신순)"""
+        sql = "SELECT a.url FROM mentions m JOIN articles a ON a.id = m.article_id WHERE m.kind = ? AND m.entity = ?"
+        params = [kind, entity]
+        if start is not None:
+            sql += " AND m.published_at >= ?"
+            params.append(str(start))
+        if end is not None:
+            sql += " AND m.published_at <= ?"
+            params.append(str(end))
+        sql += " ORDER BY m.published_at DESC, a.id DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [row[0] for row in self.conn.execute(sql, params)]
+
+    def articles_mentioning(self, entity, kind="keyword", start=None, end=None, limit=None):
+        """엔티티를 언급한 기사 DataFrame (최신순)"""
+        urls = self.urls_mentioning(entity, kind, start, end, limit)
+        df = self.articles_frame(urls=urls)
+        return df.sort_values(["analysis_date", "url"], ascending=False).reset_index(drop=True)
+
+    def entity_daily_counts(self, kind, start=None, end=None, entities=None):
+        """{(날짜 문자열, 엔티티): 언급 기사 수} — 기간/엔티티 조건은 인덱스로 찾습니다."""
+        sql = "SELECT published_at, entity, COUNT(*) FROM mentions WHERE kind = ? AND published_at IS NOT NULL"
+        params = [kind]
+        if entities is not None:
+            entities = list(entities)
+            sql += f" AND entity IN ({','.join('?' * len(entities))})"
+            params += entities
+        if start is not None:
+            sql += " AND published_at >= ?"
+            params.append(str(start))
+        if end is not None:
+            sql += " AND published_at <= ?"
+            params.append(str(end))
+        sql += " GROUP BY published_at, entity"
+        return {(day, entity): n for day, entity, n in self.conn.execute(sql, params)}
+
+    def sentiment_counts(self, start=None, end=None):
+        """{감성 라벨: 기사 수} (기간 조건)"""
+        sql = ("SELECT n.sentiment_label, COUNT(*) FROM analysis n JOIN articles a ON a.id = n.article_id "
+               "WHERE n.sentiment_label IS NOT NULL")
+        params = []
+        if start is not None:
+            sql += " AND a.published_at >= ?"
+            params.append(str(start))
+        if end is not None:
+            sql += " AND a.published_at <= ?"
+            params.append(str(end))
+        sql += " GROUP BY n.sentiment_label"
+        return collections.Counter(dict(self.conn.execute(sql, params).fetchall()))
+
+
+def open_warehouse(path=WAREHOUSE_DB, fallback_csv=MERGED_CSV):
+    """
+    읽기 전용 연결. 창고 파일이 없거나, 병합본(fallback_csv)이 있는데 창고가 아직 그것으로 채워지지 않았거나
+    채운 뒤 병합본이 바뀌었으면 None 을 돌려줍니다. (CSV 로 대체하는 쪽에서 사용)
+    """
+    if not path or not os.path.exists(path):
+        return None
+    wh = Warehouse(path, readonly=True)
+    if fallback_csv and os.path.exists(fallback_csv) and not wh.seed_is_current(fallback_csv):
+        wh.close()
+        return None
+    return wh
+
+
+def save_to_warehouse(df, path=WAREHOUSE_DB, seed_csv=MERGED_CSV, complete=False):
+    """
+    저장 단계용: df 를 창고에 upsert 하고 건수를 출력합니다. 실패해도 CSV 저장은 계속되도록 경고만 남깁니다.
+    창고가 아직 채워지지 않았거나 채운 뒤 seed_csv(병합본)가 바뀌었으면 병합본을 먼저 넣고,
+    df 가 seed_csv 전체이면(complete=True) 다시 읽지 않고 채워졌다는 표시만 남깁니다.
+    """
+    try:
+        with Warehouse(path) as wh:
+            if not complete and seed_csv and os.path.exists(seed_csv) and not wh.seed_is_current(seed_csv):
+                action = "초기화" if wh.seeded_from() is None else "병합본 변경 반영"
+                print(f"   - 창고(SQLite) {action}: 병합본 {seed_csv} 에서 {wh.seed(seed_csv)}건 채움")
+            n = wh.upsert_frame(df)
+            if complete and seed_csv:
+                wh.mark_seeded(seed_csv)
+            print(f"   - 창고(SQLite) 반영: {n}건 → {path} (전체 {wh.count()}건)")
+            return n
+    except sqlite3.Error as e:
+        print(f"  ⚠️ 창고(SQLite) 반영 실패: {e}")
+        return 0
+
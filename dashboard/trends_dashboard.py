@@ -4,6 +4,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import os
+import sys
 import csv
 import numpy as np
 import ast
@@ -21,14 +22,35 @@ st.set_page_config(
 # --- [핵심 수정] GitHub Raw URL에서 데이터 로드 ---
 # 🚨 아래 URL의 'YourUsername/YourRepoName' 부분을 
 #    본인의 실제 GitHub 사용자명과 저장소 이름으로 반드시 바꿔주세요!
-# 예시: "https://raw.githubusercontent.com/jh9098/stock_crawl/main/backend/output/aggregated/aggregated_stock_data.csv"
-DATA_URL = "https://raw.githubusercontent.com/jh9098/stock_crawl/main/backend/output/aggregated/aggregated_stock_data.csv"
+# run_pipeline.py 는 저장소 루트에서 실행되어 output/aggregated/ 에 CSV 와 Parquet 을 함께 씁니다.
+# (schedule_pipeline.yml 이 올리는 경로와 같음) 두 파일을 같은 위치에서 읽습니다.
+DATA_BASE_URL = "https://raw.githubusercontent.com/jh9098/stock_crawl/main/output/aggregated"
+DATA_URL = f"{DATA_BASE_URL}/aggregated_stock_data.csv"
+# 파이프라인이 함께 올리는 전처리 산출물 (본문 제외, 리스트/날짜 변환 완료). 없으면 CSV 로 대체합니다.
+DATA_PARQUET_URL = f"{DATA_BASE_URL}/aggregated_stock_data.parquet"
 
 # ----- 경로 설정 (코스피/코스닥 파일용) -----
 # 이 파일(trends_dashboard.py)이 있는 위치를 기준으로 경로를 잡습니다.
 DASHBOARD_ROOT = os.path.dirname(os.path.abspath(__file__))
 KOSPI_TXT   = os.path.join(DASHBOARD_ROOT, "코스피.txt")
 KOSDAQ_TXT  = os.path.join(DASHBOARD_ROOT, "코스닥.txt")
+# 원격 데이터의 로컬 사본(ETag 재검증용)을 보관하는 폴더
+DATA_CACHE_DIR = os.path.join(DASHBOARD_ROOT, ".data_cache")
+
+# backend/stock_crawl 공용 모듈 사용: 대시보드는 저장소 전체(backend 포함)를 배포해야 합니다.
+# 필요한 라이브러리는 dashboard/requirements.txt 에 있습니다.
+BACKEND_ROOT = os.path.join(os.path.dirname(DASHBOARD_ROOT), "backend")
+if not os.path.isdir(os.path.join(BACKEND_ROOT, "stock_crawl")):
+    st.error(f"공용 모듈(backend/stock_crawl)을 찾을 수 없습니다: {BACKEND_ROOT}\n"
+             "dashboard 폴더만이 아니라 저장소 전체를 배포해주세요.")
+    st.stop()
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+from stock_crawl.remote import fetch_if_changed
+from stock_crawl.artifacts import load_articles_file
+from stock_crawl.stock_dict import load_stock_dictionary
+# 데이터 준비 함수 프로파일링: STOCK_CRAWL_PROFILE=1 또는 `streamlit run ... -- --profile`
+from stock_crawl.profiling import profiled
 
 # ----- 디폴트 값 -----
 DEFAULT_TOP_N_KEY_ORG = 15
@@ -43,53 +65,42 @@ STOP_KEYWORDS = {
 }
 
 # =========================== 유틸 함수 ===========================
-def safe_literal_eval(val):
-    """CSV에서 읽은 리스트 형태의 문자열 -> 실제 리스트로 변환"""
-    try:
-        # nan 같은 float 타입이 들어올 경우를 대비해 문자열로 먼저 변환
-        return ast.literal_eval(str(val))
-    except (ValueError, SyntaxError, TypeError):
-        return []
-
-@st.cache_data(ttl=600) # 10분마다 GitHub에서 데이터 새로고침
-def load_data_from_github(url):
-    """GitHub Raw URL에서 최신 CSV 데이터를 로드하고 전처리합니다."""
-    try:
-        df = pd.read_csv(url)
-        
-        # 날짜처리
-        published_dt = pd.to_datetime(df['published_at'], errors='coerce')
-        crawled_dt   = pd.to_datetime(df['crawled_at'],   errors='coerce')
-        df['analysis_date'] = np.where(pd.notna(published_dt), published_dt, crawled_dt)
-        df['analysis_date'] = pd.to_datetime(df['analysis_date']).dt.date
-        df.dropna(subset=['analysis_date'], inplace=True)
-
-        # 리스트 컬럼 처리
-        df['analysis_keywords'] = df['analysis_keywords'].apply(safe_literal_eval)
-        df['analysis_orgs']     = df['analysis_orgs'].apply(safe_literal_eval)
-
-        return df
-    except Exception as e:
-        st.error(f"GitHub에서 데이터 로딩 중 오류 발생: {e}")
-        st.info("데이터 URL이 정확한지, 그리고 GitHub 저장소의 해당 경로에 CSV 파일이 생성되었는지 확인해주세요.")
-        return None
+@st.cache_data(ttl=60, show_spinner=False) # 1분마다 ETag 로 변경 여부만 확인
+def revalidate_remote_file(url):
+    """원격 파일을 조건부 요청으로 재검증하고 (로컬 경로, 버전)을 돌려줍니다. 304면 본문을 받지 않습니다."""
+    remote = fetch_if_changed(url, DATA_CACHE_DIR)
+    return remote.path, remote.version
+
+@st.cache_resource(max_entries=2, show_spinner="데이터 파싱 중...")
+@profiled("parse_data")
+def parse_data_file(path, version):
+    """로컬 사본을 파싱합니다. 버전(ETag)이 그대로면 다시 파싱하지 않고 캐시된 결과를 씁니다."""
+    return load_articles_file(path)
+
+def load_data_from_github(url, parquet_url=None):
+    """GitHub Raw URL에서 최신 데이터를 로드합니다. 전처리 산출물(Parquet)을 우선 사용합니다."""
+    for candidate in [parquet_url, url]:
+        if not candidate:
+            continue
+        try:
+            path, version = revalidate_remote_file(candidate)
+            return parse_data_file(path, version)
+        except Exception as e:
+            if candidate == url:
+                st.error(f"GitHub에서 데이터 로딩 중 오류 발생: {e}")
+                st.info("데이터 URL이 정확한지, 그리고 GitHub 저장소의 해당 경로에 CSV 파일이 생성되었는지 확인해주세요.")
+    return None
 
-@st.cache_data
 def load_stock_names(kospi_path: str, kosdaq_path: str):
-    """코스피/코스닥 텍스트 파일에서 종목명 리스트 로드"""
-    names = []
+    """코스피/코스닥 종목명 리스트 (컴파일된 종목 사전을 mmap 해서 읽음, 프로세스 안의 모든 세션이 공유)"""
     for p in [kospi_path, kosdaq_path]:
-        try:
-            # 웹 배포 환경을 고려하여 Path 사용
-            txt_path = Path(p)
-            if txt_path.is_file():
-                txt = txt_path.read_text(encoding='utf-8').splitlines()
-                names.extend([x.strip() for x in txt if x.strip()])
-            else:
-                 st.warning(f"종목 리스트 파일을 찾지 못했습니다: {p}")
-        except Exception as e:
-            st.warning(f"종목 리스트 로딩 중 오류 ({p}): {e}")
-    return sorted(set(names))
+        if not Path(p).is_file():
+            st.warning(f"종목 리스트 파일을 찾지 못했습니다: {p}")
+    try:
+        return load_stock_dictionary(stock_files=(kospi_path, kosdaq_path)).names()
+    except Exception as e:
+        st.warning(f"종목 리스트 로딩 중 오류: {e}")
+        return []
 
 def extract_stock_mentions(org_list, stock_set):
     """분석된 기관/기업 리스트 중 종목명만 추출"""
@@ -100,7 +111,7 @@ def extract_stock_mentions(org_list, stock_set):
 
 
 # =========================== 데이터 로드 ===========================
-df = load_data_from_github(DATA_URL)
+df = load_data_from_github(DATA_URL, DATA_PARQUET_URL)
 stock_list = load_stock_names(KOSPI_TXT, KOSDAQ_TXT)
 stock_set  = set(stock_list)
 
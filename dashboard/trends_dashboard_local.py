@@ -4,12 +4,14 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import os
+import sys
 import csv
 import numpy as np
 import ast
 from pathlib import Path
 from math import log
 import requests # requests 라이브러리 임포트 확인
+from datetime import date
 
 # =========================== 기본 설정 ===========================
 st.set_page_config(
@@ -30,6 +32,19 @@ DASHBOARD_ROOT = os.path.dirname(os.path.abspath(__file__))
 KOSPI_TXT   = os.path.join(DASHBOARD_ROOT, "코스피.txt")
 KOSDAQ_TXT  = os.path.join(DASHBOARD_ROOT, "코스닥.txt")
 
+# backend/stock_crawl 공용 모듈 사용
+BACKEND_ROOT = os.path.join(os.path.dirname(DASHBOARD_ROOT), "backend")
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+from stock_crawl.momentum import build_count_matrix, compute_momentum, top_trending
+from stock_crawl.cooccurrence import build_cooccurrence_graph
+from stock_crawl.paths import MERGED_CSV, WAREHOUSE_DB
+from stock_crawl.warehouse import open_warehouse
+from stock_crawl.stock_dict import load_stock_dictionary
+from stock_crawl.sentiment_series import SENTIMENT_LABELS, SentimentSeries
+# 데이터 준비 함수 프로파일링: STOCK_CRAWL_PROFILE=1 또는 `streamlit run ... -- --profile`
+from stock_crawl.profiling import profiled
+
 # ----- 디폴트 값 -----
 DEFAULT_TOP_N_KEY_ORG = 15
 DEFAULT_TOP_N_STOCKS  = 15
@@ -52,6 +67,7 @@ def safe_literal_eval(val):
         return []
 
 @st.cache_data(ttl=600)
+@profiled("load_data")
 def load_data_from_local(file_path):
     try:
         df = pd.read_csv(file_path, encoding='utf-8')
@@ -70,27 +86,55 @@ def load_data_from_local(file_path):
         st.info("파일 경로와 인코딩을 확인해주세요.")
         return None
 
-# 실제 파일 경로 입력 (여기만 수정!)
-LOCAL_CSV_PATH = r"P:\stock_crawl\backend\output\merged_no_duplicate.csv"
-df = load_data_from_local(LOCAL_CSV_PATH)
+# 실제 파일 경로 (기본: backend/output/merged_no_duplicate.csv, 환경 변수 STOCK_CRAWL_MERGED_CSV 로 변경 가능)
+LOCAL_CSV_PATH = os.getenv("STOCK_CRAWL_MERGED_CSV", MERGED_CSV)
+# SQLite 창고 (있으면 CSV 대신 선택한 기간만 인덱스로 읽음, 환경 변수 STOCK_CRAWL_WAREHOUSE 로 변경 가능)
+WAREHOUSE_PATH = os.getenv("STOCK_CRAWL_WAREHOUSE", WAREHOUSE_DB)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def warehouse_state(path):
+    """창고의 (revision, 첫 날짜, 마지막 날짜). 창고가 없거나 비어 있거나 아직 병합본으로 채워지지 않았으면 None"""
+    wh = open_warehouse(path, fallback_csv=LOCAL_CSV_PATH)
+    if wh is None:
+        return None
+    with wh:
+        first, last = wh.date_bounds()
+        return (wh.revision(), date.fromisoformat(first), date.fromisoformat(last)) if first else None
+
+@st.cache_data(max_entries=8)
+@profiled("load_window")
+def load_window_from_warehouse(path, revision, start_date, end_date):
+    """기간 [start_date, end_date] 기사만 창고에서 읽습니다. (revision 이 바뀌면 다시 읽음)"""
+    # 창고를 쓸지는 warehouse_state 가 이미 정했으므로 병합본 확인 없이 엽니다.
+    with open_warehouse(path, fallback_csv=None) as wh:
+        return wh.articles_frame(start_date, end_date)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+@profiled("sentiment_series")
+def load_sentiment_series(source, revision, stocks, _articles=None):
+    """
+    종목 × 날짜 × 감성 기사 수 저장소 (source/revision 이 바뀔 때만 다시 만들고 모든 세션이 공유).
+    _articles 가 없으면 창고(source)의 전체 기간을 읽습니다.
+    """
+    if _articles is None:
+        with open_warehouse(source, fallback_csv=None) as wh:
+            _articles = wh.articles_frame()
+    series = SentimentSeries(stocks)
+    series.add_frame(_articles)
+    return series
 
 
-@st.cache_data
 def load_stock_names(kospi_path: str, kosdaq_path: str):
-    """코스피/코스닥 텍스트 파일에서 종목명 리스트 로드"""
-    names = []
+    """코스피/코스닥 종목명 리스트 (컴파일된 종목 사전을 mmap 해서 읽음, 프로세스 안의 모든 세션이 공유)"""
     for p in [kospi_path, kosdaq_path]:
-        try:
-            # 웹 배포 환경을 고려하여 Path 사용
-            txt_path = Path(p)
-            if txt_path.is_file():
-                txt = txt_path.read_text(encoding='utf-8').splitlines()
-                names.extend([x.strip() for x in txt if x.strip()])
-            else:
-                 st.warning(f"종목 리스트 파일을 찾지 못했습니다: {p}")
-        except Exception as e:
-            st.warning(f"종목 리스트 로딩 중 오류 ({p}): {e}")
-    return sorted(set(names))
+        if not Path(p).is_file():
+            st.warning(f"종목 리스트 파일을 찾지 못했습니다: {p}")
+    try:
+        return load_stock_dictionary(stock_files=(kospi_path, kosdaq_path)).names()
+    except Exception as e:
+        st.warning(f"종목 리스트 로딩 중 오류: {e}")
+        return []
 
 def extract_stock_mentions(org_list, stock_set):
     """분석된 기관/기업 리스트 중 종목명만 추출"""
@@ -101,21 +145,25 @@ def extract_stock_mentions(org_list, stock_set):
 
 
 # =========================== 데이터 로드 ===========================
-df = load_data_from_local(LOCAL_CSV_PATH)
+wh_state = warehouse_state(WAREHOUSE_PATH)
+df = None if wh_state else load_data_from_local(LOCAL_CSV_PATH)
 stock_list = load_stock_names(KOSPI_TXT, KOSDAQ_TXT)
 stock_set  = set(stock_list)
 
 st.title("📈 뉴스 트렌드 분석 대시보드 (자동 업데이트)")
 
-if df is None or df.empty:
+if wh_state is None and (df is None or df.empty):
     st.warning("데이터를 불러오지 못했습니다. GitHub Actions가 아직 실행되지 않았거나, 데이터 로딩에 실패했습니다.")
     st.stop()
 
 # =========================== 사이드바 필터 ===========================
 st.sidebar.header("📊 기본 필터")
 
-min_date = df['analysis_date'].min()
-max_date = df['analysis_date'].max()
+if wh_state:
+    _, min_date, max_date = wh_state
+else:
+    min_date = df['analysis_date'].min()
+    max_date = df['analysis_date'].max()
 
 date_range = st.sidebar.date_input(
     "날짜 범위 선택",
@@ -126,7 +174,10 @@ if len(date_range) != 2:
     st.stop()
 
 start_date, end_date = date_range
-filtered_df = df[(df['analysis_date'] >= start_date) & (df['analysis_date'] <= end_date)].copy()
+if wh_state:
+    filtered_df = load_window_from_warehouse(WAREHOUSE_PATH, wh_state[0], start_date, end_date)
+else:
+    filtered_df = df[(df['analysis_date'] >= start_date) & (df['analysis_date'] <= end_date)].copy()
 
 st.sidebar.markdown("---")
 st.sidebar.subheader("🔤 표시 개수 설정")
@@ -188,48 +239,42 @@ if not exploded_stock.empty:
 st.markdown("---")
 st.header("🚀 최근 급상승 키워드/종목/이슈 분석")
 
-import collections
-from datetime import datetime, timedelta
-
-def flatten_keywords(series):
-    # 문자열 리스트 → 진짜 리스트로 평탄화
-    result = []
-    for x in series:
-        try:
-            result.extend([k for k in ast.literal_eval(str(x)) if isinstance(k, str)])
-        except Exception:
-            continue
-    return result
-
-now = pd.Timestamp.now()
-recent_limit = now - pd.Timedelta(days=recent_days)
-prev_limit = recent_limit - pd.Timedelta(days=prev_days)
-
-recent_df = filtered_df[filtered_df['analysis_date'] >= recent_limit.date()]
-prev_df   = filtered_df[(filtered_df['analysis_date'] < recent_limit.date()) & (filtered_df['analysis_date'] >= prev_limit.date())]
-
-recent_kw = collections.Counter(flatten_keywords(recent_df['analysis_keywords']))
-prev_kw   = collections.Counter(flatten_keywords(prev_df['analysis_keywords']))
-
-trending = []
-for k in recent_kw:
-    prev_count = prev_kw.get(k, 0)
-    if recent_kw[k] >= 3 and recent_kw[k] > prev_count:  # 최소 등장 횟수 필터
-        rate = ((recent_kw[k]-prev_count)/prev_count*100) if prev_count else 1000  # 0 대비는 1000%
-        trending.append((k, recent_kw[k], prev_count, rate))
-trending.sort(key=lambda x: x[3], reverse=True)
-trend_df = pd.DataFrame(trending, columns=["키워드", f"최근 {recent_days}일", f"직전 {prev_days}일", "증가율(%)"])
-st.subheader(f"🔥 최근 {recent_days}일 급상승 키워드 Top 10")
-st.dataframe(trend_df.head(10))
+@profiled("trending")
+def compute_trending_tables(data, recent_days, prev_days, top_n=10):
+    """키워드/기관/종목 모멘텀을 한 번에 계산해 종류별 상위 테이블을 돌려줍니다."""
+    columns = {"keywords": "analysis_keywords", "orgs": "analysis_orgs"}
+    if 'stock_mentions' in data.columns:
+        columns["stocks"] = "stock_mentions"
+    matrix = build_count_matrix(data, columns)
+    momentum = compute_momentum(matrix, as_of=pd.Timestamp.now().date(),
+                                recent_days=recent_days, prev_days=prev_days, min_count=3)
+    return top_trending(momentum, k=top_n, by="growth_pct")
+
+trending_tables = compute_trending_tables(filtered_df, recent_days, prev_days)
+trend_labels = {"keywords": "키워드", "orgs": "기관", "stocks": "종목"}
+trend_cols = st.columns(len(trending_tables) or 1)
+for col, (entity_type, table) in zip(trend_cols, trending_tables.items()):
+    label = trend_labels.get(entity_type, entity_type)
+    with col:
+        st.subheader(f"🔥 최근 {recent_days}일 급상승 {label} Top 10")
+        trend_df = table[["term", "recent", "prev", "growth_pct", "zscore"]].rename(columns={
+            "term": label, "recent": f"최근 {recent_days}일", "prev": f"직전 {prev_days}일",
+            "growth_pct": "증가율(%)", "zscore": "z-score",
+        })
+        st.dataframe(trend_df)
 
 # ===================== 3. 종목별 감성(긍/부/중) 시계열 =====================
 st.markdown("---")
 st.header("😃 종목별 감성 추이 (긍/부/중 시계열)")
 
-sentiment_df = filtered_df.explode('stock_mentions').dropna(subset=['stock_mentions'])
-sentiment_ts = sentiment_df.groupby(['analysis_date', 'stock_mentions', 'sentiment_label']).size().reset_index(name='count')
-top_stock = sentiment_ts.groupby('stock_mentions')['count'].sum().nlargest(TOP_N_STOCKS).index
-sentiment_ts = sentiment_ts[sentiment_ts['stock_mentions'].isin(top_stock)]
+if wh_state:
+    sentiment_series = load_sentiment_series(WAREHOUSE_PATH, wh_state[0], tuple(stock_list))
+else:
+    sentiment_series = load_sentiment_series(LOCAL_CSV_PATH, os.path.getmtime(LOCAL_CSV_PATH), tuple(stock_list), df)
+# 기간 합계는 누적합으로 바로 계산 (explode/groupby 없음)
+stock_ranking = sentiment_series.ranking(start_date, end_date)
+top_stock = stock_ranking['stock'].head(TOP_N_STOCKS)
+sentiment_ts = sentiment_series.daily_frame(top_stock, start_date, end_date)
 
 if not sentiment_ts.empty:
     fig = px.line(
@@ -242,6 +287,40 @@ if not sentiment_ts.empty:
     )
     st.plotly_chart(fig, use_container_width=True)
 
+st.subheader("🔍 종목별 감성 드릴다운")
+# 기간 안에 언급된 종목(많은 순) 다음에 나머지 상장 종목
+mentioned_stocks = stock_ranking['stock'].tolist()
+mentioned_set = set(mentioned_stocks)
+drill_options = mentioned_stocks + [s for s in stock_list if s not in mentioned_set]
+if not drill_options:
+    st.info("종목 리스트가 비어 있습니다.")
+else:
+    col_stock, col_window = st.columns([3, 1])
+    drill_stock = col_stock.selectbox(f"종목 선택 (전체 {len(drill_options)}개, 기간 내 언급 많은 순)", drill_options)
+    rolling_days = col_window.number_input("이동 합계 일수", 1, 30, 7, 1)
+    drill_counts = sentiment_series.range_counts([drill_stock], start_date, end_date)[0]
+    metric_cols = st.columns(len(SENTIMENT_LABELS) + 1)
+    for col, label, count in zip(metric_cols, SENTIMENT_LABELS, drill_counts):
+        col.metric(label, int(count))
+    drill_total = int(drill_counts.sum())
+    metric_cols[-1].metric("순감성 (긍-부)/전체", f"{(drill_counts[0] - drill_counts[1]) / drill_total:.2f}" if drill_total else "-")
+    if drill_total:
+        drill_df = sentiment_series.rolling(drill_stock, rolling_days, start_date, end_date)
+        fig_drill = px.bar(
+            drill_df.melt(id_vars='analysis_date', value_vars=list(SENTIMENT_LABELS),
+                          var_name='sentiment_label', value_name='count'),
+            x='analysis_date', y='count', color='sentiment_label', title=f"{drill_stock} 일별 감성 기사 수"
+        )
+        st.plotly_chart(fig_drill, use_container_width=True)
+        fig_net = px.line(drill_df, x='analysis_date', y=f'{rolling_days}일 순감성', markers=True,
+                          title=f"{drill_stock} {rolling_days}일 이동 순감성 점수")
+        st.plotly_chart(fig_net, use_container_width=True)
+    else:
+        st.info(f"선택한 기간에 '{drill_stock}' 언급 기사가 없습니다.")
+
+with st.expander(f"전 종목 감성 합계/순감성 점수 ({len(stock_ranking)}개 종목)"):
+    st.dataframe(stock_ranking.rename(columns={"stock": "종목", "total": "전체", "net_score": "순감성"}))
+
 # ===================== 4. 감성분석 비율 (긍/부/중) 전체 요약 =====================
 st.markdown("---")
 st.header("🧠 전체 감성 분포 (긍/부/중)")
@@ -250,14 +329,33 @@ sent_count = filtered_df['sentiment_label'].value_counts()
 st.write("기사 전체 감성 분포 (건수 기준):")
 st.bar_chart(sent_count)
 
-# ===================== 5. 최근 테마/이슈 클러스터 및 요약(기초) =====================
+# ===================== 5. 최근 테마/이슈 클러스터 =====================
 st.markdown("---")
-st.header("🔎 최근 테마별 기사 집계 (기초 클러스터링)")
+st.header("🔎 최근 테마별 기사 클러스터")
 
-theme_df = exploded_kw.groupby(['analysis_keywords'])['url'].count().sort_values(ascending=False).reset_index()
-theme_df = theme_df[~theme_df['analysis_keywords'].isin(STOP_KEYWORDS | stock_set)]
-st.write("최근 기사에서 가장 많이 등장한 이슈/테마 Top 20")
-st.dataframe(theme_df.head(20))
+# 클러스터는 파이프라인에서 미리 계산해 기사별로 저장됩니다. (대시보드에서는 집계만)
+if 'cluster_id' not in filtered_df.columns or filtered_df['cluster_id'].isna().all():
+    st.info("클러스터 정보가 없습니다. 파이프라인을 다시 실행하면 기사별 테마 클러스터가 함께 저장됩니다.")
+else:
+    clustered = filtered_df.dropna(subset=['cluster_id'])
+    theme_df = (
+        clustered.groupby('cluster_id')
+        .agg(테마=('cluster_label', 'first'), 기사수=('url', 'count'), 최근기사일=('analysis_date', 'max'))
+        .sort_values('기사수', ascending=False)
+        .reset_index()
+    )
+    st.write("기간 내 기사 수가 많은 테마 클러스터 Top 20")
+    st.dataframe(theme_df.head(20))
+
+    cluster_options = theme_df.head(20)['cluster_id'].tolist()
+    selected_cluster = st.selectbox(
+        "클러스터 기사 보기", cluster_options,
+        format_func=lambda cid: f"#{int(cid)} {theme_df.set_index('cluster_id').loc[cid, '테마']}",
+    )
+    if selected_cluster is not None:
+        members = clustered[clustered['cluster_id'] == selected_cluster]
+        st.dataframe(members[['analysis_date', 'title', 'summary_ai', 'sentiment_label', 'url']]
+                     .sort_values('analysis_date', ascending=False).head(30))
 
 # ===================== 6. 정책/제도/리스크 이슈 뉴스 필터 =====================
 st.markdown("---")
@@ -282,7 +380,11 @@ st.markdown("---")
 st.header("🔗 연관/유사 뉴스 추천 (키워드 기반)")
 
 def find_related_news(keyword, df, topn=10):
-    # 입력 키워드와 연관된 기사 최신순 추천
+    # 입력 키워드와 연관된 기사 최신순 추천 (창고가 있으면 키워드 인덱스로 조회)
+    columns = ['analysis_date', 'url', 'summary_ai', 'sentiment_label']
+    if wh_state:
+        with open_warehouse(WAREHOUSE_PATH, fallback_csv=None) as wh:
+            return wh.articles_mentioning(keyword, "keyword", start_date, end_date, limit=topn)[columns]
     mask = df['analysis_keywords'].apply(lambda kws: keyword in kws if isinstance(kws, list) else False)
     return df[mask][['analysis_date', 'url', 'summary_ai', 'sentiment_label']].sort_values('analysis_date', ascending=False).head(topn)
 
@@ -291,4 +393,39 @@ if user_kw:
     st.write(f"'{user_kw}' 관련 최신 뉴스 Top 10:")
     st.dataframe(find_related_news(user_kw, filtered_df))
 
+# ===================== 9. 키워드·기관·종목 동반 등장 네트워크 =====================
+st.markdown("---")
+st.header("🕸️ 함께 움직이는 테마/종목 (동반 등장 분석)")
+
+@st.cache_resource(max_entries=8, show_spinner="동반 등장 그래프 계산 중...")
+@profiled("cooccurrence")
+def get_cooccurrence_graph(_data, start_date, end_date, n_rows, min_df=3):
+    """기간별 동반 등장 그래프 (같은 기간이면 재계산하지 않음)"""
+    columns = {"keywords": "analysis_keywords", "orgs": "analysis_orgs"}
+    if 'stock_mentions' in _data.columns:
+        columns["stocks"] = "stock_mentions"
+    exclude = {"keywords": STOP_KEYWORDS | stock_set, "orgs": stock_set}
+    return build_cooccurrence_graph(_data, columns, min_df=min_df, exclude=exclude)
+
+graph = get_cooccurrence_graph(filtered_df, start_date, end_date, len(filtered_df))
+if len(graph) < 2:
+    st.info("동반 등장 분석에 필요한 데이터가 부족합니다.")
+else:
+    heatmap_n = st.slider("히트맵에 표시할 엔티티 수", 10, 60, 30, 5)
+    block = graph.dense_block(graph.top_terms(heatmap_n), value="npmi")
+    fig_co = px.imshow(block, color_continuous_scale="RdBu_r", zmin=-1, zmax=1,
+                       title=f"상위 {heatmap_n}개 엔티티 간 연관도 (정규화 PMI)")
+    fig_co.update_layout(height=700)
+    st.plotly_chart(fig_co, use_container_width=True)
+
+    col_a, col_b = st.columns(2)
+    with col_a:
+        st.subheader("연관도 높은 쌍 Top 20")
+        st.dataframe(graph.top_pairs(k=20, by="npmi", min_count=3))
+    with col_b:
+        anchor = st.selectbox("기준 엔티티 선택", graph.terms[graph.top_terms(200)])
+        if anchor:
+            st.subheader(f"'{anchor}'와(과) 함께 등장하는 엔티티")
+            st.dataframe(graph.neighbors(anchor, k=15, by="npmi"))
+
 # ===================== 끝 =====================